@@ -0,0 +1,182 @@
+import asyncio
+import contextvars
+from typing import Any, AsyncIterator
+
+import mlflow
+import openai
+from loguru import logger
+from mlflow.entities import SpanType
+from openai import AsyncStream
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion import ChatCompletion
+from openai.types.chat.chat_completion_assistant_message_param import (
+    ChatCompletionAssistantMessageParam,
+)
+from openai.types.chat.chat_completion_tool_message_param import (
+    ChatCompletionToolMessageParam,
+)
+
+from fundus_murag.agent.chat_assistant import ChatAssistant, get_streamed_answer, get_tool_call_executor
+from fundus_murag.agent.openai_client_pool import OpenAIClientPool
+from fundus_murag.data.dtos.agent import AgentStreamEvent, ChatMessage
+
+
+class AsyncChatAssistant:
+    def __init__(self, assistant: ChatAssistant):
+        """
+        The AsyncChatAssistant is the asynchronous counterpart of the ChatAssistant. It wraps a ChatAssistant and
+        shares its chat history, tools, and configuration, but sends the completion requests with the shared
+        `openai.AsyncOpenAI` client of the model's provider and executes the (synchronous) tool calls in a thread
+        pool, so that it never blocks the event loop.
+
+        Args:
+            assistant (ChatAssistant): The ChatAssistant to wrap, e.g., the one of a session.
+        """
+        self._assistant = assistant
+
+    @property
+    def model_name(self) -> str:
+        return self._assistant.model_name
+
+    @property
+    def assistant_name(self) -> str:
+        return self._assistant.assistant_name
+
+    async def send_user_message(
+        self,
+        text_message: str,
+        base64_image: str | None = None,
+    ) -> str:
+        logger.info(f"[{self.assistant_name}] Sending user message to model {self.model_name}: {text_message}")
+        self._add_user_message_to_chat_history(text_message, base64_image)
+        response = await self._run_agentic_loop()
+        return response
+
+    async def send_user_message_stream(
+        self,
+        text_message: str,
+        base64_image: str | None = None,
+    ) -> AsyncIterator[AgentStreamEvent]:
+        """
+        Like `send_user_message` but streams the completions from the model. See
+        `ChatAssistant.send_user_message_stream` for the events.
+        """
+        logger.info(f"[{self.assistant_name}] Streaming user message to model {self.model_name}: {text_message}")
+        self._add_user_message_to_chat_history(text_message, base64_image)
+        async for event in self._run_agentic_loop_stream():
+            yield event
+
+    def get_converstation_history(self) -> list[ChatMessage]:
+        return self._assistant.get_converstation_history()
+
+    def _add_user_message_to_chat_history(self, text_message: str, base64_image: str | None) -> None:
+        assistant = self._assistant
+        if len(assistant._chat_history) == 0:
+            assistant._chat_history.extend(assistant._build_system_instruction(assistant._system_instruction))
+        assistant._chat_history.extend(assistant._build_user_messages(text_message, base64_image))
+
+    def _get_api_client(self) -> openai.AsyncOpenAI:
+        return OpenAIClientPool().get_async_client(self.model_name)
+
+    async def _create_chat_completion_from_history(
+        self, stream: bool = False
+    ) -> ChatCompletion | AsyncStream[ChatCompletionChunk]:
+        client = self._get_api_client()
+        try:
+            response = await client.chat.completions.create(**self._assistant._build_chat_completion_request(stream))
+            if not stream:
+                logger.debug(f"[{self.assistant_name}] OpenAI response received: {response}")
+            return response
+        except openai.OpenAIError as e:
+            logger.error(f"[{self.assistant_name}] An OpenAIError occured: {e}")
+            raise e
+        except Exception as e:
+            logger.error(f"[{self.assistant_name}] Unexpected Error of Type {type(e)}: {e}")
+            raise e
+
+    async def _stream_chat_completion_from_history(
+        self, message: list[ChatCompletionAssistantMessageParam]
+    ) -> AsyncIterator[AgentStreamEvent]:
+        """
+        Streams a completion from the model, yields a `token` event for every text chunk, and appends the
+        assembled assistant message to `message` after it was added to the chat history. (Async generators
+        cannot return a value.)
+        """
+        text_chunks: list[str] = []
+        tool_calls: dict[int, dict[str, Any]] = {}
+        stream: AsyncStream[ChatCompletionChunk] = await self._create_chat_completion_from_history(stream=True)  # type: ignore
+        async with stream:
+            async for chunk in stream:
+                token = self._assistant._accumulate_chat_completion_chunk(chunk, text_chunks, tool_calls)
+                if token:
+                    yield AgentStreamEvent(event="token", content=token)
+        message.append(self._assistant._add_streamed_response_to_chat_history(text_chunks, tool_calls))
+
+    @mlflow.trace(span_type=SpanType.AGENT)
+    async def _run_agentic_loop(self) -> str:
+        # 1. Send the messages in the chat history to the model
+        response: ChatCompletion = await self._create_chat_completion_from_history()  # type: ignore
+        self._assistant._add_assistant_response_to_chat_history(response)
+
+        # 2. Run the agentic loop until no tool calls are present in the response
+        while self._assistant._is_tool_call_response(response):
+            logger.debug(f"[{self.assistant_name}] Tool Calls detected in response!")
+            tool_messages = await self._execute_tool_calls(response.choices[0].message.tool_calls)
+            self._assistant._chat_history.extend(tool_messages)
+            response = await self._create_chat_completion_from_history()  # type: ignore
+            self._assistant._add_assistant_response_to_chat_history(response)
+
+        # 3. Return the final response
+        return self._assistant._get_message_content(response)
+
+    @mlflow.trace(span_type=SpanType.AGENT, output_reducer=get_streamed_answer)
+    async def _run_agentic_loop_stream(self) -> AsyncIterator[AgentStreamEvent]:
+        # 1. Stream the response to the messages in the chat history from the model
+        message: list[ChatCompletionAssistantMessageParam] = []
+        async for event in self._stream_chat_completion_from_history(message):
+            yield event
+
+        # 2. Run the agentic loop until no tool calls are present in the response
+        while len(tool_calls := self._assistant._get_streamed_tool_calls(message[-1])) > 0:
+            logger.debug(f"[{self.assistant_name}] Tool Calls detected in streamed response!")
+            for tc in tool_calls:
+                yield AgentStreamEvent(event="tool_call", content=tc.function.name)
+            tool_messages = await self._execute_tool_calls(tool_calls)
+            for tc in tool_calls:
+                yield AgentStreamEvent(event="tool_result", content=tc.function.name)
+            self._assistant._chat_history.extend(tool_messages)
+            async for event in self._stream_chat_completion_from_history(message):
+                yield event
+
+        # 3. Send the final response
+        yield AgentStreamEvent(event="done", content=self._assistant._get_message_content(message[-1]))
+
+    async def _execute_tool_calls(
+        self, tool_calls: list[ChatCompletionMessageToolCall] | None
+    ) -> list[ChatCompletionToolMessageParam]:
+        if tool_calls is None:
+            return []
+
+        # the tools are synchronous, so they run concurrently on the shared tool call thread pool. run_in_executor
+        # does not propagate the context, so every tool call runs in its own copy of the current context to keep its
+        # (mlflow) spans children of the current span. gather returns the results in the order of the tool calls and
+        # raises the first error.
+        loop = asyncio.get_running_loop()
+        executor = get_tool_call_executor()
+        return await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, self._execute_tool_call_in_context, contextvars.copy_context(), tc)
+                for tc in tool_calls
+            )
+        )
+
+    def _execute_tool_call_in_context(
+        self, context: contextvars.Context, tc: ChatCompletionMessageToolCall
+    ) -> ChatCompletionToolMessageParam:
+        return context.run(self._assistant._execute_tool_call, tc)
+
+    def __str__(self):
+        return f"AsyncChatAssistant({self._assistant})"
+
+    def __repr__(self):
+        return str(self)
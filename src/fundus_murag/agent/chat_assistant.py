@@ -1,16 +1,18 @@
+import contextvars
 import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import cache
-from typing import Any, Iterable
+from typing import Any, Generator, Iterable, Iterator, Literal, overload
 
-import google.auth.transport.requests
 import mlflow
 import openai
 import pandas as pd
-from google.auth import default
 from loguru import logger
 from mlflow.entities import SpanType
-from openai.types.chat import ChatCompletionMessageParam
+from openai import Stream
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageParam, ChatCompletionMessageToolCall
 from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_assistant_message_param import (
     ChatCompletionAssistantMessageParam,
@@ -29,10 +31,12 @@ from openai.types.chat.chat_completion_user_message_param import (
     ChatCompletionUserMessageParam,
 )
 
+from fundus_murag.agent.chat_history_manager import ChatHistoryManager
+from fundus_murag.agent.openai_client_pool import OpenAIClientPool
 from fundus_murag.agent.tools.function_calling_handler import FunctionCallingHandler
 from fundus_murag.agent.tools.tools import Tool
 from fundus_murag.config import load_config
-from fundus_murag.data.dtos.agent import AgentModel, ChatMessage
+from fundus_murag.data.dtos.agent import AgentModel, AgentStreamEvent, ChatMessage
 
 # https://platform.openai.com/docs/api-reference/chat/create
 OPENAI_GENERATION_CONFIG = {
@@ -41,6 +45,22 @@ OPENAI_GENERATION_CONFIG = {
     "max_completion_tokens": 8192,
 }
 
+TOOL_CALL_THREAD_NAME_PREFIX = "fundus-tool-call"
+
+
+@cache
+def get_tool_call_executor() -> ThreadPoolExecutor:
+    # shared by all assistants so that the number of concurrently executed tool calls is bounded process-wide
+    return ThreadPoolExecutor(
+        max_workers=load_config().assistant.max_parallel_tool_calls,
+        thread_name_prefix=TOOL_CALL_THREAD_NAME_PREFIX,
+    )
+
+
+def get_streamed_answer(events: list[AgentStreamEvent]) -> str | None:
+    # the output of the trace of a streamed agentic loop is the answer of its `done` event instead of all events
+    return next((event.content for event in reversed(events) if event.event == "done"), None)
+
 
 class ChatAssistant:
     def __init__(
@@ -79,6 +99,11 @@ class ChatAssistant:
         )
         self._generation_config = generatin_config
         self._chat_history: list[ChatCompletionMessageParam] = []
+        self._history_manager = ChatHistoryManager(
+            max_tokens=self._conf.assistant.max_context_tokens,
+            keep_recent_turns=self._conf.assistant.keep_recent_turns,
+            max_old_tool_output_tokens=self._conf.assistant.max_old_tool_output_tokens,
+        )
 
     def send_user_message(
         self,
@@ -93,6 +118,23 @@ class ChatAssistant:
         response = self._run_agentic_loop()
         return response
 
+    def send_user_message_stream(
+        self,
+        text_message: str,
+        base64_image: str | None = None,
+    ) -> Iterator[AgentStreamEvent]:
+        """
+        Like `send_user_message` but streams the completions from the model. Yields a `tool_call` and a
+        `tool_result` event for every tool call, a `token` event for every chunk of text generated by the model,
+        and finally a `done` event with the full response.
+        """
+        logger.info(f"[{self.assistant_name}] Streaming user message to model {self.model_name}: {text_message}")
+        if len(self._chat_history) == 0:
+            self._chat_history.extend(self._build_system_instruction(self._system_instruction))
+        user_message = self._build_user_messages(text_message, base64_image)
+        self._chat_history.extend(user_message)
+        yield from self._run_agentic_loop_stream()
+
     def get_converstation_history(self) -> list[ChatMessage]:
         # only return the user and assistant text messages
         messages = []
@@ -175,34 +217,8 @@ class ChatAssistant:
         available_models = ChatAssistant.list_available_models()
         return model_name in available_models["name"].values
 
-    @cache
     def _get_api_client(self) -> openai.OpenAI:
-        if self.model_name.startswith("google/"):
-            return self._get_vertexai_openai_client()
-        return self._get_openai_client()
-
-    def _get_openai_client(self) -> openai.OpenAI:
-        logger.debug(f"[{self.assistant_name}] Creating client for OpenAI Models.")
-        client = openai.OpenAI()
-        return client
-
-    def _get_vertexai_openai_client(self) -> openai.OpenAI:
-        logger.debug(f"[{self.assistant_name}] Creating client for VertexAI Models.")
-        # https://cloud.google.com/vertex-ai/generative-ai/docs/multimodal/call-vertex-using-openai-library
-        project_id = self._conf.google.project_id
-        location = self._conf.google.default_location
-
-        credentials, _ = default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
-        credentials.refresh(google.auth.transport.requests.Request())  # type: ignore
-        api_key = credentials.token  # type: ignore
-
-        client = openai.OpenAI(
-            base_url=(
-                f"https://{location}-aiplatform.googleapis.com/v1/projects/{project_id}/locations/{location}/endpoints/openapi"
-            ),
-            api_key=api_key,
-        )
-        return client
+        return OpenAIClientPool().get_client(self.model_name)
 
     def _build_user_messages(
         self, prompt: str, base64_image: str | None = None
@@ -238,30 +254,38 @@ class ChatAssistant:
         if message.role == "assistant":
             self._chat_history.append(ChatCompletionAssistantMessageParam(**message.model_dump()))
 
-    def _create_chat_completion_from_history(self) -> ChatCompletion:
+    def _build_chat_completion_request(self, stream: bool) -> dict[str, Any]:
+        request: dict[str, Any] = {
+            "model": self.model_name,
+            "messages": self._history_manager.build_context(self._chat_history),
+            "stream": stream,
+            **self._generation_config,
+        }
         tools = self._function_call_handler.build_open_ai_tool_params()
-        messages = self._chat_history
+        if len(tools) > 0:
+            logger.debug(
+                f"[{self.assistant_name}] Sending OpenAI completion request with tools: {self._available_tools}"
+            )
+            request["tools"] = tools
+            request["tool_choice"] = "auto"
+        else:
+            logger.debug(f"[{self.assistant_name}] Sending OpenAI completion request without tools.")
+        return request
+
+    @overload
+    def _create_chat_completion_from_history(self, stream: Literal[False] = False) -> ChatCompletion: ...
+
+    @overload
+    def _create_chat_completion_from_history(self, stream: Literal[True]) -> Stream[ChatCompletionChunk]: ...
+
+    def _create_chat_completion_from_history(
+        self, stream: bool = False
+    ) -> ChatCompletion | Stream[ChatCompletionChunk]:
         client = self._get_api_client()
         try:
-            if len(tools) > 0:
-                logger.debug(
-                    f"[{self.assistant_name}] Sending OpenAI completion request with tools: {self._available_tools}"
-                )
-                response = client.chat.completions.create(
-                    model=self.model_name,
-                    messages=messages,
-                    tools=tools,
-                    tool_choice="auto",
-                    **self._generation_config,
-                )
-            else:
-                logger.debug(f"[{self.assistant_name}] Sending OpenAI completion request without tools.")
-                response = client.chat.completions.create(
-                    model=self.model_name,
-                    messages=messages,
-                    **self._generation_config,
-                )
-            logger.debug(f"[{self.assistant_name}] OpenAI response received: {response}")
+            response = client.chat.completions.create(**self._build_chat_completion_request(stream))
+            if not stream:
+                logger.debug(f"[{self.assistant_name}] OpenAI response received: {response}")
             return response
         except openai.OpenAIError as e:
             logger.error(f"[{self.assistant_name}] An OpenAIError occured: {e}")
@@ -270,6 +294,73 @@ class ChatAssistant:
             logger.error(f"[{self.assistant_name}] Unexpected Error of Type {type(e)}: {e}")
             raise e
 
+    def _stream_chat_completion_from_history(
+        self,
+    ) -> Generator[AgentStreamEvent, None, ChatCompletionAssistantMessageParam]:
+        """
+        Streams a completion from the model, yields a `token` event for every text chunk, and returns the
+        assembled assistant message after it was added to the chat history.
+        """
+        text_chunks: list[str] = []
+        tool_calls: dict[int, dict[str, Any]] = {}
+        with self._create_chat_completion_from_history(stream=True) as stream:
+            for chunk in stream:
+                token = self._accumulate_chat_completion_chunk(chunk, text_chunks, tool_calls)
+                if token:
+                    yield AgentStreamEvent(event="token", content=token)
+        return self._add_streamed_response_to_chat_history(text_chunks, tool_calls)
+
+    def _accumulate_chat_completion_chunk(
+        self,
+        chunk: ChatCompletionChunk,
+        text_chunks: list[str],
+        tool_calls: dict[int, dict[str, Any]],
+    ) -> str | None:
+        """
+        Adds the text and the tool call deltas of a streamed chunk to `text_chunks` and `tool_calls` and returns
+        the text of the chunk, if any.
+        """
+        if len(chunk.choices) == 0:
+            return None
+        delta = chunk.choices[0].delta
+        for tc in delta.tool_calls or []:
+            index = tc.index
+            # OpenAI streams the arguments of a tool call in chunks with the same index, whereas Vertex AI
+            # sends complete tool calls, which do not necessarily have distinct indices
+            if tc.id and index in tool_calls and tool_calls[index]["id"] not in ("", tc.id):
+                index = max(tool_calls.keys()) + 1
+            tool_call = tool_calls.setdefault(
+                index,
+                {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if tc.id:
+                tool_call["id"] = tc.id
+            if tc.function is not None:
+                if tc.function.name:
+                    tool_call["function"]["name"] = tc.function.name
+                if tc.function.arguments:
+                    tool_call["function"]["arguments"] += tc.function.arguments
+        if delta.content:
+            text_chunks.append(delta.content)
+        return delta.content
+
+    def _add_streamed_response_to_chat_history(
+        self,
+        text_chunks: list[str],
+        tool_calls: dict[int, dict[str, Any]],
+    ) -> ChatCompletionAssistantMessageParam:
+        message = ChatCompletionAssistantMessageParam(role="assistant", content="".join(text_chunks) or None)
+        if len(tool_calls) > 0:
+            message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]  # type: ignore
+        logger.debug(f"[{self.assistant_name}] OpenAI streamed response received: {message}")
+        self._chat_history.append(message)
+        return message
+
+    def _get_streamed_tool_calls(
+        self, message: ChatCompletionAssistantMessageParam
+    ) -> list[ChatCompletionMessageToolCall]:
+        return [ChatCompletionMessageToolCall.model_validate(tc) for tc in message.get("tool_calls") or []]
+
     @mlflow.trace(span_type=SpanType.AGENT)
     def _run_agentic_loop(self) -> str:
         # 1. Send the messages in the chat history to the model
@@ -280,7 +371,7 @@ class ChatAssistant:
         while self._is_tool_call_response(response):
             logger.debug(f"[{self.assistant_name}] Tool Calls detected in response!")
             # execute the tool calls
-            tool_messages = self._execute_tool_calls(response)
+            tool_messages = self._execute_tool_calls(response.choices[0].message.tool_calls)
             # add the tool messages to the chat history and send them back to the model
             self._chat_history.extend(tool_messages)
             response = self._create_chat_completion_from_history()
@@ -290,6 +381,25 @@ class ChatAssistant:
         message = self._get_message_content(response)
         return message
 
+    @mlflow.trace(span_type=SpanType.AGENT, output_reducer=get_streamed_answer)
+    def _run_agentic_loop_stream(self) -> Iterator[AgentStreamEvent]:
+        # 1. Stream the response to the messages in the chat history from the model
+        message = yield from self._stream_chat_completion_from_history()
+
+        # 2. Run the agentic loop until no tool calls are present in the response
+        while len(tool_calls := self._get_streamed_tool_calls(message)) > 0:
+            logger.debug(f"[{self.assistant_name}] Tool Calls detected in streamed response!")
+            for tc in tool_calls:
+                yield AgentStreamEvent(event="tool_call", content=tc.function.name)
+            tool_messages = self._execute_tool_calls(tool_calls)
+            for tc in tool_calls:
+                yield AgentStreamEvent(event="tool_result", content=tc.function.name)
+            self._chat_history.extend(tool_messages)
+            message = yield from self._stream_chat_completion_from_history()
+
+        # 3. Send the final response
+        yield AgentStreamEvent(event="done", content=self._get_message_content(message))
+
     def _get_message_content(self, response_or_message: ChatCompletion | ChatCompletionMessageParam) -> str:
         text = ""
         if isinstance(response_or_message, ChatCompletion):
@@ -323,30 +433,43 @@ class ChatAssistant:
         except Exception:
             return False
 
-    def _execute_tool_calls(self, response: ChatCompletion) -> list[ChatCompletionToolMessageParam]:
-        tool_calls = tool_calls = response.choices[0].message.tool_calls
+    def _execute_tool_calls(
+        self, tool_calls: list[ChatCompletionMessageToolCall] | None
+    ) -> list[ChatCompletionToolMessageParam]:
         if tool_calls is None:
             return []
 
-        tool_messages = []
-        for tc in tool_calls:
-            try:
-                tool_name = tc.function.name
-                tool_args_str = tc.function.arguments or "{}"
-                tool_args = json.loads(tool_args_str)
-
-                result_json_str = self._function_call_handler.execute_function(
-                    name=tool_name,
-                    **tool_args,
-                )
+        # the tool calls of a response are independent of each other, so they are executed concurrently. Tool calls
+        # issued from within a tool call (e.g., by a nested assistant) run sequentially to not exhaust the pool.
+        if (
+            len(tool_calls) == 1
+            or self._conf.assistant.max_parallel_tool_calls <= 1
+            or threading.current_thread().name.startswith(TOOL_CALL_THREAD_NAME_PREFIX)
+        ):
+            return [self._execute_tool_call(tc) for tc in tool_calls]
+
+        logger.debug(f"[{self.assistant_name}] Executing {len(tool_calls)} tool calls concurrently.")
+        # every tool call runs in its own copy of the current context, so that its (mlflow) spans are children of the
+        # current span. The results are returned in the order of the tool calls and the first error is re-raised.
+        executor = get_tool_call_executor()
+        futures = [executor.submit(contextvars.copy_context().run, self._execute_tool_call, tc) for tc in tool_calls]
+        return [future.result() for future in futures]
+
+    def _execute_tool_call(self, tc: ChatCompletionMessageToolCall) -> ChatCompletionToolMessageParam:
+        try:
+            tool_name = tc.function.name
+            tool_args_str = tc.function.arguments or "{}"
+            tool_args = json.loads(tool_args_str)
 
-                tool_message = ChatCompletionToolMessageParam(content=result_json_str, role="tool", tool_call_id=tc.id)
-                tool_messages.append(tool_message)
-            except Exception as e:
-                logger.error(f"[{self.assistant_name}] Error executing tool call: {e}")
-                raise e
+            result_json_str = self._function_call_handler.execute_function(
+                name=tool_name,
+                **tool_args,
+            )
 
-        return tool_messages
+            return ChatCompletionToolMessageParam(content=result_json_str, role="tool", tool_call_id=tc.id)
+        except Exception as e:
+            logger.error(f"[{self.assistant_name}] Error executing tool call: {e}")
+            raise e
 
     def _str__(self):
         return (
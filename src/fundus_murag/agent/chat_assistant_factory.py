@@ -1,3 +1,4 @@
+from fundus_murag.agent.async_chat_assistant import AsyncChatAssistant
 from fundus_murag.agent.chat_assistant import ChatAssistant
 from fundus_murag.agent.session_manager import SessionManager
 from fundus_murag.agent.tools.tools import Tool
@@ -35,5 +36,23 @@ class ChatAssistantFactory(metaclass=SingletonMeta):
         )
         return assistant, session
 
+    def get_or_create_async_assistant(
+        self,
+        assistant_name: str | None = None,
+        model_name: str | None = None,
+        system_instruction: str | None = None,
+        available_tools: list[Tool] | None = None,
+        session: str | SessionHandle | None = None,
+    ) -> tuple[AsyncChatAssistant, SessionHandle]:
+        # the async assistant shares the chat history of the session's assistant
+        assistant, session = self.get_or_create_assistant(
+            assistant_name=assistant_name,
+            model_name=model_name,
+            system_instruction=system_instruction,
+            available_tools=available_tools,
+            session=session,
+        )
+        return AsyncChatAssistant(assistant), session
+
     def get_all_sessions(self) -> list[SessionHandle]:
         return self.__session_manager.get_all_sessions()
@@ -0,0 +1,128 @@
+import json
+
+from loguru import logger
+from openai.types.chat import ChatCompletionMessageParam
+
+# rough number of characters per token of English text and JSON. We serve OpenAI and Gemini models, which use
+# different tokenizers, so the token counts are estimated instead of computed with a specific tokenizer.
+CHARS_PER_TOKEN = 4
+# tokens of the role and the separators of a message
+MESSAGE_OVERHEAD_TOKENS = 4
+# tokens of an image part, independent of the size of its base64 data
+IMAGE_TOKENS = 1000
+OMITTED_IMAGE_TEXT = "[An image was provided here but omitted from the history.]"
+
+
+class ChatHistoryManager:
+    def __init__(
+        self,
+        max_tokens: int,
+        keep_recent_turns: int = 2,
+        max_old_tool_output_tokens: int = 256,
+    ):
+        """
+        The ChatHistoryManager builds the messages sent to the model from the full chat history of an assistant so
+        that the requests stay within a token budget. The most recent `keep_recent_turns` turns, i.e., a user message
+        and all the messages after it, are sent as they are. In older turns, the image parts are dropped and tool
+        outputs are elided to at most `max_old_tool_output_tokens` tokens. If the messages still exceed `max_tokens`,
+        the oldest turns are dropped. The system instruction and the current turn are always kept.
+
+        Args:
+            max_tokens (int): The (estimated) token budget of the messages of a request.
+            keep_recent_turns (int, optional): The number of recent turns sent unaltered. Defaults to 2.
+            max_old_tool_output_tokens (int, optional): The maximum number of tokens of a tool output in older turns.
+                Defaults to 256.
+        """
+        self._max_tokens = max_tokens
+        self._keep_recent_turns = max(keep_recent_turns, 1)
+        self._max_old_tool_output_tokens = max_old_tool_output_tokens
+        # the chat history is append-only, so the token counts of its messages are computed only once
+        self._token_counts: list[int] = []
+
+    @staticmethod
+    def estimate_tokens(message: ChatCompletionMessageParam) -> int:
+        num_chars = 0
+        num_images = 0
+        content = message.get("content")
+        if isinstance(content, str):
+            num_chars += len(content)
+        elif content is not None:
+            for part in content:
+                if part.get("type") == "image_url":
+                    num_images += 1
+                else:
+                    num_chars += len(part.get("text", part.get("refusal", "")))  # type: ignore
+        for tool_call in message.get("tool_calls") or []:
+            num_chars += len(json.dumps(tool_call))
+        return MESSAGE_OVERHEAD_TOKENS + num_chars // CHARS_PER_TOKEN + num_images * IMAGE_TOKENS
+
+    def count_tokens(self, chat_history: list[ChatCompletionMessageParam]) -> list[int]:
+        if len(chat_history) < len(self._token_counts):
+            self._token_counts = []
+        for message in chat_history[len(self._token_counts) :]:
+            self._token_counts.append(self.estimate_tokens(message))
+        return self._token_counts
+
+    def build_context(self, chat_history: list[ChatCompletionMessageParam]) -> list[ChatCompletionMessageParam]:
+        """
+        Returns the messages of the chat history to send to the model. The chat history itself is not altered.
+        """
+        token_counts = self.count_tokens(chat_history)
+        turn_starts = [i for i, message in enumerate(chat_history) if message.get("role") == "user"]
+        if len(turn_starts) <= self._keep_recent_turns:
+            return chat_history
+
+        # compact the messages of the older turns
+        recent_start = turn_starts[-self._keep_recent_turns]
+        messages = list(chat_history)
+        counts = list(token_counts)
+        for i in range(turn_starts[0], recent_start):
+            compacted = self._compact_message(messages[i], counts[i])
+            if compacted is not messages[i]:
+                messages[i] = compacted
+                counts[i] = self.estimate_tokens(compacted)
+
+        # drop the oldest turns until the messages fit into the budget
+        total = sum(counts)
+        num_tokens_before = total
+        drop_end = turn_starts[0]
+        for next_turn_start in turn_starts[1:]:
+            if total <= self._max_tokens:
+                break
+            total -= sum(counts[drop_end:next_turn_start])
+            drop_end = next_turn_start
+        messages = messages[: turn_starts[0]] + messages[drop_end:]
+
+        if total > self._max_tokens:
+            logger.warning(
+                f"The chat history has about {total} tokens after dropping all older turns, "
+                f"which exceeds the budget of {self._max_tokens} tokens."
+            )
+        logger.debug(
+            f"Built the context of {len(messages)} of {len(chat_history)} messages with about {total} tokens "
+            f"(full history: {sum(token_counts)} tokens, compacted: {num_tokens_before} tokens)."
+        )
+        return messages
+
+    def _compact_message(self, message: ChatCompletionMessageParam, num_tokens: int) -> ChatCompletionMessageParam:
+        content = message.get("content")
+        if message.get("role") == "tool" and isinstance(content, str):
+            if num_tokens <= self._max_old_tool_output_tokens:
+                return message
+            max_chars = self._max_old_tool_output_tokens * CHARS_PER_TOKEN
+            num_elided_tokens = (len(content) - max_chars) // CHARS_PER_TOKEN
+            return {  # type: ignore
+                **message,
+                "content": f"{content[:max_chars]} ... [{num_elided_tokens} tokens of this old tool output elided]",
+            }
+
+        if message.get("role") == "user" and isinstance(content, list):
+            if not any(part.get("type") == "image_url" for part in content):
+                return message
+            parts = [
+                {"type": "text", "text": OMITTED_IMAGE_TEXT} if part.get("type") == "image_url" else part
+                for part in content
+            ]
+            return {**message, "content": parts}  # type: ignore
+
+        return message
@@ -1,6 +1,7 @@
 import json
 import re
 from enum import Enum
+from typing import Generator, Iterator
 
 from loguru import logger
 from pydantic import BaseModel
@@ -22,6 +23,7 @@ from fundus_murag.agent.tools.tools import (
     get_sim_search_tool,
 )
 from fundus_murag.config import load_config
+from fundus_murag.data.dtos.agent import AgentStreamEvent
 from fundus_murag.data.dtos.session import SessionHandle
 
 
@@ -179,12 +181,7 @@ You have the following assistants at your disposal:
 
         return None
 
-    def _forward_user_request(
-        self,
-        forwarding_request: dict[str, str],
-        user_request: str,
-        base64_image: str | None = None,
-    ) -> str:
+    def _get_forwarding_assistant_and_message(self, forwarding_request: dict[str, str]) -> tuple[ChatAssistant, str]:
         assistant_name = forwarding_request["assistant"]
         user_request = forwarding_request["user_request"]
         context = forwarding_request["context"]
@@ -200,29 +197,120 @@ You have the following assistants at your disposal:
             USER_REQUEST=user_request,
             CONTEXT=context,
         )
+        return assistant, message
+
+    def _forward_user_request(
+        self,
+        forwarding_request: dict[str, str],
+        user_request: str,
+        base64_image: str | None = None,
+    ) -> str:
+        assistant, message = self._get_forwarding_assistant_and_message(forwarding_request)
         assistant_response = assistant.send_user_message(text_message=message, base64_image=base64_image)
 
         return assistant_response
 
-    def _process_assistant_response(
+    def _build_process_assistant_response_message(
         self,
         assistant_response: str,
         original_user_request: str,
         forwarded_request: dict[str, str],
     ) -> str:
-        concierge_assistant = self._get_assistant(AssistantType.CONCIERGE)
-
-        assistant_response_message = PROCESS_ASSISTANT_RESPONSE_USER_MESSAGE_TEMPLATE.format(
+        return PROCESS_ASSISTANT_RESPONSE_USER_MESSAGE_TEMPLATE.format(
             ORIGINAL_USER_REQUEST=original_user_request,
             FORWARDED_REQUEST=json.dumps(forwarded_request, indent=2),
             ASSISTANT_NAME=forwarded_request["assistant"],
             ASSISTANT_RESPONSE=assistant_response,
         )
 
+    def _process_assistant_response(
+        self,
+        assistant_response: str,
+        original_user_request: str,
+        forwarded_request: dict[str, str],
+    ) -> str:
+        concierge_assistant = self._get_assistant(AssistantType.CONCIERGE)
+
+        assistant_response_message = self._build_process_assistant_response_message(
+            assistant_response=assistant_response,
+            original_user_request=original_user_request,
+            forwarded_request=forwarded_request,
+        )
+
         concierge_response = concierge_assistant.send_user_message(text_message=assistant_response_message)
 
         return concierge_response
 
+    def _relay_assistant_events(
+        self,
+        events: Iterator[AgentStreamEvent],
+        stream_tokens: bool,
+    ) -> Generator[AgentStreamEvent, None, str]:
+        """
+        Relays the tool call events of an assistant and returns its full response. If `stream_tokens` is True, the
+        tokens are relayed as well unless the response starts like a (possibly fenced) JSON forwarding request,
+        which is only meant for the concierge and not for the user.
+        """
+        buffered: list[AgentStreamEvent] = []
+        is_forwarding_request: bool | None = None
+        for event in events:
+            if event.event == "done":
+                return event.content
+            if event.event != "token":
+                yield event
+                continue
+            if not stream_tokens or is_forwarding_request:
+                continue
+            if is_forwarding_request is None:
+                buffered.append(event)
+                text = "".join(e.content for e in buffered).lstrip()
+                if len(text) == 0:
+                    continue
+                is_forwarding_request = text[0] in ("{", "`")
+                if not is_forwarding_request:
+                    yield from buffered
+                continue
+            yield event
+        raise RuntimeError("The assistant stream ended without a response.")
+
+    def handle_user_request_stream(
+        self,
+        user_request: str,
+        base64_image: str | None = None,
+    ) -> Iterator[AgentStreamEvent]:
+        """
+        Like `handle_user_request` but streams `forward` events when the concierge forwards the request to an
+        assistant, the `tool_call` and `tool_result` events of the assistants, the tokens of the concierge
+        responses to the user, and finally a `done` event with the full response.
+        """
+        concierge_assistant = self._get_assistant(AssistantType.CONCIERGE)
+        concierge_response = yield from self._relay_assistant_events(
+            concierge_assistant.send_user_message_stream(text_message=user_request, base64_image=base64_image),
+            stream_tokens=True,
+        )
+
+        forwarding_request = self._parse_forwarding_request(concierge_response)
+        while forwarding_request is not None:
+            yield AgentStreamEvent(event="forward", content=forwarding_request["assistant"])
+            assistant, message = self._get_forwarding_assistant_and_message(forwarding_request)
+            assistant_response = yield from self._relay_assistant_events(
+                assistant.send_user_message_stream(text_message=message, base64_image=base64_image),
+                stream_tokens=False,
+            )
+
+            assistant_response_message = self._build_process_assistant_response_message(
+                assistant_response=assistant_response,
+                original_user_request=user_request,
+                forwarded_request=forwarding_request,
+            )
+            concierge_response = yield from self._relay_assistant_events(
+                concierge_assistant.send_user_message_stream(text_message=assistant_response_message),
+                stream_tokens=True,
+            )
+            forwarding_request = self._parse_forwarding_request(concierge_response)
+
+        yield AgentStreamEvent(event="done", content=concierge_response)
+
     def handle_user_request(
         self,
         user_request: str,
@@ -0,0 +1,141 @@
+import threading
+from datetime import datetime, timezone
+from typing import Literal
+
+import google.auth.transport.requests
+import openai
+from google.auth import default
+from loguru import logger
+
+from fundus_murag.config import load_config
+from fundus_murag.singleton_meta import SingletonMeta
+
+Provider = Literal["openai", "vertexai"]
+
+# refresh the VertexAI access token this many seconds before it expires
+VERTEXAI_TOKEN_REFRESH_MARGIN = 5 * 60
+# wait this many seconds before retrying a failed token refresh
+VERTEXAI_TOKEN_REFRESH_RETRY_DELAY = 30
+
+
+class OpenAIClientPool(metaclass=SingletonMeta):
+    def __init__(self):
+        """
+        The OpenAIClientPool shares the (sync and async) OpenAI clients process-wide per provider and base URL, so
+        that all assistants reuse the same connection pools. The access token of the VertexAI clients is refreshed
+        in a background thread before it expires.
+        """
+        self._conf = load_config()
+        self._lock = threading.Lock()
+        self._clients: dict[tuple[Provider, str | None], openai.OpenAI] = {}
+        self._async_clients: dict[tuple[Provider, str | None], openai.AsyncOpenAI] = {}
+        self._vertexai_credentials = None
+        self._vertexai_refresh_thread: threading.Thread | None = None
+        self._stop_refresh = threading.Event()
+
+    @staticmethod
+    def get_provider(model_name: str) -> Provider:
+        if model_name.startswith("google/"):
+            return "vertexai"
+        return "openai"
+
+    def _get_base_url(self, provider: Provider) -> str | None:
+        if provider == "vertexai":
+            # https://cloud.google.com/vertex-ai/generative-ai/docs/multimodal/call-vertex-using-openai-library
+            project_id = self._conf.google.project_id
+            location = self._conf.google.default_location
+            return f"https://{location}-aiplatform.googleapis.com/v1/projects/{project_id}/locations/{location}/endpoints/openapi"
+        return None
+
+    def get_client(self, model_name: str) -> openai.OpenAI:
+        provider = self.get_provider(model_name)
+        key = (provider, self._get_base_url(provider))
+        with self._lock:
+            if key not in self._clients:
+                logger.debug(f"Creating client for {provider} Models.")
+                api_key = self._get_vertexai_api_key() if provider == "vertexai" else None
+                self._clients[key] = openai.OpenAI(base_url=key[1], api_key=api_key)
+            return self._clients[key]
+
+    def get_async_client(self, model_name: str) -> openai.AsyncOpenAI:
+        provider = self.get_provider(model_name)
+        key = (provider, self._get_base_url(provider))
+        with self._lock:
+            if key not in self._async_clients:
+                logger.debug(f"Creating async client for {provider} Models.")
+                api_key = self._get_vertexai_api_key() if provider == "vertexai" else None
+                self._async_clients[key] = openai.AsyncOpenAI(base_url=key[1], api_key=api_key)
+            return self._async_clients[key]
+
+    def _get_vertexai_api_key(self) -> str:
+        # must be called while holding the lock
+        if self._vertexai_credentials is None:
+            credentials, _ = default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+            credentials.refresh(google.auth.transport.requests.Request())  # type: ignore
+            self._vertexai_credentials = credentials
+            # every refresh thread gets its own stop event so that a thread stopped by `close` never resumes
+            self._stop_refresh = threading.Event()
+            self._vertexai_refresh_thread = threading.Thread(
+                target=self._refresh_vertexai_token_periodically,
+                args=(credentials, self._stop_refresh),
+                name="vertexai-token-refresh",
+                daemon=True,
+            )
+            self._vertexai_refresh_thread.start()
+        return self._vertexai_credentials.token  # type: ignore
+
+    @staticmethod
+    def _get_seconds_until_vertexai_token_refresh(credentials) -> float:
+        expiry = credentials.expiry
+        if expiry is None:
+            return VERTEXAI_TOKEN_REFRESH_RETRY_DELAY
+        # the expiry of google-auth credentials is a naive datetime in UTC
+        expires_in = (expiry.replace(tzinfo=timezone.utc) - datetime.now(timezone.utc)).total_seconds()
+        return max(expires_in - VERTEXAI_TOKEN_REFRESH_MARGIN, 0)
+
+    def _refresh_vertexai_token_periodically(self, credentials, stop: threading.Event) -> None:
+        wait = self._get_seconds_until_vertexai_token_refresh(credentials)
+        while not stop.wait(wait):
+            try:
+                credentials.refresh(google.auth.transport.requests.Request())
+            except Exception as e:
+                logger.error(f"Error refreshing the VertexAI access token: {e}")
+                wait = VERTEXAI_TOKEN_REFRESH_RETRY_DELAY
+                continue
+
+            with self._lock:
+                if stop.is_set():
+                    # the pool was closed during the refresh and the clients may belong to new credentials
+                    return
+                # the clients read the API key on every request
+                clients = [*self._clients.items(), *self._async_clients.items()]
+                for (provider, _), client in clients:
+                    if provider == "vertexai":
+                        client.api_key = credentials.token
+            wait = max(self._get_seconds_until_vertexai_token_refresh(credentials), VERTEXAI_TOKEN_REFRESH_RETRY_DELAY)
+            logger.debug(f"Refreshed the VertexAI access token. Next refresh in {wait:.0f}s.")
+
+    def close(self) -> None:
+        """
+        Closes the sync clients, drops the async clients, and stops the VertexAI token refresh. Use `close_async` to
+        close the async clients as well. Clients requested after closing are created anew, together with new VertexAI
+        credentials and a new refresh thread.
+        """
+        self._close()
+
+    async def close_async(self) -> None:
+        for client in self._close():
+            await client.close()
+
+    def _close(self) -> list[openai.AsyncOpenAI]:
+        with self._lock:
+            self._stop_refresh.set()
+            self._vertexai_credentials = None
+            self._vertexai_refresh_thread = None
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+            # the async clients are dropped as well because their VertexAI access token is no longer refreshed
+            async_clients = list(self._async_clients.values())
+            self._async_clients.clear()
+        return async_clients
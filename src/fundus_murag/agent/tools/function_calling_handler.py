@@ -48,6 +48,21 @@ class FunctionCallingHandler:
         logger.debug(f"Function `{name}` executed successfully. Result: {res}")
         return res
 
+    @staticmethod
+    def warm_up(tools: list[Tool]) -> None:
+        """
+        Generates the OpenAI and Gemini schemas of all functions of the tools so that the first completion requests
+        do not have to.
+        """
+        for tool in tools:
+            for name, func in tool.functions.items():
+                for use_gemini_format in (False, True):
+                    try:
+                        generate_openai_function_schema(func, use_gemini_format=use_gemini_format)
+                    except Exception as e:
+                        logger.warning(f"Cannot generate the schema of function `{name}`: {e}")
+        logger.info(f"Generated the function schemas of {len(tools)} tools")
+
     def build_open_ai_tool_params(self) -> list[ChatCompletionToolParam]:
         # Generate OpenAI tool params to be used by the OpenAI SDK
         tool_params = []
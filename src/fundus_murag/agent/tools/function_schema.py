@@ -5,9 +5,11 @@ Mostly taken from https://github.com/openai/openai-agents-python/blob/cdbf6b0514
 from __future__ import annotations
 
 import contextlib
+import copy
 import inspect
 import logging
 import re
+import threading
 from dataclasses import dataclass
 from typing import Any, Callable, Literal, get_args, get_origin, get_type_hints
 
@@ -586,7 +588,7 @@ def __purge_defaults(data):
         return data
 
 
-def generate_openai_function_schema(func: Callable, use_gemini_format: bool = False) -> FunctionDefinition:
+def __build_openai_function_schema(func: Callable, use_gemini_format: bool) -> FunctionDefinition:
     func_schema = __function_schema(func)
     func_name = func_schema.name
     func_desc = func_schema.description
@@ -614,3 +616,20 @@ def generate_openai_function_schema(func: Callable, use_gemini_format: bool = Fa
         strict=True,
     )
     return func_def
+
+
+__FUNCTION_SCHEMA_CACHE: dict[tuple[Callable, bool, bool], FunctionDefinition] = {}
+__FUNCTION_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def generate_openai_function_schema(func: Callable, use_gemini_format: bool = False) -> FunctionDefinition:
+    # generating the schema parses the docstring and builds pydantic models, so it is done only once per function
+    # and format. The schema of a bound method does not depend on its instance, so the methods of all instances
+    # share the same entry. A copy is returned so that callers cannot alter the memoized schema.
+    key = (getattr(func, "__func__", func), inspect.ismethod(func), use_gemini_format)
+    with __FUNCTION_SCHEMA_CACHE_LOCK:
+        func_def = __FUNCTION_SCHEMA_CACHE.get(key)
+        if func_def is None:
+            func_def = __build_openai_function_schema(func, use_gemini_format)
+            __FUNCTION_SCHEMA_CACHE[key] = func_def
+    return copy.deepcopy(func_def)
@@ -30,6 +30,7 @@ def get_lookup_tool() -> Tool:
             "get_number_of_records_in_collection": vdb.get_number_of_records_in_collection,
             "get_random_fundus_records": vdb.get_random_fundus_records,
             "get_fundus_record_by_murag_id": vdb.get_fundus_record_by_murag_id,
+            "get_fundus_records_by_murag_ids": vdb.get_fundus_records_by_murag_ids,
             # COLLECTION LOOKUP FUNCTIONS
             "get_total_number_of_fundus_collections": vdb.get_total_number_of_fundus_collections,
             "list_all_fundus_collections": vdb.list_all_fundus_collections,
@@ -6,9 +6,19 @@ from loguru import logger
 
 from fundus_murag.agent.chat_assistant_factory import ChatAssistantFactory
 from fundus_murag.agent.fundus_multi_agent_system_factory import FundusMultiAgentSystemFactory
+from fundus_murag.agent.openai_client_pool import OpenAIClientPool
+from fundus_murag.agent.tools.function_calling_handler import FunctionCallingHandler
+from fundus_murag.agent.tools.tools import (
+    get_image_analysis_tool,
+    get_lex_search_tool,
+    get_lookup_tool,
+    get_sim_search_tool,
+)
 from fundus_murag.config import load_config
+from fundus_murag.data.async_vector_db import AsyncVectorDB
 from fundus_murag.data.user_image_store import UserImageStore
 from fundus_murag.data.vector_db import VectorDB
+from fundus_murag.ml.client import FundusMLClient
 
 
 @asynccontextmanager
@@ -22,12 +32,29 @@ async def api_lifespan(app: FastAPI):
     chat_assistant_factory = ChatAssistantFactory()
     fundus_agent_factory = FundusMultiAgentSystemFactory()
     vdb = VectorDB()
+    async_vdb = AsyncVectorDB()
+    ml_client = FundusMLClient()
     user_image_store = UserImageStore()
+    openai_client_pool = OpenAIClientPool()
+    FunctionCallingHandler.warm_up(
+        [
+            get_lookup_tool(),
+            get_lex_search_tool(),
+            get_sim_search_tool(),
+            get_image_analysis_tool(),
+        ]
+    )
     yield
     # Shutdown
+    await async_vdb.close()
+    await ml_client.close_async()
+    await openai_client_pool.close_async()
     vdb.close()
+    del async_vdb
+    del ml_client
     del vdb
     del chat_assistant_factory
     del fundus_agent_factory
     del user_image_store
+    del openai_client_pool
     logger.info("Stopping FUNDus! Data API")
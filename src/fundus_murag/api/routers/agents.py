@@ -1,8 +1,19 @@
+from typing import Iterator
+
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from loguru import logger
 
 from fundus_murag.agent.chat_assistant import ChatAssistant
 from fundus_murag.agent.fundus_multi_agent_system_factory import FundusMultiAgentSystemFactory
-from fundus_murag.data.dtos.agent import AgentModel, AgentResponse, MessageRequest, SessionHandle
+from fundus_murag.data.dtos.agent import (
+    AgentModel,
+    AgentResponse,
+    AgentStreamEvent,
+    MessageRequest,
+    SessionHandle,
+)
 
 router = APIRouter(
     prefix="/agents",
@@ -20,7 +31,9 @@ async def send_message(request: MessageRequest):
             session=request.session_id,
         )
 
-        response_text = agent.handle_user_request(
+        # the multi-agent system is synchronous, so it runs in a thread pool to not block the event loop
+        response_text = await run_in_threadpool(
+            agent.handle_user_request,
             user_request=request.message,
             base64_image=request.user_image_id,
         )
@@ -33,6 +46,37 @@ async def send_message(request: MessageRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/send_message/stream", response_class=StreamingResponse)
+async def send_message_stream(request: MessageRequest):
+    """
+    Sends a message to the multi-agent system and streams the `AgentStreamEvent`s as server-sent events.
+    """
+    try:
+        agent, session = fundus_agent_factory.get_or_create_agent(
+            model_name=request.model_name,
+            session=request.session_id,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def stream_events() -> Iterator[str]:
+        yield AgentStreamEvent(event="session", session=session).to_server_sent_event()
+        try:
+            for event in agent.handle_user_request_stream(
+                user_request=request.message,
+                base64_image=request.user_image_id,
+            ):
+                if event.event == "done":
+                    event.session = session
+                yield event.to_server_sent_event()
+        except Exception as e:
+            logger.error(f"Error while streaming the agent response: {e}")
+            yield AgentStreamEvent(event="error", content=str(e), session=session).to_server_sent_event()
+
+    # the synchronous generator is iterated in a thread pool so that it does not block the event loop
+    return StreamingResponse(stream_events(), media_type="text/event-stream")
+
+
 @router.get("/sessions", response_model=list[SessionHandle])
 async def list_sessions():
     try:
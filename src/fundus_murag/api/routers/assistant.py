@@ -1,5 +1,10 @@
+from typing import AsyncIterator
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from loguru import logger
 
+from fundus_murag.agent.async_chat_assistant import AsyncChatAssistant
 from fundus_murag.agent.chat_assistant import ChatAssistant
 from fundus_murag.agent.chat_assistant_factory import ChatAssistantFactory
 from fundus_murag.agent.prompts.single_assistant import SINGLE_ASSISTANT_SYSTEM_INSTRUCTION
@@ -9,7 +14,13 @@ from fundus_murag.agent.tools.tools import (
     get_lookup_tool,
     get_sim_search_tool,
 )
-from fundus_murag.data.dtos.agent import AgentModel, AgentResponse, MessageRequest, SessionHandle
+from fundus_murag.data.dtos.agent import (
+    AgentModel,
+    AgentResponse,
+    AgentStreamEvent,
+    MessageRequest,
+    SessionHandle,
+)
 
 router = APIRouter(
     prefix="/assistant",
@@ -19,34 +30,37 @@ router = APIRouter(
 assistant_factory = ChatAssistantFactory()
 
 
+def _get_or_create_assistant(request: MessageRequest) -> tuple[AsyncChatAssistant, SessionHandle]:
+    assistant, session = assistant_factory.get_or_create_async_assistant(
+        assistant_name="FUNdus! Assistant",
+        system_instruction=SINGLE_ASSISTANT_SYSTEM_INSTRUCTION,
+        available_tools=[
+            get_sim_search_tool(),
+            get_lex_search_tool(),
+            get_lookup_tool(),
+            get_image_analysis_tool(),
+        ],
+        model_name=request.model_name,
+        session=request.session_id,
+    )
+
+    # hacky way to handle the case where the user wants to find similar images to the one they provided.
+    # We alter the prompt here because we want to display the original message in the frontend ...
+    if request.message == "Find FundusRecords with similar images to this one" and request.user_image_id is not None:
+        request.message = (
+            "Find FundusRecords with images similar to the user provided image "
+            f"with the following ID: `user_image_id={request.user_image_id}`"
+        )
+
+    return assistant, session
+
+
 @router.post("/send_message", response_model=AgentResponse)
 async def send_message(request: MessageRequest):
     try:
-        assistant, session = assistant_factory.get_or_create_assistant(
-            assistant_name="FUNdus! Assistant",
-            system_instruction=SINGLE_ASSISTANT_SYSTEM_INSTRUCTION,
-            available_tools=[
-                get_sim_search_tool(),
-                get_lex_search_tool(),
-                get_lookup_tool(),
-                get_image_analysis_tool(),
-            ],
-            model_name=request.model_name,
-            session=request.session_id,
-        )
+        assistant, session = _get_or_create_assistant(request)
 
-        # hacky way to handle the case where the user wants to find similar images to the one they provided.
-        # We alter the prompt here because we want to display the original message in the frontend ...
-        if (
-            request.message == "Find FundusRecords with similar images to this one"
-            and request.user_image_id is not None
-        ):
-            request.message = (
-                "Find FundusRecords with images similar to the user provided image "
-                f"with the following ID: `user_image_id={request.user_image_id}`"
-            )
-
-        response_text = assistant.send_user_message(
+        response_text = await assistant.send_user_message(
             text_message=request.message,
         )
 
@@ -58,6 +72,30 @@ async def send_message(request: MessageRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/send_message/stream", response_class=StreamingResponse)
+async def send_message_stream(request: MessageRequest):
+    """
+    Sends a message to the assistant and streams the `AgentStreamEvent`s as server-sent events.
+    """
+    try:
+        assistant, session = _get_or_create_assistant(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def stream_events() -> AsyncIterator[str]:
+        yield AgentStreamEvent(event="session", session=session).to_server_sent_event()
+        try:
+            async for event in assistant.send_user_message_stream(text_message=request.message):
+                if event.event == "done":
+                    event.session = session
+                yield event.to_server_sent_event()
+        except Exception as e:
+            logger.error(f"Error while streaming the assistant response: {e}")
+            yield AgentStreamEvent(event="error", content=str(e), session=session).to_server_sent_event()
+
+    return StreamingResponse(stream_events(), media_type="text/event-stream")
+
+
 @router.get("/sessions", response_model=list[SessionHandle])
 async def list_sessions():
     try:
@@ -1,25 +1,25 @@
 from fastapi import APIRouter, HTTPException, Path, Query
 
+from fundus_murag.data.async_vector_db import AsyncVectorDB
 from fundus_murag.data.dtos.fundus import (
     FundusCollection,
     FundusRecord,
     FundusRecordImage,
 )
-from fundus_murag.data.vector_db import VectorDB
 
 router = APIRouter(prefix="/data/lookup", tags=["data/lookup"])
 
 
-vdb = VectorDB()
+vdb = AsyncVectorDB()
 
 
 @router.get(
     "/collections/count",
     summary="Get the total number of FUNDus! collections in the database.",
 )
-def get_total_number_of_fundus_collections() -> int:
+async def get_total_number_of_fundus_collections() -> int:
     try:
-        return vdb.get_total_number_of_fundus_collections()
+        return await vdb.get_total_number_of_fundus_collections()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -29,9 +29,9 @@ def get_total_number_of_fundus_collections() -> int:
     response_model=list[FundusCollection],
     summary="List all `FundusCollection`s in the FUNDus! database.",
 )
-def list_all_collections():
+async def list_all_collections():
     try:
-        return vdb.list_all_fundus_collections()
+        return await vdb.list_all_fundus_collections()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -41,15 +41,15 @@ def list_all_collections():
     response_model=FundusCollection,
     summary="Get a `FundusCollection` by its name or MURAG ID.",
 )
-def get_fundus_collection_by_id(
+async def get_fundus_collection_by_id(
     collection_name: str | None = Query(None, description="Unique internal name for the collection."),
     murag_id: str | None = Query(None, description="Unique identifier for the collection in the VectorDB."),
 ):
     try:
         if collection_name:
-            return vdb.get_fundus_collection_by_name(collection_name=collection_name)
+            return await vdb.get_fundus_collection_by_name(collection_name=collection_name)
         elif murag_id:
-            return vdb.get_fundus_collection_by_murag_id(murag_id=murag_id)
+            return await vdb.get_fundus_collection_by_murag_id(murag_id=murag_id)
         elif collection_name is None and murag_id is None:
             raise ValueError("Either `collection_name` or `murag_id` must be provided.")
     except KeyError as e:
@@ -65,7 +65,7 @@ def get_fundus_collection_by_id(
     response_model=dict[str, int],
     summary="Get the number of records per collection.",
 )
-def get_number_of_records_per_collection() -> dict[str, int]:
+async def get_number_of_records_per_collection() -> dict[str, int]:
     """
     Get the number of records per collection.
 
@@ -73,7 +73,7 @@ def get_number_of_records_per_collection() -> dict[str, int]:
         dict[str, int]: A dictionary with collection names as keys and the number of records as values.
     """
     try:
-        return vdb.get_number_of_records_per_collection()
+        return await vdb.get_number_of_records_per_collection()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -83,7 +83,7 @@ def get_number_of_records_per_collection() -> dict[str, int]:
     response_model=int,
     summary="Get the number of records per collection.",
 )
-def get_number_of_records_in_collection(
+async def get_number_of_records_in_collection(
     collection_name: str = Path(description="Unique internal name for the collection."),
 ) -> int:
     """
@@ -93,7 +93,7 @@ def get_number_of_records_in_collection(
         int: The number of records in the collection.
     """
     try:
-        return vdb.get_number_of_records_in_collection(collection_name)
+        return await vdb.get_number_of_records_in_collection(collection_name)
     except KeyError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -104,9 +104,9 @@ def get_number_of_records_in_collection(
     "/records/count",
     summary="Get the total number of FUNDus! records in the database.",
 )
-def get_total_number_of_fundus_records() -> int:
+async def get_total_number_of_fundus_records() -> int:
     try:
-        return vdb.get_total_number_of_fundus_records()
+        return await vdb.get_total_number_of_fundus_records()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -116,7 +116,7 @@ def get_total_number_of_fundus_records() -> int:
     response_model=FundusRecord | list[FundusRecord],
     summary="Get a `FundusRecord`s by its ID or the `FundusRecord` by MURAG ID.",
 )
-def get_fundus_records_by_id(
+async def get_fundus_records_by_id(
     fundus_id: int | None = Query(
         None,
         description="An identifier for the `FundusRecord`. If a `FundusRecord` has multiple images, the records share the `fundus_id`.",
@@ -129,9 +129,9 @@ def get_fundus_records_by_id(
         elif murag_id is not None and fundus_id is not None:
             raise ValueError("Either `fundus_id` or `murag_id` must be provided, not both.")
         elif murag_id:
-            record = vdb.get_fundus_record_by_murag_id(murag_id=murag_id)
+            record = await vdb.get_fundus_record_by_murag_id(murag_id=murag_id)
         elif fundus_id:
-            record = vdb.get_fundus_records_by_fundus_id(fundus_id=fundus_id)
+            record = await vdb.get_fundus_records_by_fundus_id(fundus_id=fundus_id)
         else:
             # This can never happen but the linter is not smart enough ...
             raise ValueError("Either `fundus_id` or `murag_id` must be provided.")
@@ -150,11 +150,11 @@ def get_fundus_records_by_id(
     response_model=FundusRecordImage,
     summary="Returns the `FundusRecordImage`s from the `FundusRecord` with the specified `murag_id`.",
 )
-def get_fundus_record_image_by_murag_id(
+async def get_fundus_record_image_by_murag_id(
     murag_id: str = Query(..., description="Unique identifier for the `FundusRecord` in the VectorDB."),
 ):
     try:
-        record_img = vdb.get_fundus_record_image_by_murag_id(murag_id=murag_id)
+        record_img = await vdb.get_fundus_record_image_by_murag_id(murag_id=murag_id)
     except KeyError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
@@ -1,27 +1,27 @@
 from fastapi import APIRouter, HTTPException, Query
 
+from fundus_murag.data.async_vector_db import AsyncVectorDB
 from fundus_murag.data.dtos.fundus import (
     FundusCollection,
     FundusRecord,
 )
-from fundus_murag.data.vector_db import VectorDB
 
 router = APIRouter(prefix="/data/random", tags=["data/random"])
 
 
-vdb = VectorDB()
+vdb = AsyncVectorDB()
 
 
 @router.get(
     "/collections",
-    response_model=FundusCollection,
-    summary="Returns a random `FundusCollection` from FUNDus.",
+    response_model=list[FundusCollection],
+    summary="Returns N random `FundusCollection`s from FUNDus.",
 )
-def get_random_fundus_collection(
+async def get_random_fundus_collection(
     n: int = Query(1, description="The number of random collections to return."),
 ):
     try:
-        return vdb.get_random_fundus_collection(n=n)
+        return await vdb.get_random_fundus_collection(n=n)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -33,12 +33,12 @@ def get_random_fundus_collection(
     response_model=list[FundusRecord],
     summary="Returns N random `FundusRecord`s from FUNDus.",
 )
-def get_random_fundus_record(
+async def get_random_fundus_record(
     n: int = Query(1, description="The number of random records to return."),
     collection_name: str | None = Query(None, description="Unique internal name for the collection."),
 ):
     try:
-        return vdb.get_random_fundus_records(n=n, collection_name=collection_name)
+        return await vdb.get_random_fundus_records(n=n, collection_name=collection_name)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException
 
+from fundus_murag.data.async_vector_db import AsyncVectorDB
 from fundus_murag.data.dtos.fundus import (
     FundusCollection,
     FundusRecord,
@@ -13,24 +14,33 @@ from fundus_murag.data.dtos.vector_db import (
     FundusCollectionSemanticSearchResult,
     FundusRecordSemanticSearchResult,
 )
-from fundus_murag.data.vector_db import VectorDB
 from fundus_murag.ml.client import FundusMLClient
 
 router = APIRouter(prefix="/data/search", tags=["data/search"])
 
-vdb = VectorDB()
+vdb = AsyncVectorDB()
 mlc = FundusMLClient()
 
 
+async def _compute_text_embedding(text: str) -> list[float]:
+    embedding = await mlc.compute_text_embedding_async(text=text, return_tensor="np")
+    return embedding.tolist()  # type: ignore
+
+
+async def _compute_image_embedding(base64_image: str) -> list[float]:
+    embedding = await mlc.compute_image_embedding_async(base64_image=base64_image, return_tensor="np")
+    return embedding.tolist()  # type: ignore
+
+
 @router.post(
     "/records/similar/i2i",
     response_model=list[FundusRecordSemanticSearchResult],
     summary="Perform a similarity search of record images via a query image.",
 )
-def fundus_record_i2i_similarity_search(query: SimilaritySearchQuery):
+async def fundus_record_i2i_similarity_search(query: SimilaritySearchQuery):
     try:
-        query_embedding = mlc.compute_image_embedding(base64_image=query.query, return_tensor="np").tolist()  # type: ignore
-        return vdb._fundus_record_image_similarity_search(
+        query_embedding = await _compute_image_embedding(query.query)
+        return await vdb._fundus_record_image_similarity_search(
             query_embedding=query_embedding,
             search_in_collections=query.collection_names,
             top_k=query.top_k,
@@ -44,10 +54,10 @@ def fundus_record_i2i_similarity_search(query: SimilaritySearchQuery):
     response_model=list[FundusRecordSemanticSearchResult],
     summary="Perform a similarity search of record images via a query string.",
 )
-def fundus_record_t2i_similarity_search(query: SimilaritySearchQuery):
+async def fundus_record_t2i_similarity_search(query: SimilaritySearchQuery):
     try:
-        query_embedding = mlc.compute_text_embedding(text=query.query, return_tensor="np").tolist()  # type: ignore
-        return vdb._fundus_record_image_similarity_search(
+        query_embedding = await _compute_text_embedding(query.query)
+        return await vdb._fundus_record_image_similarity_search(
             query_embedding=query_embedding,
             search_in_collections=query.collection_names,
             top_k=query.top_k,
@@ -61,10 +71,10 @@ def fundus_record_t2i_similarity_search(query: SimilaritySearchQuery):
     response_model=list[FundusRecordSemanticSearchResult],
     summary="Perform a similarity search of record titles via a query image.",
 )
-def fundus_record_i2t_similarity_search(query: SimilaritySearchQuery):
+async def fundus_record_i2t_similarity_search(query: SimilaritySearchQuery):
     try:
-        query_embedding = mlc.compute_image_embedding(base64_image=query.query, return_tensor="np").tolist()  # type: ignore
-        return vdb._fundus_record_title_similarity_search(
+        query_embedding = await _compute_image_embedding(query.query)
+        return await vdb._fundus_record_title_similarity_search(
             query_embedding=query_embedding,
             search_in_collections=query.collection_names,
             top_k=query.top_k,
@@ -78,10 +88,10 @@ def fundus_record_i2t_similarity_search(query: SimilaritySearchQuery):
     response_model=list[FundusRecordSemanticSearchResult],
     summary="Perform a similarity search of record titles via a query string.",
 )
-def fundus_record_t2t_similarity_search(query: SimilaritySearchQuery):
+async def fundus_record_t2t_similarity_search(query: SimilaritySearchQuery):
     try:
-        query_embedding = mlc.compute_text_embedding(text=query.query, return_tensor="np").tolist()  # type: ignore
-        return vdb._fundus_record_title_similarity_search(
+        query_embedding = await _compute_text_embedding(query.query)
+        return await vdb._fundus_record_title_similarity_search(
             query_embedding=query_embedding,
             search_in_collections=query.collection_names,
             top_k=query.top_k,
@@ -95,9 +105,9 @@ def fundus_record_t2t_similarity_search(query: SimilaritySearchQuery):
     response_model=list[FundusRecord],
     summary="Perform a lexical search on `FundusRecord` titles using a query string.",
 )
-def fundus_record_title_lexical_search(query: RecordLexicalSearchQuery):
+async def fundus_record_title_lexical_search(query: RecordLexicalSearchQuery):
     try:
-        return vdb._fundus_record_lexical_search(
+        return await vdb._fundus_record_lexical_search(
             query=query.query,
             search_in_collections=query.collection_names,
             top_k=query.top_k,
@@ -111,9 +121,9 @@ def fundus_record_title_lexical_search(query: RecordLexicalSearchQuery):
     response_model=list[FundusCollection],
     summary="Perform a lexical search on `FundusCollection`s using a query string.",
 )
-def fundus_collection_lexical_search(query: CollectionLexicalSearchQuery):
+async def fundus_collection_lexical_search(query: CollectionLexicalSearchQuery):
     try:
-        return vdb._fundus_collection_lexical_search(
+        return await vdb._fundus_collection_lexical_search(
             query=query.query,
             top_k=query.top_k,
             search_in_collection_name=query.search_in_collection_name,
@@ -131,10 +141,10 @@ def fundus_collection_lexical_search(query: CollectionLexicalSearchQuery):
     response_model=list[FundusCollectionSemanticSearchResult],
     summary="Perform a semantic similarity search on `FundusCollection`s based on their description.",
 )
-def fundus_collection_description_similarity_search(query: SimilaritySearchQuery):
-    query_embedding = mlc.compute_text_embedding(text=query.query, return_tensor="np").tolist()  # type: ignore
+async def fundus_collection_description_similarity_search(query: SimilaritySearchQuery):
+    query_embedding = await _compute_text_embedding(query.query)
     try:
-        return vdb.fundus_collection_description_similarity_search(
+        return await vdb.fundus_collection_description_similarity_search(
             query_embedding=query_embedding,
             top_k=query.top_k,
         )
@@ -144,13 +154,13 @@ def fundus_collection_description_similarity_search(query: SimilaritySearchQuery
 
 @router.post(
     "/collections/title/similar",
-    response_model=list[SimilaritySearchQuery],
+    response_model=list[FundusCollectionSemanticSearchResult],
     summary="Perform a semantic similarity search on `FundusCollection`s based on their title.",
 )
-def fundus_collection_title_similarity_search(query: SimilaritySearchQuery):
+async def fundus_collection_title_similarity_search(query: SimilaritySearchQuery):
     try:
-        query_embedding = mlc.compute_text_embedding(text=query.query, return_tensor="np").tolist()  # type: ignore
-        return vdb.fundus_collection_title_similarity_search(
+        query_embedding = await _compute_text_embedding(query.query)
+        return await vdb.fundus_collection_title_similarity_search(
             query_embedding=query_embedding,
             top_k=query.top_k,
         )
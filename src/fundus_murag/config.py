@@ -1,6 +1,7 @@
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 import yaml
 from loguru import logger
@@ -19,11 +20,15 @@ class DataConfig(BaseSettings):
     collections_embeddings_df_file: str
     user_image_dir: str
     fundus_data_root: str
+    import_workers: int = 8
+    import_checkpoint_file: str | None = None
+    image_blob_store_dir: str | None = None
 
 
 class AppConfig(BaseSettings):
     dev_mode: bool
     reset_vdb_on_startup: bool
+    sync_vdb_on_startup: bool = False
 
 
 class WeaviateConfig(BaseSettings):
@@ -44,10 +49,25 @@ class OpenAIConfig(BaseSettings):
 
 class FundusConfig(BaseSettings):
     ml_url: str
+    ml_timeout: float = 30.0
+    ml_connect_timeout: float = 5.0
+    ml_max_retries: int = 3
+    ml_retry_backoff: float = 0.5
+    ml_max_connections: int = 32
+    ml_response_format: Literal["json", "float32", "float16"] = "float32"
+    ml_batch_wait_ms: float = 0.0
+    ml_batch_max_size: int = 128
+    ml_max_concurrent_batches: int = 4
+    ml_text_embedding_cache_size: int = 10000
+    ml_text_embedding_cache_file: str | None = None
 
 
 class AssistantConfig(BaseSettings):
     default_model: str
+    max_parallel_tool_calls: int = 4
+    max_context_tokens: int = 32000
+    keep_recent_turns: int = 2
+    max_old_tool_output_tokens: int = 256
 
 
 class MLFlowConfig(BaseSettings):
@@ -0,0 +1,445 @@
+import asyncio
+from typing import Callable, Literal, TypeVar
+
+import weaviate
+from loguru import logger
+
+from fundus_murag.config import load_config
+from fundus_murag.data.dtos.fundus import (
+    FundusCollection,
+    FundusRecord,
+    FundusRecordImage,
+    FundusRecordInternal,
+)
+from fundus_murag.data.dtos.vector_db import (
+    FundusCollectionSemanticSearchResult,
+    FundusRecordSemanticSearchResult,
+)
+from fundus_murag.data.schema import (
+    FUNDUS_COLLECTION_SCHEMA_NAME,
+    FUNDUS_RECORD_SCHEMA_NAME,
+)
+from fundus_murag.data.vector_db import VectorDB
+from fundus_murag.singleton_meta import SingletonMeta
+
+T = TypeVar("T")
+
+
+class AsyncVectorDB(metaclass=SingletonMeta):
+    def __init__(self):
+        """
+        The AsyncVectorDB provides async variants of the `VectorDB` query methods backed by Weaviate's async client,
+        so that the queries do not block the event loop of the API. Importing the data, the in-memory
+        `CollectionCatalog`, building the queries, and the conversion of the query results are shared with the
+        (sync) `VectorDB`, which is why it is created (and the data is imported) before the async client connects.
+        """
+        self._config = load_config()
+        self._vdb = VectorDB()
+        self._client: weaviate.WeaviateAsyncClient | None = None
+        self._client_lock = asyncio.Lock()
+
+    async def _connect_to_weaviate(self, raise_on_error: bool = False) -> weaviate.WeaviateAsyncClient:
+        client = weaviate.use_async_with_custom(
+            http_host=self._config.weaviate.host,
+            http_port=self._config.weaviate.http_port,
+            http_secure=False,
+            grpc_host=self._config.weaviate.host,
+            grpc_port=self._config.weaviate.grpc_port,
+            grpc_secure=False,
+        )
+        await client.connect()
+        if not await client.is_ready():
+            msg = f"Cannot connect to Weaviate {self._config.weaviate.host}:{self._config.weaviate.http_port}!"
+            logger.warning(msg)
+            if raise_on_error:
+                raise ConnectionError(msg)
+        logger.info(
+            f"Connected async client to Weaviate {self._config.weaviate.host}:{self._config.weaviate.http_port}"
+        )
+        return client
+
+    async def _get_client(self) -> weaviate.WeaviateAsyncClient:
+        if self._client is not None and self._client.is_connected():
+            return self._client
+
+        async with self._client_lock:
+            # another task may have connected while we were waiting for the lock
+            if self._client is not None and self._client.is_connected():
+                return self._client
+
+            MAX_RETRIES = 5
+            for _ in range(MAX_RETRIES - 1):
+                try:
+                    self._client = await self._connect_to_weaviate()
+                    if await self._client.is_ready():
+                        return self._client
+                except Exception as e:
+                    logger.warning(f"Error while connecting async client to Weaviate: {e}")
+                await asyncio.sleep(1)
+
+            self._client = await self._connect_to_weaviate(raise_on_error=True)
+            return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _convert_with_blob_store(self, convert_fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Runs a conversion of query results that reads the images from the image blob store in a worker thread so
+        that the file reads do not block the event loop. Without a blob store, the images are part of the query
+        results and the conversion runs directly.
+        """
+        if not self._vdb.uses_image_blob_store:
+            return convert_fn(*args, **kwargs)
+        return await asyncio.to_thread(convert_fn, *args, **kwargs)
+
+    async def _get_fundus_record_collection(self):
+        client = await self._get_client()
+        return client.collections.get(FUNDUS_RECORD_SCHEMA_NAME)
+
+    async def _get_fundus_collection_collection(self):
+        client = await self._get_client()
+        return client.collections.get(FUNDUS_COLLECTION_SCHEMA_NAME)
+
+    async def get_total_number_of_fundus_records(self) -> int:
+        """
+        Get the total number of FUNDus! records in the database.
+
+        Returns:
+            int: Total count of records.
+        """
+        try:
+            collection = await self._get_fundus_record_collection()
+            agg = await collection.aggregate.over_all(total_count=True)
+            if agg.total_count is None:
+                return 0
+            return agg.total_count
+        except Exception:
+            return 0
+
+    async def get_total_number_of_fundus_collections(self) -> int:
+        """
+        Get the total number of FUNDus! collections in the database.
+
+        Returns:
+            int: Total count of collections.
+        """
+        try:
+            collection = await self._get_fundus_collection_collection()
+            agg = await collection.aggregate.over_all(total_count=True)
+            if agg.total_count is None:
+                return 0
+            return agg.total_count
+        except Exception:
+            return 0
+
+    # The collections and the number of records are served from memory by the VectorDB and never block.
+
+    async def list_all_fundus_collections(self) -> list[FundusCollection]:
+        return self._vdb.list_all_fundus_collections()
+
+    async def get_fundus_collection_by_murag_id(self, murag_id: str) -> FundusCollection:
+        return self._vdb.get_fundus_collection_by_murag_id(murag_id)
+
+    async def get_fundus_collection_by_name(self, collection_name: str) -> FundusCollection:
+        return self._vdb.get_fundus_collection_by_name(collection_name)
+
+    async def get_random_fundus_collection(self, n: int = 1) -> list[FundusCollection]:
+        return self._vdb.get_random_fundus_collection(n=n)
+
+    async def get_number_of_records_per_collection(self) -> dict[str, int]:
+        return self._vdb.get_number_of_records_per_collection()
+
+    async def get_number_of_records_in_collection(self, collection_name: str) -> int:
+        return self._vdb.get_number_of_records_in_collection(collection_name)
+
+    async def get_random_fundus_records(
+        self,
+        n: int = 1,
+        collection_name: str | None = None,
+    ) -> list[FundusRecord | FundusRecordInternal]:
+        """
+        Get N random `FundusRecord`s. If `collection_name` is specified, the records will be from the respective `FundusCollection`.
+
+        Args:
+            n (int, optional): Number of records to return. Defaults to 1
+            collection_name (str, optional): An optional name of a `FundusCollection` specifying the records to return. If None, records will be from any `FundusCollection`. Defaults to None.
+
+        Returns:
+            list[`FundusRecord`]: A list of N `FundusRecord` objects.
+        """
+        murag_ids = self._vdb.sample_random_murag_ids(n=n, collection_name=collection_name)
+
+        results = await self.get_fundus_records_by_murag_ids(murag_ids=murag_ids)
+        return results
+
+    async def get_fundus_records_by_murag_ids(
+        self,
+        murag_ids: list[str],
+    ) -> list[FundusRecord | FundusRecordInternal]:
+        """
+        Get multiple `FundusRecord`s by their unique identifiers in a single query.
+
+        Args:
+            murag_ids (list[str]): The unique identifiers of the records in the VectorDB.
+
+        Returns:
+            list[`FundusRecord`]: The `FundusRecord` objects with the specified `murag_id`s in the requested order.
+        """
+        if len(murag_ids) == 0:
+            return []
+
+        collection = await self._get_fundus_record_collection()
+        res = await collection.query.fetch_objects(**self._vdb.build_murag_id_query(murag_ids))
+
+        results = self._vdb.create_fundus_records_in_murag_id_order(res, murag_ids)
+        return results
+
+    async def get_fundus_record_by_murag_id(
+        self,
+        murag_id: str,
+    ) -> FundusRecord:
+        """
+        Get a `FundusRecord` by its unique identifier.
+
+        Args:
+            murag_id (str): The unique identifier of the record in the VectorDB.
+
+        Returns:
+            `FundusRecord`: The `FundusRecord` object with the specified `murag_id`.
+        """
+        collection = await self._get_fundus_record_collection()
+        res = await collection.query.fetch_objects(**self._vdb.build_murag_id_query(murag_id))
+        if len(res.objects) == 0:
+            raise KeyError(f"FundusRecord with murag_id={murag_id} not found!")
+
+        results = self._vdb.create_fundus_records_from_query_results(res)
+        return results[0]
+
+    async def get_fundus_record_image_by_murag_id(
+        self,
+        murag_id: str,
+    ) -> FundusRecordImage:
+        """
+        Get a `FundusRecordImage` by its unique identifier.
+
+        Args:
+            murag_id (str): The unique identifier of the record in the VectorDB.
+
+        Returns:
+            `FundusRecordImage`: The `FundusRecordImage` object with the specified `murag_id`.
+        """
+        collection = await self._get_fundus_record_collection()
+        res = await collection.query.fetch_objects(**self._vdb.build_murag_id_query(murag_id, dto=FundusRecordImage))
+
+        result = await self._convert_with_blob_store(
+            self._vdb.create_fundus_record_image_from_query_results, res, murag_id
+        )
+        return result
+
+    async def get_fundus_records_by_fundus_id(
+        self,
+        fundus_id: int,
+    ) -> list[FundusRecord | FundusRecordInternal]:
+        """
+        Returns all `FundusRecord`s that share the given `fundus_id`. If a `FundusRecord` has multiple images, the records share the `fundus_id`.
+
+        Args:
+            fundus_id (int): An identifier for the `FundusRecord`s.
+
+        Returns:
+            `FundusRecord`: The `FundusRecord` object(s) with the specified `fundus_id`.
+        """
+        collection = await self._get_fundus_record_collection()
+        res = await collection.query.fetch_objects(**self._vdb.build_fundus_id_query(fundus_id))
+        if len(res.objects) == 0:
+            raise KeyError(f"FundusRecord with fundus_id={fundus_id} not found!")
+
+        results = self._vdb.create_fundus_records_from_query_results(res)
+        return results
+
+    async def _fundus_record_image_similarity_search(
+        self,
+        query_embedding: list[float],
+        search_in_collections: list[str] | None = None,
+        top_k: int = 10,
+        return_internal_records: bool = False,
+    ) -> list[FundusRecordSemanticSearchResult]:
+        results = await self._fundus_record_similarity_search(
+            query_embedding=query_embedding,
+            target_vector="record_image",
+            search_in_collections=search_in_collections,
+            top_k=top_k,
+            return_internal_records=return_internal_records,
+        )
+        return results
+
+    async def _fundus_record_title_similarity_search(
+        self,
+        query_embedding: list[float],
+        search_in_collections: list[str] | None = None,
+        top_k: int = 10,
+        return_internal_records: bool = False,
+    ) -> list[FundusRecordSemanticSearchResult]:
+        results = await self._fundus_record_similarity_search(
+            query_embedding=query_embedding,
+            target_vector="record_title",
+            search_in_collections=search_in_collections,
+            top_k=top_k,
+            return_internal_records=return_internal_records,
+        )
+        return results
+
+    async def _fundus_record_similarity_search(
+        self,
+        query_embedding: list[float],
+        target_vector: Literal["record_image", "record_title"],
+        search_in_collections: list[str] | None = None,
+        top_k: int = 10,
+        return_internal_records: bool = False,
+    ) -> list[FundusRecordSemanticSearchResult]:
+        """
+        Perform a similarity search of records via their image or title embedding.
+
+        Args:
+            query_embedding (list[float]): The query embedding vector.
+            target_vector (Literal["record_image", "record_title"]): The target vector for the similarity search.
+            search_in_collections (list[str], optional): Names of `FundusCollection`s to restrict the search. Defaults to None.
+            top_k (int, optional): Number of top results to return. Defaults to 10
+            return_internal_record (bool, optional): Whether to return FundusRecordInternal objects with additional data. Defaults to False.
+
+        Returns:
+            list[FundusRecordSemanticSearchResult]: `FundusRecord`s search results with similarity scores.
+        """
+        query = self._vdb.build_fundus_record_similarity_search_query(
+            target_vector=target_vector,
+            search_in_collections=search_in_collections,
+            top_k=top_k,
+            return_internal_records=return_internal_records,
+        )
+        collection = await self._get_fundus_record_collection()
+
+        results = await collection.query.near_vector(query_embedding, **query)
+
+        simsearch_results = await self._convert_with_blob_store(
+            self._vdb.create_fundus_record_semantic_search_results, results, internal=return_internal_records
+        )
+        return simsearch_results
+
+    async def _fundus_record_lexical_search(
+        self,
+        query: str,
+        search_in_collections: list[str] | None = None,
+        search_in_title: bool = True,
+        top_k: int = 10,
+    ) -> list[FundusRecord]:
+        """
+        Perform a lexical search for `FundusRecord`s using a query string.
+        Currently this searches only in the title field but will be extended to other fields in the details.
+
+        Args:
+            query (str): The search query.
+            search_in_collections (list[str], optional): Names of `FundusCollection`s to restrict the search. Defaults to None.
+            top_k (int, optional): Number of top results to return. Defaults to 10
+
+        Returns:
+            list[FundusRecord]: `FundusRecord`s matching the search query.
+        """
+        bm25_query = self._vdb.build_fundus_record_lexical_search_query(
+            search_in_collections=search_in_collections,
+            search_in_title=search_in_title,
+            top_k=top_k,
+        )
+        collection = await self._get_fundus_record_collection()
+
+        results = await collection.query.bm25(query, **bm25_query)
+
+        results = self._vdb.create_fundus_records_from_query_results(results)
+        return results
+
+    async def _fundus_collection_lexical_search(
+        self,
+        query: str,
+        *,
+        top_k: int = 10,
+        search_in_collection_name: bool = True,
+        search_in_title: bool = True,
+        search_in_description: bool = True,
+        search_in_german_title: bool = True,
+        search_in_german_description: bool = True,
+    ) -> list[FundusCollection]:
+        """
+        Perform a lexical search on `FundusCollection`s using a query string.
+
+        Args:
+            query (str): The search query.
+            top_k (int, optional): Number of top results to return. Defaults to 10
+            search_in_collection_name (bool, optional): Search in collection IDs if True. Defaults to True.
+            search_in_title (bool, optional): Search in English titles if True. Defaults to True.
+            search_in_description (bool, optional): Search in English descriptions if True. Defaults to True.
+            search_in_german_title (bool, optional): Search in German titles if True. Defaults to True.
+            search_in_german_description (bool, optional): Search in German descriptions if True. Defaults to True.
+
+        Returns:
+            list[FundusCollection]: `FundusCollection`s matching the search query.
+        """
+        bm25_query = self._vdb.build_fundus_collection_lexical_search_query(
+            top_k=top_k,
+            search_in_collection_name=search_in_collection_name,
+            search_in_title=search_in_title,
+            search_in_description=search_in_description,
+            search_in_german_title=search_in_german_title,
+            search_in_german_description=search_in_german_description,
+        )
+        collection = await self._get_fundus_collection_collection()
+
+        res = await collection.query.bm25(query, **bm25_query)
+
+        results = self._vdb.create_fundus_collections_from_query_results(res)
+        return results
+
+    async def fundus_collection_description_similarity_search(
+        self,
+        query_embedding: list[float],
+        top_k: int = 10,
+    ) -> list[FundusCollectionSemanticSearchResult]:
+        results = await self._fundus_collection_similarity_search(
+            query_embedding=query_embedding,
+            target_vector="collection_description",
+            top_k=int(top_k),
+        )
+        return results
+
+    async def fundus_collection_title_similarity_search(
+        self,
+        query_embedding: list[float],
+        top_k: int = 10,
+    ) -> list[FundusCollectionSemanticSearchResult]:
+        results = await self._fundus_collection_similarity_search(
+            query_embedding=query_embedding,
+            target_vector="collection_title",
+            top_k=int(top_k),
+        )
+        return results
+
+    async def _fundus_collection_similarity_search(
+        self,
+        query_embedding: list[float],
+        target_vector: Literal["collection_title", "collection_description"],
+        top_k: int = 10,
+    ) -> list[FundusCollectionSemanticSearchResult]:
+        """
+        Perform a similarity search of `FundusCollection`s based on their title or description embedding.
+        Returns structured results with certainty and distance scores.
+        """
+        collection = await self._get_fundus_collection_collection()
+
+        results = await collection.query.near_vector(
+            query_embedding,
+            **self._vdb.build_fundus_collection_similarity_search_query(target_vector=target_vector, top_k=top_k),
+        )
+
+        simsearch_results = self._vdb.create_fundus_collection_semantic_search_results(results)
+        return simsearch_results
@@ -0,0 +1,135 @@
+from functools import lru_cache
+from typing import Iterable
+
+from fundus_murag.data.dtos.fundus import FundusCollection
+
+NGRAM_SIZE: int = 3
+
+
+def _ngrams(s: str, n: int = NGRAM_SIZE) -> set[str]:
+    return {s[i : i + n] for i in range(len(s) - n + 1)}
+
+
+class CollectionCatalog:
+    def __init__(self, collections: Iterable[FundusCollection]):
+        """
+        The CollectionCatalog holds all `FundusCollection`s in memory. Since the collections are static for the life
+        of the process, it is built once at startup and indexes the collections by their `murag_id`, their name, and
+        their lowercased English and German titles, so that all lookups are simple dict lookups. Fuzzy name resolution
+        uses an n-gram index over the names and titles and caches its results.
+
+        Args:
+            collections (Iterable[FundusCollection]): The `FundusCollection`s of the catalog.
+        """
+        self._collections: list[FundusCollection] = list(collections)
+        self._by_murag_id: dict[str, FundusCollection] = {}
+        self._by_name: dict[str, FundusCollection] = {}
+        self._by_title: dict[str, FundusCollection] = {}
+        self._by_title_de: dict[str, FundusCollection] = {}
+        self._field_labels: dict[str, dict[str, str]] = {}
+
+        for collection in self._collections:
+            self._by_murag_id[collection.murag_id] = collection
+            self._by_name[collection.collection_name] = collection
+            # keep the first collection if multiple collections share the same title
+            self._by_title.setdefault(collection.title.lower(), collection)
+            self._by_title_de.setdefault(collection.title_de.lower(), collection)
+            self._field_labels[collection.collection_name] = {f.name: f.label_en for f in collection.fields}
+
+        # the keys used for fuzzy matching, i.e., the name and the lowercased titles of each collection
+        self._search_keys: list[tuple[str, str, str]] = [
+            (c.collection_name, c.title.lower(), c.title_de.lower()) for c in self._collections
+        ]
+        self._ngram_index: dict[str, set[int]] = {}
+        for idx, keys in enumerate(self._search_keys):
+            for key in keys:
+                for ngram in _ngrams(key):
+                    self._ngram_index.setdefault(ngram, set()).add(idx)
+
+        self.resolve_name = lru_cache(maxsize=4096)(self._resolve_name)
+
+    def __len__(self) -> int:
+        return len(self._collections)
+
+    def __contains__(self, collection_name: str) -> bool:
+        return collection_name in self._by_name
+
+    @property
+    def collections(self) -> list[FundusCollection]:
+        return list(self._collections)
+
+    def get_by_murag_id(self, murag_id: str) -> FundusCollection:
+        if murag_id not in self._by_murag_id:
+            raise KeyError(f"FundusCollection with 'murag_id'={murag_id} not found!")
+        return self._by_murag_id[murag_id]
+
+    def get_by_name(self, collection_name: str) -> FundusCollection:
+        if collection_name not in self._by_name:
+            raise KeyError(f"FundusCollection with 'collection_name'={collection_name} not found!")
+        return self._by_name[collection_name]
+
+    def find_by_title(self, title: str) -> FundusCollection | None:
+        """
+        Returns the `FundusCollection` with the given English or German title (case-insensitive) or None.
+        """
+        title = title.lower()
+        return self._by_title.get(title, self._by_title_de.get(title))
+
+    def get_field_labels(self, collection_name: str) -> dict[str, str]:
+        """
+        Returns the mapping from the field names to the English field labels of the `FundusCollection`.
+        """
+        if collection_name not in self._field_labels:
+            raise KeyError(f"FundusCollection with 'collection_name'={collection_name} not found!")
+        return self._field_labels[collection_name]
+
+    def _find_substring_candidates(self, query: str) -> list[int]:
+        """
+        Returns the indices of the collections whose search keys may contain the query, i.e., contain all n-grams
+        of the query. Queries shorter than the n-gram size cannot be filtered and all collections are returned.
+        """
+        if len(query) < NGRAM_SIZE:
+            return list(range(len(self._search_keys)))
+
+        postings = []
+        for ngram in _ngrams(query):
+            if ngram not in self._ngram_index:
+                return []
+            postings.append(self._ngram_index[ngram])
+        return sorted(set.intersection(*postings))
+
+    def _resolve_name(self, collection_name: str) -> str:
+        """
+        Resolves a (possibly LLM-generated) collection name to the unique name of a `FundusCollection`.
+        Exact matches of the name or the English or German title are preferred. Otherwise, the collection whose name
+        or titles contain the given name is returned. Use the cached `resolve_name` instead of calling this directly.
+
+        Raises:
+            KeyError: If no collection or multiple collections match the name.
+        """
+        # exact matches
+        collection_name = collection_name.strip().lower()
+        if "collection" in collection_name:
+            collection_name = collection_name.replace("collection", "").strip()
+
+        if collection_name in self._by_name:
+            return collection_name
+        collection = self.find_by_title(collection_name)
+        if collection is not None:
+            return collection.collection_name
+
+        # fuzzy matches
+        matches = []
+        for idx in self._find_substring_candidates(collection_name):
+            name, title, title_de = self._search_keys[idx]
+            if collection_name in name or collection_name in title or collection_name in title_de:
+                matches.append((name, title, title_de))
+
+        if len(matches) == 0:
+            raise KeyError(f"Collection with name '{collection_name}' not found!")
+        elif len(matches) > 1:
+            raise KeyError(
+                f"Ambigious collection name `{collection_name}`! Multiple possible collections found: {matches}"
+            )
+
+        return matches[0][0]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 from fundus_murag.data.dtos.session import SessionHandle
@@ -40,3 +42,24 @@ class ChatMessage(BaseModel):
 
     role: str
     content: str
+
+
+class AgentStreamEvent(BaseModel):
+    """Server-sent event emitted while a FUNDus Agent processes a message."""
+
+    event: Literal["session", "forward", "tool_call", "tool_result", "token", "done", "error"] = Field(
+        ...,
+        description=(
+            "The type of the event: `session` is sent first, `forward` when a request is forwarded to another "
+            "assistant, `tool_call` and `tool_result` around every tool call, `token` for every chunk of the answer, "
+            "`done` with the full answer, and `error` if processing the message failed."
+        ),
+    )
+    content: str = Field(
+        default="",
+        description="The answer token(s), the tool or assistant name, the full answer, or the error message.",
+    )
+    session: SessionHandle | None = Field(default=None, description="The session of the FUNDus Agent.")
+
+    def to_server_sent_event(self) -> str:
+        return f"event: {self.event}\ndata: {self.model_dump_json()}\n\n"
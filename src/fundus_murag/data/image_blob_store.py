@@ -0,0 +1,75 @@
+import base64
+import hashlib
+import os
+from pathlib import Path
+from uuid import uuid4
+
+import srsly
+from loguru import logger
+
+
+class ImageBlobStore:
+    def __init__(self, root_dir: str | Path):
+        """
+        The ImageBlobStore stores the images of the `FundusRecord`s outside of the VectorDB as content-addressed files,
+        i.e., every image is stored once under the SHA-256 hash of its bytes. An index maps the `murag_id` of a
+        `FundusRecord` to the hash of its image.
+
+        Args:
+            root_dir (str | Path): The root directory of the blob store.
+        """
+        self._root_dir = Path(root_dir)
+        self._objects_dir = self._root_dir / "objects"
+        self._objects_dir.mkdir(parents=True, exist_ok=True)
+        self._index_file = self._root_dir / "index.json"
+        self._index: dict[str, str] = self._load_index()
+
+    def _load_index(self) -> dict[str, str]:
+        if not self._index_file.exists():
+            return {}
+        index: dict[str, str] = srsly.read_json(self._index_file)  # type: ignore
+        logger.info(f"Loaded image blob store index with {len(index)} images from {self._index_file}")
+        return index
+
+    def flush(self) -> None:
+        tmp_file = self._index_file.with_suffix(f".{uuid4().hex}.tmp")
+        srsly.write_json(tmp_file, self._index)
+        os.replace(tmp_file, self._index_file)
+
+    def _get_blob_path(self, digest: str) -> Path:
+        return self._objects_dir / digest[:2] / f"{digest}.jpg"
+
+    def __contains__(self, murag_id: str) -> bool:
+        return murag_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def put(self, murag_id: str, base64_image: str) -> str:
+        """
+        Stores the base64 encoded image of the `FundusRecord` with the given `murag_id` and returns its hash.
+        This is thread-safe, so images can be stored from multiple threads. Call `flush` afterward to persist the index.
+        """
+        image_bytes = base64.b64decode(base64_image)
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        blob_path = self._get_blob_path(digest)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_suffix(f".{uuid4().hex}.tmp")
+            tmp_path.write_bytes(image_bytes)
+            os.replace(tmp_path, blob_path)
+        self._index[murag_id] = digest
+        return digest
+
+    def get(self, murag_id: str) -> str:
+        """
+        Returns the base64 encoded image of the `FundusRecord` with the given `murag_id`.
+        """
+        if murag_id not in self._index:
+            raise KeyError(f"Image of FundusRecord with murag_id={murag_id} not found in the image blob store!")
+        blob_path = self._get_blob_path(self._index[murag_id])
+        return base64.b64encode(blob_path.read_bytes()).decode("utf-8")
+
+    def remove(self, murag_id: str) -> None:
+        # we only remove the index entry because the blob may be shared with other records
+        self._index.pop(murag_id, None)
@@ -0,0 +1,66 @@
+import time
+from pathlib import Path
+from typing import Any
+
+import srsly
+from loguru import logger
+
+
+class ImportCheckpoint:
+    def __init__(self, checkpoint_file: str | Path | None):
+        """
+        The ImportCheckpoint records the state of the FUNDus! data import into the VectorDB in a small JSON file.
+        It is used to detect imports that were interrupted and to skip the sync on startup if the imported data
+        did not change since the last complete import.
+
+        Args:
+            checkpoint_file (str | Path, optional): The path to the JSON checkpoint file. If None, no checkpoint
+                is recorded and all checks report an unknown state.
+        """
+        self._checkpoint_file = Path(checkpoint_file) if checkpoint_file else None
+        self._state: dict[str, Any] = self._load()
+
+    def _load(self) -> dict[str, Any]:
+        if self._checkpoint_file is None or not self._checkpoint_file.exists():
+            return {}
+        try:
+            return srsly.read_json(self._checkpoint_file)  # type: ignore
+        except Exception as e:
+            logger.warning(f"Cannot read import checkpoint at {self._checkpoint_file}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        if self._checkpoint_file is None:
+            return
+        self._checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        srsly.write_json(self._checkpoint_file, self._state)
+
+    def is_complete(self, fingerprint: str) -> bool:
+        return self._state.get("completed", False) and self._state.get("fingerprint") == fingerprint
+
+    def is_interrupted(self) -> bool:
+        return len(self._state) > 0 and not self._state.get("completed", False)
+
+    def mark_started(self, fingerprint: str) -> None:
+        self._state = {
+            "fingerprint": fingerprint,
+            "completed": False,
+            "started_at": time.time(),
+        }
+        self._save()
+
+    def mark_complete(self, fingerprint: str, num_records: int) -> None:
+        self._state.update(
+            {
+                "fingerprint": fingerprint,
+                "completed": True,
+                "completed_at": time.time(),
+                "num_records": num_records,
+            }
+        )
+        self._save()
+
+    def clear(self) -> None:
+        self._state = {}
+        if self._checkpoint_file is not None:
+            self._checkpoint_file.unlink(missing_ok=True)
@@ -0,0 +1,80 @@
+from typing import Any
+
+from fundus_murag.data.collection_catalog import CollectionCatalog
+from fundus_murag.data.dtos.fundus import FundusRecord, FundusRecordInternal
+from fundus_murag.data.image_blob_store import ImageBlobStore
+
+
+class FundusRecordConverter:
+    def __init__(self, collection_catalog: CollectionCatalog, image_blob_store: ImageBlobStore | None = None):
+        """
+        The FundusRecordConverter creates `FundusRecord`s and `FundusRecordInternal`s from VectorDB query results.
+        The detail field labels and the parent `FundusCollection`s are looked up in the `CollectionCatalog`,
+        so no DataFrame scans or cross-references are required during the conversion.
+
+        Args:
+            collection_catalog (CollectionCatalog): The catalog with all `FundusCollection`s.
+            image_blob_store (ImageBlobStore, optional): The blob store to read the images of `FundusRecordInternal`s
+                from if they are not stored in the VectorDB. Defaults to None.
+        """
+        self._collection_catalog = collection_catalog
+        self._image_blob_store = image_blob_store
+
+    def resolve_detail_field_names(self, details: list[dict[str, str]], collection_name: str) -> dict[str, str]:
+        fields = self._collection_catalog.get_field_labels(collection_name)
+        resolved = {}
+        for detail in details:
+            field_value = detail["value"]
+            if field_value == "None" or field_value == "":
+                continue
+            field_name = detail["key"]
+            if field_name != "ident_nr":
+                field_name = fields.get(field_name, field_name)
+
+            resolved[field_name] = field_value
+
+        return resolved
+
+    def convert(self, res_obj: Any, internal: bool = False) -> FundusRecord | FundusRecordInternal:
+        """
+        Converts a single object of a VectorDB query result to a `FundusRecord` or, if `internal` is True,
+        to a `FundusRecordInternal` including the base64 image, the parent collection, and the embeddings.
+        """
+        item_props = res_obj.properties
+        collection_name = item_props["collection_name"]
+        murag_id = str(item_props["murag_id"])
+        record_fields = {
+            "murag_id": murag_id,
+            "title": item_props["title"],
+            "fundus_id": item_props["fundus_id"],
+            "catalogno": item_props["catalogno"],
+            "collection_name": collection_name,
+            "image_name": item_props["image_name"],
+            "details": self.resolve_detail_field_names(item_props["details"], collection_name),
+        }
+        if not internal:
+            return FundusRecord(**record_fields)
+
+        if "image" in item_props:
+            base64_image = item_props["image"]
+        elif self._image_blob_store is not None:
+            base64_image = self._image_blob_store.get(murag_id)
+        else:
+            raise ValueError(f"FundusRecordInternal with murag_id={murag_id} has no image!")
+
+        embeddings = {}
+        if res_obj.vector is not None:
+            if isinstance(res_obj.vector, dict):
+                embeddings = res_obj.vector
+            else:
+                embeddings["default"] = res_obj.vector
+
+        return FundusRecordInternal(
+            **record_fields,
+            collection=self._collection_catalog.get_by_name(collection_name),
+            base64_image=base64_image,
+            embeddings=embeddings,
+        )
+
+    def convert_all(self, res: Any, internal: bool = False) -> list[FundusRecord | FundusRecordInternal]:
+        return [self.convert(res_obj, internal=internal) for res_obj in res.objects]
@@ -1,7 +1,10 @@
+import hashlib
 import io
 from pathlib import Path
+from typing import Sequence
 from uuid import uuid4
 
+import numpy as np
 from loguru import logger
 from PIL import Image
 
@@ -17,6 +20,11 @@ class UserImageStore(metaclass=SingletonMeta):
         self._images_root.mkdir(parents=True, exist_ok=True)
         self._supported_image_formats = ["jpg", "jpeg", "png"]
         self._user_images: dict[str, Path] = {}
+        # the embeddings are stored per digest of the stored image, so that identical uploads share their embedding
+        # while every upload has its own unguessable ID
+        self._user_image_digests: dict[str, str] = {}
+        self._user_image_embeddings: dict[str, np.ndarray] = {}
+        self._read_user_images()
 
     def _read_user_images(self):
         for ext in self._supported_image_formats:
@@ -36,17 +44,50 @@ class UserImageStore(metaclass=SingletonMeta):
         return image
 
     def store_user_image(self, image_bytes: bytes, mime: str | None) -> str:
-        uuid = str(uuid4())
         if mime not in ["image/jpeg", "image/jpg", "image/png"]:
             raise ValueError("Invalid image format! Supported formats are: jpg, jpeg, png")
+        image_id = str(uuid4())
         ext = mime.split("/")[-1]
-        ofn = self._images_root / f"{uuid}.{ext}"
+        ofn = self._images_root / f"{image_id}.{ext}"
         try:
             image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
             image.save(ofn)
-            self._user_images[uuid] = ofn
+            self._user_images[image_id] = ofn
             logger.info(f"Stored user provided image at {ofn}")
-            return uuid
+            return image_id
         except Exception as e:
             logger.error(f"Failed to store user provided image: {e}")
             raise e
+
+    def _get_user_image_digest(self, image_id: str) -> str:
+        if image_id not in self._user_image_digests:
+            self._user_image_digests[image_id] = hashlib.sha256(self._user_images[image_id].read_bytes()).hexdigest()
+        return self._user_image_digests[image_id]
+
+    def _get_user_image_embedding_path(self, digest: str) -> Path:
+        return self._images_root / f"{digest}.npy"
+
+    def load_user_image_embedding(self, image_id: str) -> np.ndarray | None:
+        """
+        Returns the stored embedding of the user image or None if it was not computed yet.
+        """
+        if image_id not in self._user_images:
+            raise FileNotFoundError(f"Cannot find user image with ID {image_id}!")
+        digest = self._get_user_image_digest(image_id)
+        if digest in self._user_image_embeddings:
+            return self._user_image_embeddings[digest]
+
+        embedding_path = self._get_user_image_embedding_path(digest)
+        if not embedding_path.exists():
+            return None
+        embedding = np.load(embedding_path)
+        self._user_image_embeddings[digest] = embedding
+        return embedding
+
+    def store_user_image_embedding(self, image_id: str, embedding: Sequence[float] | np.ndarray) -> None:
+        if image_id not in self._user_images:
+            raise FileNotFoundError(f"Cannot find user image with ID {image_id}!")
+        digest = self._get_user_image_digest(image_id)
+        embedding = np.asarray(embedding, dtype=np.float32)
+        np.save(self._get_user_image_embedding_path(digest), embedding)
+        self._user_image_embeddings[digest] = embedding
@@ -1,12 +1,20 @@
 import base64
+import hashlib
 import io
+import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TypeVar
 
 import numpy as np
 import pandas as pd
 from loguru import logger
 from PIL import Image
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def unicode_escape_str(s: str) -> str:
     # see https://stackoverflow.com/a/52461149
@@ -135,3 +143,69 @@ def encode_image(image: Image.Image) -> str:
     buffered = io.BytesIO()
     image.save(buffered, format="JPEG")
     return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+
+def bounded_parallel_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    num_workers: int,
+    max_pending: int | None = None,
+) -> Iterator[tuple[T, Future[R]]]:
+    """
+    Applies `func` to `items` in a thread pool and yields `(item, future)` tuples in the order of `items`.
+    At most `max_pending` (defaults to `4 * num_workers`) items are in flight at the same time, so the pool
+    never runs further ahead of the consumer than that.
+    """
+    if max_pending is None:
+        max_pending = 4 * num_workers
+    max_pending = max(max_pending, 1)
+
+    with ThreadPoolExecutor(max_workers=max(num_workers, 1)) as executor:
+        pending: deque[tuple[T, Future[R]]] = deque()
+        for item in items:
+            pending.append((item, executor.submit(func, item)))
+            if len(pending) >= max_pending:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+
+def compute_file_digest(file: str | Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Computes the SHA-256 digest of the contents of a file in chunks, so that large files are not read into memory.
+    """
+    h = hashlib.sha256()
+    with open(file, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def compute_content_hash(props: dict[str, Any], vector: Any = None, image_digest: str | None = None) -> str:
+    """
+    Computes a stable hash over the properties, the (named) vectors, and the digest of the image of an object
+    to detect changes between imports.
+    """
+    h = hashlib.sha256(json.dumps(props, sort_keys=True, default=str).encode("utf-8"))
+    if image_digest is not None:
+        h.update(image_digest.encode("utf-8"))
+    named_vectors = vector.items() if isinstance(vector, dict) else [("", vector)]
+    for name, vec in sorted(named_vectors, key=lambda nv: nv[0]):
+        if vec is None:
+            continue
+        h.update(name.encode("utf-8"))
+        h.update(np.asarray(vec, dtype=np.float32).tobytes())
+    return h.hexdigest()
+
+
+def fingerprint_files(*files: str | Path, **extra: Any) -> str:
+    """
+    Computes a cheap fingerprint of the given files based on their paths, sizes, and modification times.
+    Additional keyword arguments, e.g., settings that change how the files are loaded, are included as well.
+    """
+    parts: list[Any] = []
+    for file in files:
+        stat = Path(file).stat()
+        parts.append([str(Path(file).absolute()), stat.st_size, stat.st_mtime_ns])
+    parts.append(extra)
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
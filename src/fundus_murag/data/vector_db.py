@@ -1,20 +1,25 @@
 import operator
+import random
 import time
 from functools import reduce
-from typing import Any, Literal
+from typing import Any, Iterable, Iterator, Literal
+from uuid import UUID
 
 import mlflow
 import pandas as pd
 import weaviate
 from loguru import logger
 from mlflow.entities import SpanType
+from pydantic import BaseModel
 from tqdm import tqdm
-from weaviate.classes.query import Filter, MetadataQuery, QueryNested, QueryReference
+from weaviate.classes.query import Filter, MetadataQuery, QueryNested
+from weaviate.exceptions import WeaviateQueryError
 
 from fundus_murag.agent.tools.query_rewriter import (
     QueryRewriter,
 )
 from fundus_murag.config import load_config
+from fundus_murag.data.collection_catalog import CollectionCatalog
 from fundus_murag.data.dtos.fundus import (
     FundusCollection,
     FundusRecord,
@@ -25,6 +30,9 @@ from fundus_murag.data.dtos.vector_db import (
     FundusCollectionSemanticSearchResult,
     FundusRecordSemanticSearchResult,
 )
+from fundus_murag.data.image_blob_store import ImageBlobStore
+from fundus_murag.data.import_checkpoint import ImportCheckpoint
+from fundus_murag.data.record_converter import FundusRecordConverter
 from fundus_murag.data.schema import (
     FUNDUS_COLLECTION_SCHEMA_NAME,
     FUNDUS_COLLECTION_SCHEMA_VECTORIZER,
@@ -34,6 +42,10 @@ from fundus_murag.data.schema import (
 )
 from fundus_murag.data.user_image_store import UserImageStore
 from fundus_murag.data.utils import (
+    bounded_parallel_map,
+    compute_content_hash,
+    compute_file_digest,
+    fingerprint_files,
     load_fundus_collection_embeddings_df,
     load_fundus_collections_df,
     load_fundus_record_embeddings_df,
@@ -48,9 +60,15 @@ class VectorDB(metaclass=SingletonMeta):
     def __init__(self):
         self._config = load_config()
         self._client = self._connect_to_weaviate()
-        self._fundus_ml_client = FundusMLClient(self._config.fundus.ml_url)
+        self._fundus_ml_client = FundusMLClient()
         self._query_rewriter = QueryRewriter()
         self._user_image_store = UserImageStore()
+        self._image_blob_store = (
+            ImageBlobStore(self._config.data.image_blob_store_dir)
+            if self._config.data.image_blob_store_dir is not None
+            else None
+        )
+        self._fundus_record_return_props = self._build_fundus_record_return_props()
 
         # we load the dataframes because some operations are faster and much easier to do in pandas
         self._records_df = load_fundus_records_df(
@@ -61,6 +79,9 @@ class VectorDB(metaclass=SingletonMeta):
             self._records_df,
             self._config.data.collections_df_file,
         )
+        # the collections are static for the life of the process, so we keep them in memory
+        self._collection_catalog = CollectionCatalog(self._build_fundus_collections(self._collections_df))
+        self._fundus_record_converter = FundusRecordConverter(self._collection_catalog, self._image_blob_store)
 
         self._import_fundus_data(
             self._records_df,
@@ -111,6 +132,13 @@ class VectorDB(metaclass=SingletonMeta):
             FUNDUS_RECORD_SCHEMA_NAME
         ) and self._get_client().collections.exists(FUNDUS_COLLECTION_SCHEMA_NAME)
 
+    @property
+    def uses_image_blob_store(self) -> bool:
+        """
+        Whether the images are read from the image blob store instead of being part of the query results.
+        """
+        return self._image_blob_store is not None
+
     def _create_fundus_record_schema(self) -> weaviate.collections.Collection:
         return self._get_client().collections.create(
             name=FUNDUS_RECORD_SCHEMA_NAME,
@@ -140,13 +168,73 @@ class VectorDB(metaclass=SingletonMeta):
         logger.info("Importing FUNDus! Collections...")
 
         collection = self._create_fundus_collection_schema()
+        self._batch_import_fundus_collections(
+            collection,
+            self._prepare_fundus_collection_objects(collections_df, collection_embeddings_df),
+            total=len(collections_df),
+        )
+
+    def _batch_import_fundus_collections(
+        self,
+        collection: weaviate.collections.Collection,
+        objects: Iterable[dict[str, Any]],
+        total: int | None = None,
+    ) -> int:
+        num_imported = 0
+        with collection.batch.fixed_size(batch_size=100, concurrent_requests=4) as batch:
+            for obj in tqdm(
+                objects,
+                total=total,
+                desc="Importing FUNDus! collections",
+                leave=True,
+            ):
+                batch.add_object(**obj)
+                num_imported += 1
 
-        for _, row in tqdm(
-            collections_df.iterrows(),
+        num_imported -= self._report_failed_batch_objects(collection, "FUNDus! collections")
+        logger.info(f"Imported {num_imported} FUNDus! collections.")
+        return num_imported
+
+    def _sync_fundus_collections(self, collections_df: pd.DataFrame, collection_embeddings_df: pd.DataFrame) -> None:
+        """
+        Syncs the `FundusCollection`s in the VectorDB with the collections DataFrame. Since there are only a few
+        hundred collections, all of them are upserted and the collections that are no longer in the DataFrame are deleted.
+        """
+        if not self._get_client().collections.exists(FUNDUS_COLLECTION_SCHEMA_NAME):
+            self._import_fundus_collections(collections_df, collection_embeddings_df)
+            return
+
+        logger.info("Syncing FUNDus! collections...")
+        collection = self._get_fundus_collection_collection()
+        existing_ids = {str(obj.properties["murag_id"]) for obj in collection.iterator(return_properties=["murag_id"])}
+        stale_ids = list(existing_ids - set(collections_df["murag_id"].values))
+        if len(stale_ids) > 0:
+            collection.data.delete_many(where=Filter.by_property("murag_id").contains_any(stale_ids))
+        logger.info(f"Deleted {len(stale_ids)} stale FUNDus! collections.")
+
+        self._batch_import_fundus_collections(
+            collection,
+            self._prepare_fundus_collection_objects(collections_df, collection_embeddings_df),
             total=len(collections_df),
-            desc="Importing FUNDus! collections",
-            leave=True,
-        ):
+        )
+
+    def _prepare_fundus_collection_objects(
+        self,
+        collections_df: pd.DataFrame,
+        collection_embeddings_df: pd.DataFrame | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yields the `FundusCollection` objects ready to be added to a Weaviate batch.
+        """
+        vectors = (
+            self._group_embeddings_by(collection_embeddings_df, "collection_name")
+            if collection_embeddings_df is not None
+            else {}
+        )
+        columns = list(collections_df.columns)
+
+        for values in collections_df.itertuples(index=False, name=None):
+            row = dict(zip(columns, values))
             title = row["title"] if not pd.isna(row["title"]) else row["title_de"]
 
             title_de = row["title_de"] if not pd.isna(row["title_de"]) else row["title"]
@@ -156,30 +244,34 @@ class VectorDB(metaclass=SingletonMeta):
                 "collection_name": row["collection_name"],
                 "title": title,
                 "title_de": title_de,
-                "description": (row["description"]),
-                "description_de": (row["description_de"]),
+                "description": row["description"],
+                "description_de": row["description_de"],
                 "contacts": row["contacts"],
                 "title_fields": row["title_fields"],
                 "fields": row["fields"],
             }
 
-            collection_embeddings = collection_embeddings_df[
-                collection_embeddings_df["collection_name"] == row["collection_name"]
-            ]
-            if len(collection_embeddings) == 0:
-                vector = None
-            elif len(collection_embeddings) == 1:
-                vector = collection_embeddings.iloc[0]["embedding"]
-            else:
-                vector = {emb["embedding_name"]: emb["embedding"] for _, emb in collection_embeddings.iterrows()}
-
-            collection.data.insert(
-                properties=props,
-                uuid=row["murag_id"],
-                vector=vector,
-            )
+            yield {
+                "uuid": row["murag_id"],
+                "properties": props,
+                "vector": vectors.get(row["collection_name"]),
+            }
 
-        logger.info(f"Imported {len(collections_df)} FUNDus! collections.")
+    def _build_fundus_collections(self, collections_df: pd.DataFrame) -> list[FundusCollection]:
+        """
+        Builds the `FundusCollection`s from the collections DataFrame with the same properties as in the VectorDB.
+        """
+        return [
+            FundusCollection(**obj["properties"]) for obj in self._prepare_fundus_collection_objects(collections_df)
+        ]
+
+    def _report_failed_batch_objects(self, collection: weaviate.collections.Collection, name: str) -> int:
+        failed_objects = collection.batch.failed_objects
+        if len(failed_objects) > 0:
+            logger.error(f"Failed to import {len(failed_objects)} {name}!")
+            for failed in failed_objects[:10]:
+                logger.error(f"Failed to import object with UUID {failed.object_.uuid}: {failed.message}")
+        return len(failed_objects)
 
     def _import_fundus_records(
         self,
@@ -193,113 +285,317 @@ class VectorDB(metaclass=SingletonMeta):
         logger.info("Importing FUNDus! records...")
 
         collection = self._create_fundus_record_schema()
+        self._batch_import_fundus_records(
+            collection,
+            self._prepare_fundus_record_objects(records_df, collections_df, record_embeddings_df),
+            total=len(records_df),
+        )
+
+    def _batch_import_fundus_records(
+        self,
+        collection: weaviate.collections.Collection,
+        objects: Iterable[dict[str, Any]],
+        total: int | None = None,
+    ) -> int:
+        num_imported = 0
+        start_t = time.perf_counter()
+        # the images are read and encoded in a bounded thread pool ahead of the batch
+        objs_with_images = bounded_parallel_map(
+            self._load_fundus_record_image,
+            objects,
+            num_workers=self._config.data.import_workers,
+        )
         with collection.batch.fixed_size(batch_size=100, concurrent_requests=16) as batch:
-            for ridx, row in tqdm(
-                records_df.iterrows(),
-                total=len(records_df),
-                desc="Importing FUNDus! records",
-                leave=True,
+            for ridx, (obj, image_future) in enumerate(
+                tqdm(
+                    objs_with_images,
+                    total=total,
+                    desc="Importing FUNDus! records",
+                    leave=True,
+                )
             ):
-                img_path = (self._config.data.fundus_data_root + "/" + row["image_path"]).replace("//", "/")
                 try:
-                    base64_image = read_image_bytes(img_path)
+                    base64_image = image_future.result()
                 except Exception:
-                    logger.warning(f"Could not read image at {img_path}. Skipping...")
+                    logger.warning(f"Could not read image at {obj['image_path']}. Skipping...")
                     continue
+                obj.pop("image_path")
+                if base64_image is not None:
+                    obj["properties"]["image"] = base64_image
 
-                details = []
-                for col in records_df.columns:
-                    if col.startswith("details_"):
-                        if row[col] is not None:
-                            details.append(
-                                {
-                                    "key": col.replace("details_", ""),
-                                    "value": (row[col]),
-                                }
-                            )
-
-                props = {
-                    "murag_id": row["murag_id"],
-                    "fundus_id": row["fundus_id"],
-                    "title": (row["title"]),
-                    "collection_name": row["collection_name"],
-                    "catalogno": row["catalogno"],
-                    "image": base64_image,
-                    "image_name": row["image_name"],
-                    "details": details,
-                }
+                batch.add_object(**obj)
+                num_imported += 1
 
-                record_embeddings = record_embeddings_df[record_embeddings_df["murag_id"] == row["murag_id"]]
-                if len(record_embeddings) == 0:
-                    vector = None
-                elif len(record_embeddings) == 1:
-                    vector = record_embeddings.iloc[0]["embedding"]
-                else:
-                    vector = {emb["embedding_name"]: emb["embedding"] for _, emb in record_embeddings.iterrows()}
-
-                batch.add_object(
-                    uuid=row["murag_id"],
-                    properties=props,
-                    vector=vector,
-                    references={
-                        "parent_collection": collections_df[collections_df["collection_name"] == row["collection_name"]]
-                        .iloc[0]
-                        .murag_id
-                    },
-                )
-
-                if ridx % 100 == 0:  # type: ignore
+                if ridx % 100 == 0:
                     logger.info(f"Batched {ridx} FUNDus! records for import...")
 
-        logger.info(f"Imported {len(records_df)} FUNDus! records.")
+        num_imported -= self._report_failed_batch_objects(collection, "FUNDus! records")
+        if self._image_blob_store is not None:
+            self._image_blob_store.flush()
+        elapsed_t = time.perf_counter() - start_t
+        logger.info(
+            f"Imported {num_imported} FUNDus! records in {elapsed_t:.1f}s "
+            f"({num_imported / max(elapsed_t, 1e-9):.1f} records/s)."
+        )
+        return num_imported
+
+    def _add_fundus_record_content_hash(self, obj: dict[str, Any]) -> dict[str, Any]:
+        """
+        Adds the content hash to a prepared `FundusRecord` object. The hash includes the digest of the image file,
+        so that a record whose image changed is re-imported by a sync.
+        """
+        props = obj["properties"]
+        if "content_hash" not in props:
+            props["content_hash"] = compute_content_hash(
+                {**props, "image_in_blob_store": self._image_blob_store is not None},
+                obj["vector"],
+                image_digest=compute_file_digest(obj["image_path"]),
+            )
+        return obj
+
+    def _load_fundus_record_image(self, obj: dict[str, Any]) -> str | None:
+        """
+        Reads the image of a prepared `FundusRecord` object and adds the content hash if it is missing. If an image
+        blob store is used, the image is stored in the blob store and None is returned, otherwise the base64 encoded
+        image is returned.
+        """
+        self._add_fundus_record_content_hash(obj)
+        base64_image = read_image_bytes(obj["image_path"])
+        if self._image_blob_store is None:
+            return base64_image
+        self._image_blob_store.put(obj["uuid"], base64_image)
+        return None
+
+    def _sync_fundus_records(
+        self,
+        records_df: pd.DataFrame,
+        collections_df: pd.DataFrame,
+        record_embeddings_df: pd.DataFrame,
+    ) -> None:
+        """
+        Incrementally syncs the `FundusRecord`s in the VectorDB with the records DataFrame: records that are missing
+        or whose content hash changed are (re-)imported and records that are no longer in the DataFrame are deleted.
+        """
+        if not self._get_client().collections.exists(FUNDUS_RECORD_SCHEMA_NAME):
+            self._import_fundus_records(records_df, collections_df, record_embeddings_df)
+            return
+
+        logger.info("Syncing FUNDus! records...")
+        collection = self._get_fundus_record_collection()
+
+        existing_hashes = {
+            str(obj.properties["murag_id"]): obj.properties.get("content_hash")
+            for obj in collection.iterator(return_properties=["murag_id", "content_hash"])
+        }
+        logger.info(f"Found {len(existing_hashes)} FUNDus! records in the VectorDB.")
+
+        stale_ids = list(set(existing_hashes.keys()) - set(records_df["murag_id"].values))
+        for i in range(0, len(stale_ids), 1000):
+            collection.data.delete_many(where=Filter.by_property("murag_id").contains_any(stale_ids[i : i + 1000]))
+        if self._image_blob_store is not None:
+            for murag_id in stale_ids:
+                self._image_blob_store.remove(murag_id)
+            self._image_blob_store.flush()
+        logger.info(f"Deleted {len(stale_ids)} stale FUNDus! records.")
+
+        # the content hashes include the digests of the image files, which are read in a bounded thread pool
+        objs_with_hashes = bounded_parallel_map(
+            self._add_fundus_record_content_hash,
+            self._prepare_fundus_record_objects(records_df, collections_df, record_embeddings_df),
+            num_workers=self._config.data.import_workers,
+        )
+        objects_to_import = []
+        for obj, hash_future in tqdm(objs_with_hashes, total=len(records_df), desc="Hashing FUNDus! records"):
+            try:
+                hash_future.result()
+            except Exception:
+                logger.warning(f"Could not read image at {obj['image_path']}. Skipping...")
+                continue
+            if existing_hashes.get(obj["uuid"]) != obj["properties"]["content_hash"] or (
+                self._image_blob_store is not None and obj["uuid"] not in self._image_blob_store
+            ):
+                objects_to_import.append(obj)
+        logger.info(f"Found {len(objects_to_import)} missing or changed FUNDus! records.")
+        if len(objects_to_import) > 0:
+            self._batch_import_fundus_records(collection, objects_to_import, total=len(objects_to_import))
+
+    @staticmethod
+    def _group_embeddings_by(
+        embeddings_df: pd.DataFrame,
+        key: str,
+    ) -> dict[str, Any]:
+        """
+        Groups the embeddings in `embeddings_df` by the values of the `key` column in a single pass.
+        If there is only one embedding for a key, the embedding is used as the (unnamed) vector,
+        otherwise a dict of named vectors `{embedding_name: embedding}` is created.
+        """
+        grouped: dict[str, list[tuple[str, Any]]] = {}
+        for key_value, embedding_name, embedding in zip(
+            embeddings_df[key].values,
+            embeddings_df["embedding_name"].values,
+            embeddings_df["embedding"].values,
+        ):
+            grouped.setdefault(key_value, []).append((embedding_name, embedding))
+
+        return {
+            key_value: embs[0][1] if len(embs) == 1 else {name: emb for name, emb in embs}
+            for key_value, embs in grouped.items()
+        }
+
+    def _prepare_fundus_record_objects(
+        self,
+        records_df: pd.DataFrame,
+        collections_df: pd.DataFrame,
+        record_embeddings_df: pd.DataFrame,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yields the `FundusRecord` objects ready to be added to a Weaviate batch (without the image and the content
+        hash, which are computed separately from `image_path`). Embeddings and parent collections are looked up in precomputed maps
+        so that the import is linear in the number of records.
+        """
+        vectors = self._group_embeddings_by(record_embeddings_df, "murag_id")
+        parent_collection_ids = dict(zip(collections_df["collection_name"], collections_df["murag_id"]))
+        detail_columns = [col for col in records_df.columns if col.startswith("details_")]
+        columns = list(records_df.columns)
+
+        for values in records_df.itertuples(index=False, name=None):
+            row = dict(zip(columns, values))
+            details = [
+                {
+                    "key": col.replace("details_", ""),
+                    "value": row[col],
+                }
+                for col in detail_columns
+                if row[col] is not None
+            ]
+
+            props = {
+                "murag_id": row["murag_id"],
+                "fundus_id": row["fundus_id"],
+                "title": row["title"],
+                "collection_name": row["collection_name"],
+                "catalogno": row["catalogno"],
+                "image_name": row["image_name"],
+                "details": details,
+            }
+            img_path = (self._config.data.fundus_data_root + "/" + row["image_path"]).replace("//", "/")
+
+            yield {
+                "uuid": row["murag_id"],
+                "properties": props,
+                "vector": vectors.get(row["murag_id"]),
+                "references": {"parent_collection": parent_collection_ids[row["collection_name"]]},
+                "image_path": img_path,
+            }
 
     def _import_fundus_data(
         self,
         records_df: pd.DataFrame,
         collections_df: pd.DataFrame,
     ) -> None:
+        checkpoint = ImportCheckpoint(self._config.data.import_checkpoint_file)
+        fingerprint = fingerprint_files(
+            self._config.data.records_df_file,
+            self._config.data.collections_df_file,
+            self._config.data.record_embeddings_df_file,
+            self._config.data.collections_embeddings_df_file,
+            dev_mode=self._config.app.dev_mode,
+            image_blob_store_dir=self._config.data.image_blob_store_dir,
+        )
+
         if self._config.app.reset_vdb_on_startup:
             self._delete_all_data()
-        if not self.is_initialized():
-            logger.info("Importing FUNDus! data...")
-            record_embeddings_df = load_fundus_record_embeddings_df(
-                self._records_df,
-                self._config.data.record_embeddings_df_file,
-                self._config.app.dev_mode,
-            )
-            collection_embeddings_df = load_fundus_collection_embeddings_df(
-                self._config.data.collections_embeddings_df_file,
-            )
+            checkpoint.clear()
+
+        import_mode = self._get_import_mode(checkpoint, fingerprint)
+        if import_mode is None:
+            logger.info("FUNDus! data already imported.")
+            return
+        sync = import_mode == "sync"
+
+        checkpoint.mark_started(fingerprint)
+        record_embeddings_df = load_fundus_record_embeddings_df(
+            self._records_df,
+            self._config.data.record_embeddings_df_file,
+            self._config.app.dev_mode,
+        )
+        collection_embeddings_df = load_fundus_collection_embeddings_df(
+            self._config.data.collections_embeddings_df_file,
+        )
 
+        if sync:
+            self._sync_fundus_collections(collections_df, collection_embeddings_df)
+            self._sync_fundus_records(records_df, collections_df, record_embeddings_df)
+        else:
             self._import_fundus_collections(collections_df, collection_embeddings_df)
             self._import_fundus_records(records_df, collections_df, record_embeddings_df)
-            logger.info("FUNDus! data import complete.")
-        else:
-            logger.info("FUNDus! data already imported.")
+        checkpoint.mark_complete(fingerprint, num_records=self.get_total_number_of_fundus_records())
+        logger.info("FUNDus! data import complete.")
+
+    def _get_import_mode(self, checkpoint: ImportCheckpoint, fingerprint: str) -> Literal["import", "sync"] | None:
+        """
+        Decides how the FUNDus! data is imported: `import` into an empty VectorDB, `sync` with the data already in
+        the VectorDB, or None if the data is already imported.
+        """
+        # an interrupted import is resumed before anything else because it leaves some of the Weaviate collections
+        # (partially) populated, so the VectorDB may look initialized or not, depending on the interrupted phase
+        if checkpoint.is_interrupted():
+            logger.info("Resuming interrupted FUNDus! data import...")
+            return "sync"
+
+        client = self._get_client()
+        num_existing = sum(
+            client.collections.exists(name) for name in (FUNDUS_COLLECTION_SCHEMA_NAME, FUNDUS_RECORD_SCHEMA_NAME)
+        )
+        if num_existing == 0:
+            logger.info("Importing FUNDus! data...")
+            return "import"
+        if num_existing == 1:
+            # e.g., an interrupted import without a checkpoint file
+            logger.info("Completing partial FUNDus! data import...")
+            return "sync"
+        if checkpoint.is_complete(fingerprint):
+            return None
+        if self._config.app.sync_vdb_on_startup:
+            logger.info("Syncing FUNDus! data...")
+            return "sync"
+        return None
 
     def _delete_all_data(self):
         logger.warning("Deleting all collections in Weaviate...")
         client = self._get_client()
         client.collections.delete_all()
 
-    def _resolve_detail_field_names(self, details: list[dict[str, str]], collection_name: str) -> dict[str, str]:
-        collection = self._collections_df[self._collections_df.collection_name == collection_name].iloc[0]
-        fields = {f["name"]: f["label_en"] for f in collection.fields}
-        resolved = {}
-        for detail in details:
-            if detail["value"] == "None" or detail["value"] == "":
-                continue
-            field_value = detail["value"]
-            if detail["key"] == "ident_nr" or detail["key"] not in fields:
-                field_name = detail["key"]
-            else:
-                field_name = fields[detail["key"]]
-
-            resolved[field_name] = field_value
+    def _build_fundus_record_return_props(self) -> dict[type[BaseModel], list[str | QueryNested]]:
+        """
+        Builds the projections, i.e., the properties to fetch from the VectorDB, for each `FundusRecord` DTO so that
+        no query fetches properties that are not needed. In particular, the (large) base64 image is only fetched
+        for `FundusRecordInternal`s and `FundusRecordImage`s and only if it is stored in the VectorDB.
+        """
+        record_props: list[str | QueryNested] = [f for f in FundusRecord.model_fields.keys() if f != "details"]
+        record_props.append(QueryNested(name="details", properties=["key", "value"]))
+        image_props: list[str | QueryNested] = ["murag_id", "fundus_id", "image_name"]
+
+        # the images are only stored in the VectorDB if no image blob store is used
+        if self._image_blob_store is None:
+            return {
+                FundusRecord: record_props,
+                FundusRecordInternal: record_props + ["image"],
+                FundusRecordImage: image_props + ["image"],
+            }
+        return {
+            FundusRecord: record_props,
+            FundusRecordInternal: record_props,
+            FundusRecordImage: image_props,
+        }
 
-        return resolved
+    def _get_fundus_record_return_props(
+        self,
+        dto: type[FundusRecord] | type[FundusRecordImage] = FundusRecord,
+    ) -> list[str | QueryNested]:
+        return list(self._fundus_record_return_props[dto])
 
-    def _create_fundus_collection_from_query_results(self, res: Any) -> list[FundusCollection]:
+    def create_fundus_collections_from_query_results(self, res: Any) -> list[FundusCollection]:
         collections = []
         for res_obj in res.objects:
             item_probs = res_obj.properties
@@ -318,52 +614,12 @@ class VectorDB(metaclass=SingletonMeta):
 
         return collections
 
-    def _create_fundus_record_from_query_results(self, res: Any) -> list[FundusRecord | FundusRecordInternal]:
-        records = []
-        for res_obj in res.objects:
-            item_probs = res_obj.properties
-            record_internal = None
-            collection = None
-            base64_image = None
-            embeddings = dict()
-            collection_name = item_probs["collection_name"]
-            details = self._resolve_detail_field_names(item_probs["details"], collection_name)
-            record = FundusRecord(
-                murag_id=str(item_probs["murag_id"]),
-                title=item_probs["title"],
-                fundus_id=item_probs["fundus_id"],
-                catalogno=item_probs["catalogno"],
-                collection_name=collection_name,
-                image_name=item_probs["image_name"],
-                details=details,
-            )
-
-            if "image" in item_probs:
-                base64_image = item_probs["image"]
-
-            if res.objects[0].references is not None and "parent_collection" in res.objects[0].references:
-                collection = self._create_fundus_collection_from_query_results(
-                    res.objects[0].references["parent_collection"]
-                )[0]
-
-            embeddings = {}
-            if res_obj.vector is not None:
-                if isinstance(res_obj.vector, dict):
-                    embeddings = res_obj.vector
-                else:
-                    embeddings["default"] = res_obj.vector
-
-            if collection is not None and base64_image is not None:
-                record_internal = FundusRecordInternal(
-                    **record.model_dump(),
-                    collection=collection,
-                    base64_image=base64_image,
-                    embeddings=embeddings,
-                )
-
-            records.append(record if record_internal is None else record_internal)
-
-        return records
+    def create_fundus_records_from_query_results(
+        self,
+        res: Any,
+        internal: bool = False,
+    ) -> list[FundusRecord | FundusRecordInternal]:
+        return self._fundus_record_converter.convert_all(res, internal=internal)
 
     @mlflow.trace(
         span_type=SpanType.TOOL,
@@ -413,9 +669,7 @@ class VectorDB(metaclass=SingletonMeta):
         Returns:
             list[`FundusCollection`]: A list of all collections.
         """
-        collection = self._get_fundus_collection_collection()
-        res = collection.query.fetch_objects()
-        results = self._create_fundus_collection_from_query_results(res)
+        results = self._collection_catalog.collections
         return results
 
     @mlflow.trace(
@@ -434,67 +688,11 @@ class VectorDB(metaclass=SingletonMeta):
         Returns:
             `FundusCollection`: The `FundusCollection` object with the specified `murag_id`.
         """
-        collection = self._get_fundus_collection_collection()
-        res = collection.query.fetch_objects(
-            filters=Filter.by_property("murag_id").equal(murag_id),
-            limit=1,
-        )
-        if len(res.objects) == 0:
-            raise KeyError(f"FundusCollection with 'murag_id'={murag_id} not found!")
-
-        results = self._create_fundus_collection_from_query_results(res)[0]
+        results = self._collection_catalog.get_by_murag_id(murag_id)
         return results
 
     def _resolve_collection_name(self, collection_name: str) -> str:
-        # exact matches
-        collection_name = collection_name.strip().lower()
-        if "collection" in collection_name:
-            collection_name = collection_name.replace("collection", "").strip()
-
-        if collection_name in self._collections_df.collection_name:
-            return collection_name
-        elif collection_name in self._collections_df.title.str.lower():
-            return self._collections_df[
-                self._collections_df.title.str.lower() == collection_name
-            ].collection_name.values[0]
-        elif collection_name in self._collections_df.title_de.str.lower():
-            return self._collections_df[
-                self._collections_df.title_de.str.lower() == collection_name
-            ].collection_name.values[0]
-
-        # fuzzy matches
-        collection_names = self._collections_df.collection_name.tolist()
-        collection_titles = self._collections_df.title.str.lower().tolist()
-        collection_titles_de = self._collections_df.title_de.str.lower().tolist()
-
-        # pad all lists to the same length
-        max_len = max(
-            len(collection_names),
-            len(collection_titles),
-            len(collection_titles_de),
-        )
-        collection_names += [""] * (max_len - len(collection_names))
-        collection_titles += [""] * (max_len - len(collection_titles))
-        collection_titles_de += [""] * (max_len - len(collection_titles_de))
-
-        matches = []
-        for name, title, title_de in zip(
-            collection_names,
-            collection_titles,
-            collection_titles_de,
-        ):
-            if collection_name in name or collection_name in title or collection_name in title_de:
-                matches.append((name, title, title_de))
-
-        if len(matches) == 0:
-            raise KeyError(f"Collection with name '{collection_name}' not found!")
-        elif len(matches) > 1:
-            raise KeyError(
-                f"Ambigious collection name `{collection_name}`! Multiple possible collections found: {matches}"
-            )
-
-        results = matches[0][0]
-        return results
+        return self._collection_catalog.resolve_name(collection_name)
 
     @mlflow.trace(
         span_type=SpanType.TOOL,
@@ -514,16 +712,8 @@ class VectorDB(metaclass=SingletonMeta):
         """
         collection_name = self._resolve_collection_name(collection_name)
 
-        collection = self._get_fundus_collection_collection()
-        res = collection.query.fetch_objects(
-            filters=Filter.by_property("collection_name").equal(collection_name),
-            limit=1,
-        )
-        if len(res.objects) == 0:
-            raise KeyError(f"FundusCollection with 'collection_name'={collection_name} not found!")
-
-        results = self._create_fundus_collection_from_query_results(res)
-        return results[0]
+        results = self._collection_catalog.get_by_name(collection_name)
+        return results
 
     @mlflow.trace(
         span_type=SpanType.TOOL,
@@ -539,14 +729,13 @@ class VectorDB(metaclass=SingletonMeta):
             n (int, optional): Number of collections to return. Defaults to 1
 
         Returns:
-            `FundusCollection`: A random `FundusCollection` object.
+            list[`FundusCollection`]: A list of N random `FundusCollection` objects.
         """
-        if n > len(self._collections_df):
-            logger.warning(f"Requested {n} random collections, but only {len(self._collections_df)} available.")
-            n = len(self._collections_df)
+        if n > len(self._collection_catalog):
+            logger.warning(f"Requested {n} random collections, but only {len(self._collection_catalog)} available.")
+            n = len(self._collection_catalog)
 
-        collection_names = self._collections_df.sample(int(n))["collection_name"].values[0]
-        results = [self.get_fundus_collection_by_name(collection_name=cn) for cn in collection_names]
+        results = random.sample(self._collection_catalog.collections, k=int(n))
         return results
 
     @mlflow.trace(
@@ -567,6 +756,12 @@ class VectorDB(metaclass=SingletonMeta):
         Returns:
             list[`FundusRecord`]: A list of N `FundusRecord` objects.
         """
+        murag_ids = self.sample_random_murag_ids(n=n, collection_name=collection_name)
+
+        results = self.get_fundus_records_by_murag_ids(murag_ids=murag_ids)
+        return results
+
+    def sample_random_murag_ids(self, n: int = 1, collection_name: str | None = None) -> list[str]:
         if collection_name is not None:
             cn = self._resolve_collection_name(collection_name)
             records_in_collection = self._records_df[self._records_df["collection_name"] == cn]
@@ -579,11 +774,45 @@ class VectorDB(metaclass=SingletonMeta):
             logger.warning(f"Requested {n} random records, but only {len(records_in_collection)} available.")
             n = len(records_in_collection)
 
-        murag_ids = list(records_in_collection.sample(n=int(n))["murag_id"].values)
+        return list(records_in_collection.sample(n=int(n))["murag_id"].values)
 
-        results = [self.get_fundus_record_by_murag_id(murag_id=murag_id) for murag_id in murag_ids]
+    @mlflow.trace(
+        span_type=SpanType.TOOL,
+    )
+    def get_fundus_records_by_murag_ids(
+        self,
+        murag_ids: list[str],
+    ) -> list[FundusRecord | FundusRecordInternal]:
+        """
+        Get multiple `FundusRecord`s by their unique identifiers in a single query.
+
+        Args:
+            murag_ids (list[str]): The unique identifiers of the records in the VectorDB.
+
+        Returns:
+            list[`FundusRecord`]: The `FundusRecord` objects with the specified `murag_id`s in the requested order.
+        """
+        if len(murag_ids) == 0:
+            return []
+
+        collection = self._get_fundus_record_collection()
+        res = collection.query.fetch_objects(**self.build_murag_id_query(murag_ids))
+
+        results = self.create_fundus_records_in_murag_id_order(res, murag_ids)
         return results
 
+    def create_fundus_records_in_murag_id_order(
+        self,
+        res: Any,
+        murag_ids: list[str],
+    ) -> list[FundusRecord | FundusRecordInternal]:
+        records = {record.murag_id: record for record in self.create_fundus_records_from_query_results(res)}
+        missing = [murag_id for murag_id in murag_ids if murag_id not in records]
+        if len(missing) > 0:
+            raise KeyError(f"FundusRecords with murag_ids={missing} not found!")
+
+        return [records[murag_id] for murag_id in murag_ids]
+
     @mlflow.trace(
         span_type=SpanType.TOOL,
     )
@@ -602,14 +831,11 @@ class VectorDB(metaclass=SingletonMeta):
         """
 
         collection = self._get_fundus_record_collection()
-        res = collection.query.fetch_objects(
-            filters=Filter.by_property("murag_id").equal(murag_id),
-            return_references=[],  # return no references
-        )
+        res = collection.query.fetch_objects(**self.build_murag_id_query(murag_id))
         if len(res.objects) == 0:
             raise KeyError(f"FundusRecord with murag_id={murag_id} not found!")
 
-        results = self._create_fundus_record_from_query_results(res)
+        results = self.create_fundus_records_from_query_results(res)
         return results[0]
 
     def get_fundus_record_image_by_murag_id(
@@ -626,21 +852,25 @@ class VectorDB(metaclass=SingletonMeta):
             `FundusRecordImage`: The `FundusRecordImage` object with the specified `murag_id`.
         """
         collection = self._get_fundus_record_collection()
-        res = collection.query.fetch_objects(
-            filters=Filter.by_property("murag_id").equal(murag_id),
-            return_references=[],  # return no references
-        )
+        res = collection.query.fetch_objects(**self.build_murag_id_query(murag_id, dto=FundusRecordImage))
+        result = self.create_fundus_record_image_from_query_results(res, murag_id)
+        return result
+
+    def create_fundus_record_image_from_query_results(self, res: Any, murag_id: str) -> FundusRecordImage:
         if len(res.objects) == 0:
             raise KeyError(f"FundusRecord with murag_id={murag_id} not found!")
 
         item_probs = res.objects[0].properties
-        result = FundusRecordImage(
+        if self._image_blob_store is not None:
+            base64_image = self._image_blob_store.get(murag_id)
+        else:
+            base64_image = item_probs["image"]
+        return FundusRecordImage(
             murag_id=murag_id,
             fundus_id=item_probs["fundus_id"],  # type: ignore
             image_name=item_probs["image_name"],  # type: ignore
-            base64_image=item_probs["image"],  # type: ignore
+            base64_image=base64_image,  # type: ignore
         )
-        return result
 
     @mlflow.trace(
         span_type=SpanType.TOOL,
@@ -660,13 +890,11 @@ class VectorDB(metaclass=SingletonMeta):
         """
 
         collection = self._get_fundus_record_collection()
-        res = collection.query.fetch_objects(
-            filters=Filter.by_property("fundus_id").equal(fundus_id),
-        )
+        res = collection.query.fetch_objects(**self.build_fundus_id_query(fundus_id))
         if len(res.objects) == 0:
             raise KeyError(f"FundusRecord with fundus_id={fundus_id} not found!")
 
-        results = self._create_fundus_record_from_query_results(res)
+        results = self.create_fundus_records_from_query_results(res)
         return results
 
     @mlflow.trace(
@@ -689,12 +917,10 @@ class VectorDB(metaclass=SingletonMeta):
         Returns:
             list[FundusRecordSemanticSearchResult]: `FundusRecord`s search results with similarity scores.
         """
-        record = self.get_fundus_record_internal_by_murag_id(murag_id)
-        image_embedding = self._fundus_ml_client.compute_image_embedding(
-            record.base64_image, return_tensor="np"
-        ).tolist()  # type: ignore
-        results = self._fundus_record_image_similarity_search(
-            image_embedding,
+        # the image embedding of the record is already stored in the VectorDB, so we search with it directly
+        results = self._fundus_record_similar_record_search(
+            murag_id,
+            target_vector="record_image",
             search_in_collections=search_in_collections,
             top_k=top_k,
         )
@@ -753,11 +979,7 @@ class VectorDB(metaclass=SingletonMeta):
         Returns:
             list[FundusRecordSemanticSearchResult]: `FundusRecord`s search results with similarity scores.
         """
-        base64_user_image: str = self._user_image_store.load_user_image(user_image_id, base64=True)  # type: ignore
-        base64_user_image = base64_user_image.split(",")[-1]
-        image_embedding = self._fundus_ml_client.compute_image_embedding(
-            base64_image=base64_user_image, return_tensor="np"
-        ).tolist()  # type: ignore
+        image_embedding = self._get_user_image_embedding(user_image_id)
         results = self._fundus_record_image_similarity_search(
             image_embedding,
             search_in_collections=search_in_collections,
@@ -765,6 +987,18 @@ class VectorDB(metaclass=SingletonMeta):
         )
         return results
 
+    def _get_user_image_embedding(self, user_image_id: str) -> list[float]:
+        # the embedding is computed on first use and stored alongside the user image
+        image_embedding = self._user_image_store.load_user_image_embedding(user_image_id)
+        if image_embedding is None:
+            base64_user_image: str = self._user_image_store.load_user_image(user_image_id, base64=True)  # type: ignore
+            base64_user_image = base64_user_image.split(",")[-1]
+            image_embedding = self._fundus_ml_client.compute_image_embedding(
+                base64_image=base64_user_image, return_tensor="np"
+            )  # type: ignore
+            self._user_image_store.store_user_image_embedding(user_image_id, image_embedding)  # type: ignore
+        return image_embedding.tolist()  # type: ignore
+
     @mlflow.trace(
         span_type=SpanType.TOOL,
     )
@@ -878,53 +1112,224 @@ class VectorDB(metaclass=SingletonMeta):
         Returns:
             list[FundusRecordSemanticSearchResult]: `FundusRecord`s search results with similarity scores.
         """
-        filters = None
-        if search_in_collections is not None and len(search_in_collections) > 0:
-            filters = reduce(
-                operator.or_,
-                [
-                    Filter.by_property("collection_name").equal(self._resolve_collection_name(collection_name))
-                    for collection_name in search_in_collections
-                ],
-            )
+        query = self.build_fundus_record_similarity_search_query(
+            target_vector=target_vector,
+            search_in_collections=search_in_collections,
+            top_k=top_k,
+            return_internal_records=return_internal_records,
+        )
+        collection = self._get_fundus_record_collection()
 
-        collection = self._get_client().collections.get("FundusRecord")
+        results = collection.query.near_vector(query_embedding, **query)
 
-        # Set up query parameters based on whether we need internal record data
-        return_props = list(filter(lambda c: c != "details", FundusRecord.model_fields.keys())) + [
-            QueryNested(name="details", properties=["key", "value"])
-        ]
-        return_references = None
-        include_vector = False
+        simsearch_results = self.create_fundus_record_semantic_search_results(results, internal=return_internal_records)
+        return simsearch_results
 
-        if return_internal_records:
-            # Include image and parent collection reference for FundusRecordInternal
-            return_props.append("image")
-            return_references = QueryReference(link_on="parent_collection")
-            include_vector = ["record_image", "record_title"]
+    def _fundus_record_similar_record_search(
+        self,
+        murag_id: str,
+        target_vector: Literal["record_image", "record_title"],
+        search_in_collections: list[str] | None = None,
+        top_k: int = 10,
+        return_internal_records: bool = False,
+    ) -> list[FundusRecordSemanticSearchResult]:
+        """
+        Perform a similarity search of records via the stored image or title embedding of another record.
 
-        results = collection.query.near_vector(
-            query_embedding,
+        Args:
+            murag_id (str): The unique identifier of the query record in the VectorDB.
+            target_vector (Literal["record_image", "record_title"]): The target vector for the similarity search.
+            search_in_collections (list[str], optional): Names of `FundusCollection`s to restrict the search. Defaults to None.
+            top_k (int, optional): Number of top results to return. Defaults to 10
+            return_internal_record (bool, optional): Whether to return FundusRecordInternal objects with additional data. Defaults to False.
+
+        Returns:
+            list[FundusRecordSemanticSearchResult]: `FundusRecord`s search results with similarity scores.
+        """
+        self._validate_murag_ids([murag_id])
+        query = self.build_fundus_record_similarity_search_query(
             target_vector=target_vector,
-            filters=filters,
-            limit=int(top_k),
-            return_metadata=MetadataQuery(certainty=True, distance=True),
-            return_properties=return_props,
-            return_references=return_references,
-            include_vector=include_vector,
+            search_in_collections=search_in_collections,
+            top_k=top_k,
+            return_internal_records=return_internal_records,
+        )
+        collection = self._get_fundus_record_collection()
+
+        try:
+            # the murag_id is the UUID of the record in the VectorDB
+            results = collection.query.near_object(murag_id, **query)
+        except WeaviateQueryError as e:
+            if not collection.data.exists(murag_id):
+                raise KeyError(f"FundusRecord with murag_id={murag_id} not found!") from e
+            raise e
+
+        simsearch_results = self.create_fundus_record_semantic_search_results(results, internal=return_internal_records)
+        return simsearch_results
+
+    # The keyword arguments of the queries and the conversion of their results are shared with the `AsyncVectorDB`.
+
+    def build_murag_id_query(
+        self,
+        murag_ids: str | list[str],
+        dto: type[FundusRecord] | type[FundusRecordImage] = FundusRecord,
+    ) -> dict[str, Any]:
+        """
+        Builds the keyword arguments of a `fetch_objects` query for the `FundusRecord`(s) with the given `murag_id`(s).
+        """
+        return {
+            "filters": self._build_murag_id_filter(murag_ids),
+            "limit": 1 if isinstance(murag_ids, str) else len(murag_ids),
+            "return_references": [],  # return no references
+            "return_properties": self._get_fundus_record_return_props(dto),
+        }
+
+    def build_fundus_id_query(self, fundus_id: int) -> dict[str, Any]:
+        """
+        Builds the keyword arguments of a `fetch_objects` query for the `FundusRecord`s with the given `fundus_id`.
+        """
+        return {
+            "filters": Filter.by_property("fundus_id").equal(fundus_id),
+            "return_properties": self._get_fundus_record_return_props(FundusRecord),
+        }
+
+    def build_fundus_record_similarity_search_query(
+        self,
+        target_vector: Literal["record_image", "record_title"],
+        search_in_collections: list[str] | None = None,
+        top_k: int = 10,
+        return_internal_records: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Builds the keyword arguments of a `near_vector` or `near_object` query for `FundusRecord`s.
+        """
+        return_props, include_vector = self._get_fundus_record_similarity_search_projection(return_internal_records)
+        return {
+            "target_vector": target_vector,
+            "filters": self._build_collection_name_filters(search_in_collections),
+            "limit": int(top_k),
+            "return_metadata": MetadataQuery(certainty=True, distance=True),
+            "return_properties": return_props,
+            "include_vector": include_vector,
+        }
+
+    def build_fundus_record_lexical_search_query(
+        self,
+        search_in_collections: list[str] | None = None,
+        search_in_title: bool = True,
+        top_k: int = 10,
+    ) -> dict[str, Any]:
+        """
+        Builds the keyword arguments of a `bm25` query for `FundusRecord`s.
+        """
+        if not search_in_title:
+            raise NotImplementedError("Currently only title search is supported. Please set `search_in_title=True`.")
+
+        return {
+            "query_properties": ["title"],
+            "filters": self._build_collection_name_filters(search_in_collections),
+            "limit": int(top_k),
+            "return_properties": self._get_fundus_record_return_props(FundusRecord),
+        }
+
+    def build_fundus_collection_lexical_search_query(
+        self,
+        top_k: int = 10,
+        search_in_collection_name: bool = True,
+        search_in_title: bool = True,
+        search_in_description: bool = True,
+        search_in_german_title: bool = True,
+        search_in_german_description: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Builds the keyword arguments of a `bm25` query for `FundusCollection`s.
+        """
+        return {
+            "query_properties": self._get_fundus_collection_lexical_search_properties(
+                search_in_collection_name=search_in_collection_name,
+                search_in_title=search_in_title,
+                search_in_description=search_in_description,
+                search_in_german_title=search_in_german_title,
+                search_in_german_description=search_in_german_description,
+            ),
+            "limit": int(top_k),
+        }
+
+    @staticmethod
+    def build_fundus_collection_similarity_search_query(
+        target_vector: Literal["collection_title", "collection_description"],
+        top_k: int = 10,
+    ) -> dict[str, Any]:
+        """
+        Builds the keyword arguments of a `near_vector` query for `FundusCollection`s.
+        """
+        return {
+            "target_vector": target_vector,
+            "limit": int(top_k),
+            "return_metadata": MetadataQuery(certainty=True, distance=True),
+        }
+
+    @staticmethod
+    def _build_murag_id_filter(murag_ids: str | list[str]) -> Any:
+        """
+        Builds a filter that matches the `FundusRecord`s with the given `murag_id`(s). Raises a ValueError if any
+        `murag_id` is not a UUID, because Weaviate fails the whole query in that case.
+        """
+        VectorDB._validate_murag_ids([murag_ids] if isinstance(murag_ids, str) else murag_ids)
+        if isinstance(murag_ids, str):
+            return Filter.by_property("murag_id").equal(murag_ids)
+        return Filter.by_property("murag_id").contains_any(murag_ids)
+
+    @staticmethod
+    def _validate_murag_ids(murag_ids: Iterable[str]) -> None:
+        invalid = []
+        for murag_id in murag_ids:
+            try:
+                UUID(murag_id)
+            except (ValueError, TypeError, AttributeError):
+                invalid.append(murag_id)
+        if len(invalid) > 0:
+            raise ValueError(f"Invalid murag_ids={invalid}! A murag_id is a UUID.")
+
+    def _build_collection_name_filters(self, search_in_collections: list[str] | None) -> Any | None:
+        """
+        Builds a filter that matches `FundusRecord`s in any of the given (possibly fuzzy) collection names.
+        Returns None if no collections are given.
+        """
+        if search_in_collections is None or len(search_in_collections) == 0:
+            return None
+        return reduce(
+            operator.or_,
+            [
+                Filter.by_property("collection_name").equal(self._resolve_collection_name(collection_name))
+                for collection_name in search_in_collections
+            ],
         )
 
-        records = self._create_fundus_record_from_query_results(results)
+    def _get_fundus_record_similarity_search_projection(
+        self,
+        return_internal_records: bool,
+    ) -> tuple[list[str | QueryNested], bool | list[str]]:
+        if return_internal_records:
+            # Include image and vectors for FundusRecordInternal. The parent collection is taken from the catalog.
+            return self._get_fundus_record_return_props(FundusRecordInternal), ["record_image", "record_title"]
+        return self._get_fundus_record_return_props(FundusRecord), False
+
+    def create_fundus_record_semantic_search_results(
+        self,
+        res: Any,
+        internal: bool = False,
+    ) -> list[FundusRecordSemanticSearchResult]:
+        records = self.create_fundus_records_from_query_results(res, internal=internal)
 
         simsearch_results = []
-        for record, res_obj in zip(records, results.objects):
-            res = FundusRecordSemanticSearchResult(
+        for record, res_obj in zip(records, res.objects):
+            result = FundusRecordSemanticSearchResult(
                 record=record,
                 distance=res_obj.metadata.distance,  # type: ignore
                 certainty=res_obj.metadata.certainty,  # type: ignore
             )
 
-            simsearch_results.append(res)
+            simsearch_results.append(result)
 
         return simsearch_results
 
@@ -942,24 +1347,17 @@ class VectorDB(metaclass=SingletonMeta):
         Returns:
             `FundusRecordInternal`: The `FundusRecordInternal` object with the specified `murag_id`.
         """
-        return_props = (
-            list(filter(lambda c: c != "details", FundusRecord.model_fields.keys()))
-            + [QueryNested(name="details", properties=["key", "value"])]
-            + ["image"]
-        )
+        return_props = self._get_fundus_record_return_props(FundusRecordInternal)
         collection = self._get_fundus_record_collection()
         res = collection.query.fetch_objects(
-            filters=Filter.by_property("murag_id").equal(murag_id),
-            return_references=QueryReference(
-                link_on="parent_collection",
-            ),
+            filters=self._build_murag_id_filter(murag_id),
             return_properties=return_props,
             include_vector=["record_image", "record_title"] if include_vector else False,
         )
         if len(res.objects) == 0:
             raise KeyError(f"FundusRecord with murag_id={murag_id} not found!")
 
-        rec = self._create_fundus_record_from_query_results(res)
+        rec = self.create_fundus_records_from_query_results(res, internal=True)
         if not isinstance(rec[0], FundusRecordInternal):
             raise ValueError(f"FundusRecordInternal not found for the given {murag_id=}!")
 
@@ -1015,29 +1413,16 @@ class VectorDB(metaclass=SingletonMeta):
         Returns:
             list[FundusRecord]: `FundusRecord`s matching the search query.
         """
-        if not search_in_title:
-            raise NotImplementedError("Currently only title search is supported. Please set `search_in_title=True`.")
-
-        filters = None
-        if search_in_collections is not None and len(search_in_collections) > 0:
-            filters = reduce(
-                operator.or_,
-                [
-                    Filter.by_property("collection_name").equal(self._resolve_collection_name(collection_name))
-                    for collection_name in search_in_collections
-                ],
-            )
-
-        collection = self._get_client().collections.get("FundusRecord")
-
-        results = collection.query.bm25(
-            query,
-            query_properties=["title"],
-            filters=filters,
-            limit=int(top_k),
+        bm25_query = self.build_fundus_record_lexical_search_query(
+            search_in_collections=search_in_collections,
+            search_in_title=search_in_title,
+            top_k=top_k,
         )
+        collection = self._get_fundus_record_collection()
+
+        results = collection.query.bm25(query, **bm25_query)
 
-        results = self._create_fundus_record_from_query_results(results)
+        results = self.create_fundus_records_from_query_results(results)
         return results
 
     @mlflow.trace(
@@ -1099,7 +1484,29 @@ class VectorDB(metaclass=SingletonMeta):
             list[FundusCollection]: `FundusCollection`s matching the search query.
         """
 
-        collection = self._get_client().collections.get("FundusCollection")
+        bm25_query = self.build_fundus_collection_lexical_search_query(
+            top_k=top_k,
+            search_in_collection_name=search_in_collection_name,
+            search_in_title=search_in_title,
+            search_in_description=search_in_description,
+            search_in_german_title=search_in_german_title,
+            search_in_german_description=search_in_german_description,
+        )
+        collection = self._get_fundus_collection_collection()
+
+        res = collection.query.bm25(query, **bm25_query)
+
+        results = self.create_fundus_collections_from_query_results(res)
+        return results
+
+    @staticmethod
+    def _get_fundus_collection_lexical_search_properties(
+        search_in_collection_name: bool = True,
+        search_in_title: bool = True,
+        search_in_description: bool = True,
+        search_in_german_title: bool = True,
+        search_in_german_description: bool = True,
+    ) -> list[str]:
         query_properties = []
         if search_in_collection_name:
             query_properties.extend(["collection_name"])
@@ -1115,14 +1522,7 @@ class VectorDB(metaclass=SingletonMeta):
         if len(query_properties) == 0:
             raise ValueError("At least one property must be selected for search!")
 
-        res = collection.query.bm25(
-            query,
-            query_properties=query_properties,
-            limit=top_k,
-        )
-
-        results = self._create_fundus_collection_from_query_results(res)
-        return results
+        return query_properties
 
     @mlflow.trace(
         span_type=SpanType.TOOL,
@@ -1184,30 +1584,31 @@ class VectorDB(metaclass=SingletonMeta):
         Perform a similarity search of `FundusCollection`s based on their title embedding.
         Returns structured results with certainty and distance scores.
         """
-        collection = self._get_client().collections.get("FundusCollection")
+        collection = self._get_fundus_collection_collection()
 
         results = collection.query.near_vector(
             query_embedding,
-            target_vector=target_vector,
-            limit=int(top_k),
-            return_metadata=MetadataQuery(certainty=True, distance=True),
+            **self.build_fundus_collection_similarity_search_query(target_vector=target_vector, top_k=top_k),
         )
 
-        collections = self._create_fundus_collection_from_query_results(results)
+        simsearch_results = self.create_fundus_collection_semantic_search_results(results)
+        return simsearch_results
+
+    def create_fundus_collection_semantic_search_results(self, res: Any) -> list[FundusCollectionSemanticSearchResult]:
+        collections = self.create_fundus_collections_from_query_results(res)
 
         # Convert results to FundusCollectionSemanticSearchResult with certainty & distance
         simsearch_results = []
-        for collection, res_obj in zip(collections, results.objects):
-            res = FundusCollectionSemanticSearchResult(
-                **collection.model_dump(),
+        for collection, res_obj in zip(collections, res.objects):
+            result = FundusCollectionSemanticSearchResult(
+                collection=collection,
                 distance=res_obj.metadata.distance,  # type: ignore
                 certainty=res_obj.metadata.certainty,  # type: ignore
             )
 
-            simsearch_results.append(res)
+            simsearch_results.append(result)
 
-        results = simsearch_results
-        return results
+        return simsearch_results
 
     @mlflow.trace(
         span_type=SpanType.TOOL,
@@ -1,29 +1,125 @@
+import asyncio
 import time
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
+import httpx
 import numpy as np
-import requests
 
 if TYPE_CHECKING:
     import torch
 
 from loguru import logger
+from pydantic import ValidationError
 
-from fundus_murag.config import load_config
-from fundus_murag.ml.dto import EmbeddingsInput, EmbeddingsOutput
+from fundus_murag.config import FundusConfig, load_config
+from fundus_murag.ml.dto import (
+    EMBEDDINGS_BINARY_DTYPES,
+    EMBEDDINGS_BINARY_MEDIA_TYPE,
+    EmbeddingsInput,
+    EmbeddingsOutput,
+)
+from fundus_murag.ml.embedding_cache import EmbeddingCache
+from fundus_murag.ml.request_coalescer import EmbeddingRequestCoalescer
 from fundus_murag.singleton_meta import SingletonMeta
 
+# responses with these status codes are transient, e.g., if the ML server is (re)starting or overloaded
+RETRY_STATUS_CODES: set[int] = {429, 502, 503, 504}
+
 
 class FundusMLClient(metaclass=SingletonMeta):
     def __init__(self, fundus_ml_url: str | None = None):
-        if fundus_ml_url is not None:
-            self._fundus_ml_url = fundus_ml_url
-        else:
-            config = load_config()
-            self._fundus_ml_url = config.fundus.ml_url
+        """
+        The FundusMLClient requests embeddings from the FUNDus! ML server. It keeps a pool of keep-alive connections
+        for the sync and the async methods, so the connections are reused across requests. Failed requests are
+        retried with exponential backoff. Concurrent synchronous single-item embedding requests are coalesced into
+        batches if `ml_batch_wait_ms` is greater than 0, and text embeddings are cached unless `ml_text_embedding_cache_size`
+        is 0.
+
+        Args:
+            fundus_ml_url (str, optional): The URL of the ML server. If None, the URL from the config is used.
+                All other settings are always read from the config, or the defaults are used if no config file
+                exists, e.g., when running the scripts. Defaults to None.
+        """
+        fundus_config = self._load_fundus_config(fundus_ml_url)
+        self._fundus_ml_url = fundus_config.ml_url
+        self._max_retries = fundus_config.ml_max_retries
+        self._retry_backoff = fundus_config.ml_retry_backoff
+        self._response_format = fundus_config.ml_response_format
+        self._timeout = httpx.Timeout(fundus_config.ml_timeout, connect=fundus_config.ml_connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=fundus_config.ml_max_connections,
+            max_keepalive_connections=fundus_config.ml_max_connections,
+        )
+
+        self._client = httpx.Client(base_url=self._fundus_ml_url, timeout=self._timeout, limits=self._limits)
+        # the async client is bound to the event loop it is used in, so it is created on first use
+        self._async_client: httpx.AsyncClient | None = None
+
+        self._coalescer = (
+            EmbeddingRequestCoalescer(
+                embed_fn=lambda input: self._get_embeddings(input, return_tensor=None, squeeze=False),  # type: ignore
+                max_batch_size=fundus_config.ml_batch_max_size,
+                max_wait_ms=fundus_config.ml_batch_wait_ms,
+                max_concurrent_batches=fundus_config.ml_max_concurrent_batches,
+            )
+            if fundus_config.ml_batch_wait_ms > 0
+            else None
+        )
+        self._text_embedding_cache = (
+            EmbeddingCache(
+                max_size=fundus_config.ml_text_embedding_cache_size,
+                cache_file=fundus_config.ml_text_embedding_cache_file,
+            )
+            if fundus_config.ml_text_embedding_cache_size > 0
+            else None
+        )
+        # the embedding model is only known from the responses of the ML server, so the cache is not used before
+        # the first response, which also discards a persisted cache of another model
+        self._embedding_model: str | None = None
 
         self._wait_for_ready()
 
+    @staticmethod
+    def _load_fundus_config(fundus_ml_url: str | None) -> FundusConfig:
+        if fundus_ml_url is None:
+            return load_config().fundus
+        try:
+            return load_config().fundus.model_copy(update={"ml_url": fundus_ml_url})
+        except ValidationError:
+            raise
+        except ValueError as e:
+            # the config file does not exist
+            logger.warning(f"Using the default FUNDus! ML client settings: {e}")
+            return FundusConfig(ml_url=fundus_ml_url)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception as e:
+            logger.error(f"Error while closing FundusMLClient: {e}")
+
+    def close(self) -> None:
+        if self._coalescer is not None:
+            self._coalescer.close()
+        if self._text_embedding_cache is not None:
+            self._text_embedding_cache.flush()
+            logger.info(f"Text embedding cache stats: {self._text_embedding_cache.stats()}")
+        self._client.close()
+
+    async def close_async(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(
+                base_url=self._fundus_ml_url,
+                timeout=self._timeout,
+                limits=self._limits,
+            )
+        return self._async_client
+
     def _wait_for_ready(self, s: int = 60, sleep_t: int = 3) -> None:
         while s > 0:
             if self._is_ready():
@@ -37,10 +133,53 @@ class FundusMLClient(metaclass=SingletonMeta):
 
     def _is_ready(self) -> bool:
         try:
-            return requests.get(f"{self._fundus_ml_url}/health").status_code == 200
+            return self._client.get("/health").status_code == 200
         except Exception:
             return False
 
+    def _get_retry_delay(self, attempt: int) -> float:
+        return self._retry_backoff * 2**attempt
+
+    def _post_with_retries(
+        self, path: str, json: dict[str, Any], headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        for attempt in range(self._max_retries + 1):
+            try:
+                response = self._client.post(path, json=json, headers=headers)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self._max_retries:
+                    return response
+                logger.warning(f"Fundus ML responded with {response.status_code}. Retrying...")
+            except httpx.TransportError as e:
+                if attempt == self._max_retries:
+                    raise
+                logger.warning(f"Request to Fundus ML failed: {e!r}. Retrying...")
+            time.sleep(self._get_retry_delay(attempt))
+
+        # This can never happen but the linter is not smart enough ...
+        raise RuntimeError("Request to Fundus ML failed!")
+
+    async def _post_with_retries_async(
+        self,
+        path: str,
+        json: dict[str, Any],
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        client = self._get_async_client()
+        for attempt in range(self._max_retries + 1):
+            try:
+                response = await client.post(path, json=json, headers=headers)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self._max_retries:
+                    return response
+                logger.warning(f"Fundus ML responded with {response.status_code}. Retrying...")
+            except httpx.TransportError as e:
+                if attempt == self._max_retries:
+                    raise
+                logger.warning(f"Request to Fundus ML failed: {e!r}. Retrying...")
+            await asyncio.sleep(self._get_retry_delay(attempt))
+
+        # This can never happen but the linter is not smart enough ...
+        raise RuntimeError("Request to Fundus ML failed!")
+
     def compute_image_embedding(
         self,
         base64_image: str,
@@ -56,8 +195,8 @@ class FundusMLClient(metaclass=SingletonMeta):
         Returns:
             `EmbeddingsOutput` | np.ndarray | torch.Tensor: The embeddings of the image
         """
-        input = EmbeddingsInput(input_data=base64_image, input_type="image")
-        return self._get_embeddings(input, return_tensor, squeeze=True)
+        emb = self._get_single_embedding(base64_image, "image")
+        return self._convert_embeddings(emb, return_tensor, squeeze=True)
 
     def compute_text_embedding(
         self,
@@ -74,8 +213,73 @@ class FundusMLClient(metaclass=SingletonMeta):
         Returns:
             `EmbeddingsOutput` | np.ndarray | torch.Tensor: The embeddings of the text
         """
-        input = EmbeddingsInput(input_data=text, input_type="text")
-        return self._get_embeddings(input, return_tensor, squeeze=True)
+        emb = self._get_cached_text_embedding(text)
+        if emb is None:
+            emb = self._get_single_embedding(text, "text")
+            self._cache_text_embedding(text, emb)
+        return self._convert_embeddings(emb, return_tensor, squeeze=True)
+
+    async def compute_image_embedding_async(
+        self,
+        base64_image: str,
+        return_tensor: Literal["pt", "np"] | None = "np",
+    ) -> "EmbeddingsOutput | np.ndarray | torch.Tensor":
+        """
+        Get the embedding of an image without blocking the event loop. See `compute_image_embedding`.
+        """
+        emb = await self._get_single_embedding_async(base64_image, "image")
+        return self._convert_embeddings(emb, return_tensor, squeeze=True)
+
+    async def compute_text_embedding_async(
+        self,
+        text: str,
+        return_tensor: Literal["pt", "np"] | None = "np",
+    ) -> "EmbeddingsOutput | np.ndarray | torch.Tensor":
+        """
+        Get the embedding of a text without blocking the event loop. See `compute_text_embedding`.
+        """
+        emb = self._get_cached_text_embedding(text)
+        if emb is None:
+            emb = await self._get_single_embedding_async(text, "text")
+            self._cache_text_embedding(text, emb)
+        return self._convert_embeddings(emb, return_tensor, squeeze=True)
+
+    def _get_single_embedding(self, input_data: str, input_type: Literal["text", "image"]) -> EmbeddingsOutput:
+        if self._coalescer is not None:
+            return self._coalescer.submit(input_data, input_type).result()
+        input = EmbeddingsInput(input_data=input_data, input_type=input_type)
+        return self._get_embeddings(input, return_tensor=None, squeeze=False)  # type: ignore
+
+    async def _get_single_embedding_async(
+        self,
+        input_data: str,
+        input_type: Literal["text", "image"],
+    ) -> EmbeddingsOutput:
+        # the coalescer sends the batches with the sync client from its threads, so async requests bypass it and
+        # are sent with the async client. Concurrent requests are still batched by the ML server.
+        input = EmbeddingsInput(input_data=input_data, input_type=input_type)
+        return await self._get_embeddings_async(input, return_tensor=None, squeeze=False)  # type: ignore
+
+    def _get_cached_text_embedding(self, text: str) -> EmbeddingsOutput | None:
+        if self._text_embedding_cache is None or self._embedding_model is None:
+            return None
+        embedding = self._text_embedding_cache.get(self._embedding_model, "text", text)
+        if embedding is None:
+            return None
+        return EmbeddingsOutput(embeddings=[embedding.tolist()], embedding_model=self._embedding_model)
+
+    def _cache_text_embedding(self, text: str, emb: EmbeddingsOutput) -> None:
+        self._embedding_model = emb.embedding_model
+        if self._text_embedding_cache is not None:
+            self._text_embedding_cache.put(emb.embedding_model, "text", text, emb.embeddings[0])  # type: ignore
+
+    def get_text_embedding_cache_stats(self) -> dict[str, int]:
+        """
+        Returns the size and the number of hits and misses of the text embedding cache.
+        """
+        if self._text_embedding_cache is None:
+            return {"size": 0, "hits": 0, "misses": 0}
+        return self._text_embedding_cache.stats()
 
     def _get_embeddings(
         self,
@@ -83,23 +287,89 @@ class FundusMLClient(metaclass=SingletonMeta):
         return_tensor: Literal["pt", "np"] | None = "np",
         squeeze: bool = True,
     ) -> "EmbeddingsOutput | np.ndarray | torch.Tensor":
-        response = requests.post(f"{self._fundus_ml_url}/embed", json=input.model_dump())
+        response = self._post_with_retries("/embed", *self._prepare_embeddings_request(input))
         response.raise_for_status()
-        response_json = response.json()
-        emb = EmbeddingsOutput.model_validate(response_json)
+        return self._decode_embeddings_response(response, return_tensor, squeeze)
+
+    async def _get_embeddings_async(
+        self,
+        input: EmbeddingsInput,
+        return_tensor: Literal["pt", "np"] | None = "np",
+        squeeze: bool = True,
+    ) -> "EmbeddingsOutput | np.ndarray | torch.Tensor":
+        response = await self._post_with_retries_async("/embed", *self._prepare_embeddings_request(input))
+        response.raise_for_status()
+        return self._decode_embeddings_response(response, return_tensor, squeeze)
+
+    def _prepare_embeddings_request(self, input: EmbeddingsInput) -> tuple[dict[str, Any], dict[str, str]]:
+        payload = input.model_dump()
+        if "response_format" not in input.model_fields_set:
+            payload["response_format"] = self._response_format
+        if payload["response_format"] == "json":
+            return payload, {"Accept": "application/json"}
+        # servers that do not support the binary formats ignore the response format and respond with JSON
+        return payload, {"Accept": f"{EMBEDDINGS_BINARY_MEDIA_TYPE}, application/json;q=0.5"}
 
+    def _decode_embeddings_response(
+        self,
+        response: httpx.Response,
+        return_tensor: Literal["pt", "np"] | None = "np",
+        squeeze: bool = True,
+    ) -> "EmbeddingsOutput | np.ndarray | torch.Tensor":
+        content_type = response.headers.get("content-type", "")
+        if content_type == "" or content_type.startswith("application/json"):
+            return self._convert_embeddings(EmbeddingsOutput.model_validate(response.json()), return_tensor, squeeze)
+        elif not content_type.startswith(EMBEDDINGS_BINARY_MEDIA_TYPE):
+            raise ValueError(f"Unexpected content type of the Fundus ML embeddings response: '{content_type}'")
+
+        missing_headers = [
+            header
+            for header in ["x-embedding-shape", "x-embedding-dtype", "x-embedding-model"]
+            if header not in response.headers
+        ]
+        if len(missing_headers) > 0:
+            raise ValueError(f"The binary Fundus ML embeddings response lacks the headers {missing_headers}")
+        if response.headers["x-embedding-dtype"] not in EMBEDDINGS_BINARY_DTYPES:
+            raise ValueError(f"Unsupported embeddings dtype: '{response.headers['x-embedding-dtype']}'")
+
+        shape = tuple(int(d) for d in response.headers["x-embedding-shape"].split(","))
+        dtype = EMBEDDINGS_BINARY_DTYPES[response.headers["x-embedding-dtype"]]
+        array = np.frombuffer(response.content, dtype=dtype).reshape(shape)
+        embedding_model = response.headers["x-embedding-model"]
+
+        if return_tensor == "pt":
+            import torch
+
+            # copy into a writable float32 array because torch does not support read-only buffers
+            tensor = torch.from_numpy(array.astype(np.float32))
+            return tensor.squeeze() if squeeze else tensor
+        elif return_tensor == "np":
+            # zero-copy for float32
+            embeddings: np.ndarray = array.astype(np.float32, copy=False)
+            return embeddings.squeeze() if squeeze else embeddings
+
+        # the embeddings come from the server as-is, so we skip the validation
+        embeddings_list: list[list[float]] = array.tolist()
+        return EmbeddingsOutput.model_construct(
+            embeddings=embeddings_list[0] if squeeze and len(embeddings_list) == 1 else embeddings_list,
+            embedding_model=embedding_model,
+        )
+
+    @staticmethod
+    def _convert_embeddings(
+        emb: EmbeddingsOutput,
+        return_tensor: Literal["pt", "np"] | None = "np",
+        squeeze: bool = True,
+    ) -> "EmbeddingsOutput | np.ndarray | torch.Tensor":
         if return_tensor == "pt":
             import torch
 
-            emb = torch.tensor(emb.embeddings)
-            if squeeze:
-                emb = emb.squeeze()
+            tensor = torch.tensor(emb.embeddings)
+            return tensor.squeeze() if squeeze else tensor
         elif return_tensor == "np":
-            emb = np.array(emb.embeddings)
-            if squeeze:
-                emb = emb.squeeze()
-        else:
-            if squeeze and len(emb.embeddings) == 1 and isinstance(emb.embeddings[0], list):
-                emb.embeddings = emb.embeddings[0]
+            array = np.array(emb.embeddings)
+            return array.squeeze() if squeeze else array
 
+        if squeeze and len(emb.embeddings) == 1 and isinstance(emb.embeddings[0], list):
+            emb.embeddings = emb.embeddings[0]
         return emb
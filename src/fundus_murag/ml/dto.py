@@ -5,12 +5,20 @@ from pydantic import BaseModel, Field
 
 MAX_BATCH_SIZE: int = 128
 
+# the media type of the binary embeddings responses and the little-endian numpy dtypes of the binary formats
+EMBEDDINGS_BINARY_MEDIA_TYPE: str = "application/octet-stream"
+EMBEDDINGS_BINARY_DTYPES: dict[str, str] = {"float32": "<f4", "float16": "<f2"}
+
 
 class EmbeddingsInput(BaseModel):
     input_data: Annotated[list[str], Len(max_length=MAX_BATCH_SIZE)] | str = Field(
         ..., title="Either the text or base64 encoded image data"
     )
     input_type: Literal["text", "image"] = Field(..., title="Type of input data")
+    response_format: Literal["json", "float32", "float16"] = Field(
+        default="json",
+        title="Format of the response. The binary formats return the raw little-endian embeddings matrix",
+    )
 
 
 class EmbeddingsOutput(BaseModel):
@@ -0,0 +1,147 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Literal, Sequence
+from uuid import uuid4
+
+import numpy as np
+import srsly
+from loguru import logger
+
+EmbeddingCacheKey = tuple[str, str]
+
+# the version of the cache file format
+CACHE_FILE_VERSION = 2
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        max_size: int,
+        cache_file: str | Path | None = None,
+        flush_every: int = 100,
+    ):
+        """
+        The EmbeddingCache is a thread-safe LRU cache of the embeddings of a single embedding model keyed by the
+        input type and the normalized input. The embeddings are kept as float32 arrays. If a `cache_file` is given,
+        the cache is loaded from it and persisted to it every `flush_every` new entries and on `flush`. The file
+        header records the embedding model, and all entries are discarded as soon as an embedding of another
+        model is stored, so that the vectors of a previous model are never returned.
+
+        Args:
+            max_size (int): The maximum number of cached embeddings.
+            cache_file (str | Path, optional): The msgpack file to persist the cache to. Defaults to None.
+            flush_every (int, optional): The number of new entries after which the cache is persisted. Defaults to 100.
+        """
+        self._max_size = max_size
+        self._cache_file = Path(cache_file) if cache_file else None
+        self._flush_every = flush_every
+        self._entries: OrderedDict[EmbeddingCacheKey, np.ndarray] = OrderedDict()
+        self._model: str | None = None
+        self._lock = threading.Lock()
+        self._num_unflushed = 0
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def normalize(input_data: str) -> str:
+        # collapse all whitespace so that trivially different queries share one entry
+        return " ".join(input_data.split())
+
+    def _make_key(self, input_type: Literal["text", "image"], input_data: str) -> EmbeddingCacheKey:
+        return (input_type, self.normalize(input_data))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def model(self) -> str | None:
+        """
+        The embedding model of the cached embeddings or None if it is not known yet.
+        """
+        return self._model
+
+    def get(self, model: str, input_type: Literal["text", "image"], input_data: str) -> np.ndarray | None:
+        key = self._make_key(input_type, input_data)
+        with self._lock:
+            embedding = self._entries.get(key) if model == self._model else None
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(
+        self,
+        model: str,
+        input_type: Literal["text", "image"],
+        input_data: str,
+        embedding: Sequence[float] | np.ndarray,
+    ) -> None:
+        key = self._make_key(input_type, input_data)
+        with self._lock:
+            if model != self._model:
+                if len(self._entries) > 0:
+                    logger.info(
+                        f"Discarding {len(self._entries)} cached embeddings of model {self._model} "
+                        f"because the embedding model changed to {model}"
+                    )
+                self._entries.clear()
+                self._model = model
+            self._entries[key] = np.asarray(embedding, dtype=np.float32)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+            self._num_unflushed += 1
+            flush = self._cache_file is not None and self._num_unflushed >= self._flush_every
+
+        if flush:
+            self.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _load(self) -> None:
+        if self._cache_file is None or not self._cache_file.exists():
+            return
+        try:
+            data: dict[str, Any] = srsly.read_msgpack(self._cache_file)  # type: ignore
+        except Exception as e:
+            logger.warning(f"Cannot read embedding cache at {self._cache_file}: {e}")
+            return
+
+        if data.get("version") != CACHE_FILE_VERSION or not data.get("model"):
+            logger.warning(f"Discarding embedding cache at {self._cache_file} with an unknown format")
+            return
+
+        self._model = data["model"]
+        # the entries are stored from the least to the most recently used
+        entries: list[tuple[str, str, bytes]] = data["entries"]
+        for input_type, input_data, embedding in entries[-self._max_size :]:
+            self._entries[(input_type, input_data)] = np.frombuffer(embedding, dtype=np.float32)
+        logger.info(f"Loaded {len(self._entries)} cached embeddings of model {self._model} from {self._cache_file}")
+
+    def flush(self) -> None:
+        if self._cache_file is None:
+            return
+        with self._lock:
+            if self._num_unflushed == 0:
+                return
+            data = {
+                "version": CACHE_FILE_VERSION,
+                "model": self._model,
+                "entries": [
+                    [input_type, input_data, embedding.tobytes()]
+                    for (input_type, input_data), embedding in self._entries.items()
+                ],
+            }
+            self._num_unflushed = 0
+
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self._cache_file.with_suffix(f".{uuid4().hex}.tmp")
+        srsly.write_msgpack(tmp_file, data)
+        os.replace(tmp_file, self._cache_file)
+        logger.debug(f"Persisted {len(data['entries'])} cached embeddings to {self._cache_file}")
@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Literal
+
+from loguru import logger
+
+from fundus_murag.ml.dto import MAX_BATCH_SIZE, EmbeddingsInput, EmbeddingsOutput
+
+
+@dataclass
+class _PendingRequest:
+    input_data: str
+    input_type: Literal["text", "image"]
+    future: Future[EmbeddingsOutput] = field(default_factory=Future)
+
+
+class EmbeddingRequestCoalescer:
+    def __init__(
+        self,
+        embed_fn: Callable[[EmbeddingsInput], EmbeddingsOutput],
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 4,
+    ):
+        """
+        The EmbeddingRequestCoalescer collects concurrent single-item embedding requests for at most `max_wait_ms`
+        and sends them to the ML server as one batched `EmbeddingsInput` per input type. The results are fanned out
+        to the callers via futures. The batches are sent by `embed_fn` on a thread pool, so it is meant for
+        synchronous callers.
+
+        Args:
+            embed_fn (Callable[[EmbeddingsInput], EmbeddingsOutput]): The function that computes the embeddings
+                of a batch.
+            max_batch_size (int, optional): The maximum number of inputs per batch. Defaults to MAX_BATCH_SIZE.
+            max_wait_ms (float, optional): The maximum time in milliseconds to wait for more requests after the
+                first request of a batch arrived. Defaults to 5.0.
+            max_concurrent_batches (int, optional): The maximum number of batches sent concurrently. Defaults to 4.
+        """
+        if not 0 < max_batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"The batch size must be between 1 and {MAX_BATCH_SIZE}!")
+
+        self._embed_fn = embed_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait_s = max_wait_ms / 1000
+        self._queue: queue.Queue[_PendingRequest | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches,
+            thread_name_prefix="fundus-ml-batch",
+        )
+        self._worker = threading.Thread(target=self._collect_batches, name="fundus-ml-coalescer", daemon=True)
+        self._worker.start()
+
+    def submit(self, input_data: str, input_type: Literal["text", "image"]) -> Future[EmbeddingsOutput]:
+        """
+        Submits a single input and returns a future that resolves to its `EmbeddingsOutput`.
+        """
+        request = _PendingRequest(input_data=input_data, input_type=input_type)
+        with self._lock:
+            if self._closed:
+                request.future.set_exception(RuntimeError("The EmbeddingRequestCoalescer is closed!"))
+            else:
+                self._queue.put(request)
+        return request.future
+
+    def close(self) -> None:
+        """
+        Closes the coalescer. The batches that are already sent are completed, all other pending requests fail.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        # the worker stops after it submitted the batches of the requests before the sentinel
+        self._worker.join()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _collect_batches(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batches: dict[str, list[_PendingRequest]] = {"text": [], "image": []}
+            batches[first.input_type].append(first)
+            deadline = time.monotonic() + self._max_wait_s
+            stop = False
+            while max(len(b) for b in batches.values()) < self._max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batches[request.input_type].append(request)
+
+            for input_type, batch in batches.items():
+                if len(batch) > 0:
+                    future = self._executor.submit(self._send_batch, input_type, batch)  # type: ignore
+                    future.add_done_callback(lambda f, batch=batch: self._fail_cancelled_batch(f, batch))
+
+            if stop:
+                return
+
+    @staticmethod
+    def _fail_cancelled_batch(future: Future[None], batch: list[_PendingRequest]) -> None:
+        # the batches that were not sent yet are cancelled by `close`
+        if future.cancelled():
+            for request in batch:
+                request.future.set_exception(RuntimeError("The EmbeddingRequestCoalescer is closed!"))
+
+    def _send_batch(self, input_type: Literal["text", "image"], batch: list[_PendingRequest]) -> None:
+        try:
+            output = self._embed_fn(
+                EmbeddingsInput(
+                    input_data=[request.input_data for request in batch],
+                    input_type=input_type,
+                )
+            )
+            if len(output.embeddings) != len(batch):
+                raise ValueError(f"Expected {len(batch)} embeddings but got {len(output.embeddings)}!")
+        except Exception as e:
+            logger.error(f"Error while computing a batch of {len(batch)} {input_type} embeddings: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        for request, embedding in zip(batch, output.embeddings):
+            request.future.set_result(
+                EmbeddingsOutput(
+                    embeddings=[embedding],  # type: ignore
+                    embedding_model=output.embedding_model,
+                )
+            )
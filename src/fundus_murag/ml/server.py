@@ -2,6 +2,7 @@
 # debugpy.listen(58688)
 
 import base64
+import binascii
 import io
 import os
 
@@ -10,17 +11,38 @@ import torch
 
 # we use relative imports here because this needs to run inside docker
 from dto import (
+    EMBEDDINGS_BINARY_DTYPES,
+    EMBEDDINGS_BINARY_MEDIA_TYPE,
+    MAX_BATCH_SIZE,
     EmbeddingsInput,
     EmbeddingsOutput,
 )
+from fastapi import Response
+from fastapi.responses import JSONResponse
 from loguru import logger
 from PIL import Image
 from transformers import BatchFeature, SiglipModel, SiglipProcessor
 
 FUNDUS_ML_DEV_MODE = int(os.environ.get("FUNDUS_ML_DEV_MODE", 1))
+# use "cpu" to run without a GPU, e.g., on staging nodes or in CI
+FUNDUS_ML_ACCELERATOR = os.environ.get("FUNDUS_ML_ACCELERATOR", "cuda")
+# on the CPU, the linear layers of the text tower are quantized to int8 (dynamic quantization) unless this is 0
+FUNDUS_ML_CPU_QUANTIZE = int(os.environ.get("FUNDUS_ML_CPU_QUANTIZE", 1))
+# the maximum number of requests that are batched into one forward pass per modality (1 to disable batching)
+FUNDUS_ML_MAX_BATCH_SIZE = int(os.environ.get("FUNDUS_ML_MAX_BATCH_SIZE", 8))
+# the maximum time in seconds to wait for more requests before a batch is processed
+FUNDUS_ML_BATCH_TIMEOUT = float(os.environ.get("FUNDUS_ML_BATCH_TIMEOUT", 0.01))
+# the maximum number of inputs per forward pass. Larger batches of inputs are processed in chunks.
+FUNDUS_ML_MAX_FORWARD_BATCH_SIZE = int(os.environ.get("FUNDUS_ML_MAX_FORWARD_BATCH_SIZE", MAX_BATCH_SIZE))
 
 MODEL_NAME = "google/siglip-so400m-patch14-384"
-TORCH_DTYPE = torch.bfloat16
+# flash attention and bfloat16 are only supported (and fast) on the GPU
+if FUNDUS_ML_ACCELERATOR == "cpu":
+    TORCH_DTYPE = torch.float32
+    ATTN_IMPLEMENTATION = "sdpa"
+else:
+    TORCH_DTYPE = torch.bfloat16
+    ATTN_IMPLEMENTATION = "flash_attention_2"
 
 
 class SigLipLitAPI(ls.LitAPI):
@@ -29,24 +51,49 @@ class SigLipLitAPI(ls.LitAPI):
         logger.info(f"Using device: {device}")
         self.model = SiglipModel.from_pretrained(
             MODEL_NAME,
-            attn_implementation="flash_attention_2",
+            attn_implementation=ATTN_IMPLEMENTATION,
             torch_dtype=TORCH_DTYPE,
             device_map=device,
         )
+        if device == "cpu" and FUNDUS_ML_CPU_QUANTIZE:
+            logger.info("Quantizing the text model to int8")
+            self.model.text_model = torch.ao.quantization.quantize_dynamic(
+                self.model.text_model,
+                {torch.nn.Linear},
+                dtype=torch.qint8,
+            )
+        self.model.eval()
         self.processor = SiglipProcessor.from_pretrained(MODEL_NAME)
 
-    def decode_request(self, request: EmbeddingsInput) -> dict[str, list | None]:
-        if request.input_type == "text":
-            text = request.input_data if isinstance(request.input_data, list) else [request.input_data]
-            image = None
-        elif request.input_type == "image":
-            image_data = request.input_data if isinstance(request.input_data, list) else [request.input_data]
-            image = [Image.open(io.BytesIO(base64.b64decode(b64))) for b64 in image_data]
-            text = None
-        else:
-            raise ValueError("Invalid request type")
-
-        return {"image": image, "text": text}
+    def decode_request(self, request: EmbeddingsInput) -> dict[str, list | str | None]:
+        # with dynamic batching, an exception in any step fails all requests of the batch. So an invalid request is
+        # not raised here but passed through as an error, which is returned as its (only its) response.
+        try:
+            if request.input_type == "text":
+                text = request.input_data if isinstance(request.input_data, list) else [request.input_data]
+                image = None
+            elif request.input_type == "image":
+                image_data = request.input_data if isinstance(request.input_data, list) else [request.input_data]
+                image = [self._decode_image(b64) for b64 in image_data]
+                text = None
+            else:
+                raise ValueError("Invalid request type")
+            if len(image or text or []) == 0:
+                raise ValueError("No input data provided")
+        except ValueError as e:
+            logger.warning(f"Invalid request: {e}")
+            return {"image": None, "text": None, "response_format": request.response_format, "error": str(e)}
+
+        return {"image": image, "text": text, "response_format": request.response_format, "error": None}
+
+    @staticmethod
+    def _decode_image(b64: str) -> Image.Image:
+        try:
+            image = Image.open(io.BytesIO(base64.b64decode(b64, validate=True)))
+            image.load()
+        except (binascii.Error, OSError) as e:
+            raise ValueError(f"Invalid base64 encoded image data: {e}") from e
+        return image
 
     def _compute_text_embedding(self, text_features: BatchFeature) -> torch.Tensor:
         with torch.no_grad():
@@ -58,56 +105,128 @@ class SigLipLitAPI(ls.LitAPI):
             img_emb = self.model.get_image_features(**image_features.to(self.device, dtype=TORCH_DTYPE))
         return img_emb
 
-    def predict(self, inputs: dict[str, list | None]) -> torch.Tensor:
-        images = inputs["image"]
-        texts = inputs["text"]
-
-        if images is None and texts is None:
-            raise ValueError("No input data provided")
-        elif images is not None and texts is not None:
-            raise ValueError("Cannot process both image and text data at the same time")
-        elif images is not None and len(images) > 0:
+    def _embed_images(self, images: list) -> torch.Tensor:
+        embs = []
+        for i in range(0, len(images), FUNDUS_ML_MAX_FORWARD_BATCH_SIZE):
             image_features = self.processor(
-                images=images,
+                images=images[i : i + FUNDUS_ML_MAX_FORWARD_BATCH_SIZE],
                 padding="max_length",
                 return_tensors="pt",
             )  # type: ignore
-            embs = self._compute_image_embedding(image_features)
-        elif texts is not None and len(texts) > 0:
-            texts = self.processor(
-                text=texts,
+            embs.append(self._compute_image_embedding(image_features))
+        return torch.cat(embs)
+
+    def _embed_texts(self, texts: list) -> torch.Tensor:
+        embs = []
+        for i in range(0, len(texts), FUNDUS_ML_MAX_FORWARD_BATCH_SIZE):
+            text_features = self.processor(
+                text=texts[i : i + FUNDUS_ML_MAX_FORWARD_BATCH_SIZE],
                 padding="max_length",
                 return_tensors="pt",
                 truncation=True,
             )  # type: ignore
-            embs = self._compute_text_embedding(texts)
+            embs.append(self._compute_text_embedding(text_features))
+        return torch.cat(embs)
+
+    def batch(self, inputs: list[dict]) -> dict[str, list]:
+        # requests can be text or image requests with one or more inputs, so we group the inputs per modality and
+        # remember the modality, the number of inputs, the response format, and the error of each request to unbatch
+        # the embeddings. Invalid requests (see `decode_request`) contribute no inputs.
+        batch = {"text": [], "image": [], "requests": []}
+        for request in inputs:
+            if request["error"] is not None:
+                batch["requests"].append((None, 0, request["response_format"], request["error"]))
+            elif request["image"] is not None:
+                batch["image"].extend(request["image"])
+                batch["requests"].append(("image", len(request["image"]), request["response_format"], None))
+            else:
+                batch["text"].extend(request["text"])
+                batch["requests"].append(("text", len(request["text"]), request["response_format"], None))
+        return batch
+
+    def unbatch(self, output: dict) -> list[dict]:
+        offsets = {"text": 0, "image": 0}
+        outputs = []
+        for modality, num_inputs, response_format, error in output["requests"]:
+            if error is not None:
+                outputs.append({"embeddings": None, "response_format": response_format, "error": error})
+                continue
+            start = offsets[modality]
+            outputs.append(
+                {
+                    "embeddings": output[modality][start : start + num_inputs],
+                    "response_format": response_format,
+                    "error": None,
+                }
+            )
+            offsets[modality] += num_inputs
+        return outputs
+
+    def predict(self, inputs: dict) -> dict:
+        if "requests" in inputs:
+            # a batch of multiple requests, see `batch`
+            return {
+                "text": self._embed_texts(inputs["text"]) if len(inputs["text"]) > 0 else None,
+                "image": self._embed_images(inputs["image"]) if len(inputs["image"]) > 0 else None,
+                "requests": inputs["requests"],
+            }
+
+        if inputs["error"] is not None:
+            return {"embeddings": None, "response_format": inputs["response_format"], "error": inputs["error"]}
+        elif inputs["image"] is not None:
+            embs = self._embed_images(inputs["image"])
         else:
-            raise ValueError("Invalid input data")
-
-        return embs
+            embs = self._embed_texts(inputs["text"])
+
+        return {"embeddings": embs, "response_format": inputs["response_format"], "error": None}
+
+    # the return annotation is used by LitServe as the response model of the JSON responses. FastAPI returns the
+    # binary responses as they are.
+    def encode_response(self, outputs: dict) -> EmbeddingsOutput:
+        if outputs["error"] is not None:
+            return JSONResponse(status_code=400, content={"detail": outputs["error"]})  # type: ignore
+
+        embs: torch.Tensor = outputs["embeddings"]
+        response_format = outputs["response_format"]
+        if response_format in EMBEDDINGS_BINARY_DTYPES:
+            # the raw little-endian embeddings matrix. The client reads the shape and dtype from the headers.
+            dtype = torch.float16 if response_format == "float16" else torch.float32
+            array = embs.to(dtype).cpu().numpy().astype(EMBEDDINGS_BINARY_DTYPES[response_format], copy=False)
+            return Response(  # type: ignore
+                content=array.tobytes(),
+                media_type=EMBEDDINGS_BINARY_MEDIA_TYPE,
+                headers={
+                    "X-Embedding-Model": MODEL_NAME,
+                    "X-Embedding-Shape": ",".join(str(d) for d in array.shape),
+                    "X-Embedding-Dtype": response_format,
+                },
+            )
 
-    def encode_response(self, outputs: torch.Tensor) -> EmbeddingsOutput:
         return EmbeddingsOutput(
-            embeddings=outputs.tolist(),
+            embeddings=embs.tolist(),
             embedding_model=MODEL_NAME,
         )
 
 
 if __name__ == "__main__":
-    if FUNDUS_ML_DEV_MODE == 0:
+    if FUNDUS_ML_DEV_MODE == 0 and FUNDUS_ML_ACCELERATOR != "cpu":
         workers_per_device = 2
     else:
         workers_per_device = 1
 
     port = 8000
     logger.info(f"Starting server on port {port}")
+    logger.info(f"Accelerator: {FUNDUS_ML_ACCELERATOR}")
     logger.info(f"Workers per device: {workers_per_device}")
+    logger.info(f"Max batch size: {FUNDUS_ML_MAX_BATCH_SIZE}, batch timeout: {FUNDUS_ML_BATCH_TIMEOUT}s")
 
     api = SigLipLitAPI()
     server = ls.LitServer(
         api,
-        accelerator="cuda",
+        accelerator=FUNDUS_ML_ACCELERATOR,
         api_path="/embed",
         workers_per_device=workers_per_device,
+        max_batch_size=FUNDUS_ML_MAX_BATCH_SIZE,
+        batch_timeout=FUNDUS_ML_BATCH_TIMEOUT,
     )
     server.run(port=port)
@@ -0,0 +1,81 @@
+import random
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fire import Fire
+
+from fundus_murag.data.collection_catalog import CollectionCatalog
+from fundus_murag.data.dtos.fundus import FundusCollection, FundusRecordField
+from fundus_murag.data.record_converter import FundusRecordConverter
+
+
+def _create_collections(num_collections: int, num_fields: int) -> list[FundusCollection]:
+    return [
+        FundusCollection(
+            murag_id=str(uuid4()),
+            collection_name=f"collection_{c}",
+            title=f"Collection {c}",
+            title_de=f"Sammlung {c}",
+            description="",
+            description_de="",
+            fields=[
+                FundusRecordField(name=f"field_{f}", label_en=f"Field {f}", label_de=f"Feld {f}")
+                for f in range(num_fields)
+            ],
+        )
+        for c in range(num_collections)
+    ]
+
+
+def _create_query_result(num_records: int, num_collections: int, num_fields: int) -> SimpleNamespace:
+    # mimics the objects of a weaviate query result
+    objects = [
+        SimpleNamespace(
+            properties={
+                "murag_id": str(uuid4()),
+                "title": f"Record {r}",
+                "fundus_id": r,
+                "catalogno": f"C-{r}",
+                "collection_name": f"collection_{random.randrange(num_collections)}",
+                "image_name": f"{r}.jpg",
+                "details": [{"key": f"field_{f}", "value": f"value {f}"} for f in range(num_fields)],
+            },
+            vector=None,
+        )
+        for r in range(num_records)
+    ]
+    return SimpleNamespace(objects=objects)
+
+
+def main(
+    num_records: int = 100,
+    num_collections: int = 300,
+    num_fields: int = 20,
+    repeats: int = 100,
+):
+    """
+    Micro-benchmark of the conversion of VectorDB query results to `FundusRecord`s, i.e., what
+    `VectorDB.create_fundus_records_from_query_results` does for every search.
+
+    Args:
+        num_records (int): The number of records per query result, i.e., the `top_k` of a search.
+        num_collections (int): The number of collections in the catalog.
+        num_fields (int): The number of detail fields per record and collection.
+        repeats (int): The number of times the query result is converted.
+    """
+    catalog = CollectionCatalog(_create_collections(num_collections, num_fields))
+    converter = FundusRecordConverter(catalog)
+    res = _create_query_result(num_records, num_collections, num_fields)
+
+    start_t = time.perf_counter()
+    for _ in range(repeats):
+        converter.convert_all(res)
+    elapsed_t = time.perf_counter() - start_t
+
+    total = num_records * repeats
+    print(f"Converted {total} records in {elapsed_t:.3f}s ({total / elapsed_t:.0f} records/s)")
+
+
+if __name__ == "__main__":
+    Fire(main)
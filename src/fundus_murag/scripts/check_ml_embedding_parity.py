@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from fire import Fire
+
+from fundus_murag.ml.client import FundusMLClient
+from fundus_murag.ml.dto import MAX_BATCH_SIZE, EmbeddingsInput, EmbeddingsOutput
+
+# the minimum cosine similarity of every text embedding computed on the CPU to its (GPU) reference embedding
+MIN_COSINE_SIMILARITY = 0.99
+
+
+def load_reference_title_embeddings(
+    records_df_file: str,
+    record_embeddings_df_file: str,
+    num_samples: int = 512,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    Loads a sample of the record titles with their reference title embeddings, i.e., the embeddings that were
+    computed on the GPU and imported into the VectorDB.
+
+    Returns:
+        pd.DataFrame: A DataFrame with the columns `murag_id`, `title`, and `embedding`.
+    """
+    records_df = pd.read_parquet(records_df_file, columns=["murag_id", "title"])
+    embeddings_df = pd.read_parquet(record_embeddings_df_file)
+    title_embeddings_df = embeddings_df.loc[
+        embeddings_df["embedding_name"] == "record_title", ["murag_id", "embedding"]
+    ]
+    df = records_df.merge(title_embeddings_df, on="murag_id")
+    return df.sample(n=min(num_samples, len(df)), random_state=seed)
+
+
+def check_embedding_parity(
+    titles: list[str],
+    embeddings: list[list[float]],
+    references: list[list[float]],
+    min_cosine_similarity: float = MIN_COSINE_SIMILARITY,
+) -> np.ndarray:
+    """
+    Checks that every embedding has at least `min_cosine_similarity` to its reference embedding and raises a
+    ValueError otherwise.
+
+    Returns:
+        np.ndarray: The cosine similarities of the embeddings to their reference embeddings.
+    """
+    embs = np.array(embeddings, dtype=np.float32)
+    refs = np.array(references, dtype=np.float32)
+    embs /= np.linalg.norm(embs, axis=1, keepdims=True)
+    refs /= np.linalg.norm(refs, axis=1, keepdims=True)
+    similarities = (embs * refs).sum(axis=1)
+
+    print(f"Cosine similarity: mean={similarities.mean():.5f}, min={similarities.min():.5f}")
+    num_failed = int((similarities < min_cosine_similarity).sum())
+    if num_failed > 0:
+        worst = titles[int(similarities.argmin())]
+        raise ValueError(
+            f"{num_failed} of {len(titles)} embeddings have a cosine similarity below {min_cosine_similarity}! "
+            f"Worst title: '{worst}'"
+        )
+    return similarities
+
+
+def main(
+    fundus_ml_url: str,
+    records_df_file: str,
+    record_embeddings_df_file: str,
+    num_samples: int = 512,
+    batch_size: int = MAX_BATCH_SIZE,
+    min_cosine_similarity: float = MIN_COSINE_SIMILARITY,
+    seed: int = 42,
+):
+    """
+    Checks the parity of the text embeddings computed by an ML server, e.g., one running on the CPU with a
+    quantized text model, with the reference record title embeddings that were computed on the GPU and imported
+    into the VectorDB.
+
+    Args:
+        fundus_ml_url (str): The URL of the ML server to check.
+        records_df_file (str): The records DataFrame file.
+        record_embeddings_df_file (str): The record embeddings DataFrame file with the reference embeddings.
+        num_samples (int, optional): The number of record titles to compare. Defaults to 512.
+        batch_size (int, optional): The number of titles per request. Defaults to MAX_BATCH_SIZE.
+        min_cosine_similarity (float, optional): The minimum cosine similarity of every embedding to its reference.
+            Defaults to MIN_COSINE_SIMILARITY (0.99).
+        seed (int, optional): The random seed of the sample. Defaults to 42.
+    """
+    df = load_reference_title_embeddings(records_df_file, record_embeddings_df_file, num_samples, seed)
+    print(f"Comparing {len(df)} record title embeddings computed by {fundus_ml_url} with the reference embeddings")
+
+    client = FundusMLClient(fundus_ml_url)
+    titles = df["title"].tolist()
+    embeddings = []
+    for i in range(0, len(titles), batch_size):
+        output: EmbeddingsOutput = client._get_embeddings(
+            EmbeddingsInput(input_data=titles[i : i + batch_size], input_type="text"),
+            None,
+            False,
+        )  # type: ignore
+        embeddings.extend(output.embeddings)
+
+    check_embedding_parity(titles, embeddings, df["embedding"].tolist(), min_cosine_similarity)
+    print("Parity check passed!")
+
+
+if __name__ == "__main__":
+    Fire(main)
@@ -0,0 +1,121 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+vector_db = pytest.importorskip("fundus_murag.data.vector_db")
+async_vector_db = pytest.importorskip("fundus_murag.data.async_vector_db")
+
+from fundus_murag.data.collection_catalog import CollectionCatalog  # noqa: E402
+from fundus_murag.data.dtos.fundus import FundusCollection  # noqa: E402
+
+MURAG_IDS = ["5f1c4b5e-8d5c-4a4f-9f43-1b0e2d1c3a7b", "0b6f3c1a-2d4e-4f5a-8b7c-9d0e1f2a3b4c"]
+
+
+class FakeQuery:
+    def __init__(self):
+        self.calls: list[tuple] = []
+
+    def _record(self, method, *args, **kwargs):
+        self.calls.append((method, args, kwargs))
+        return SimpleNamespace(objects=[])
+
+    def fetch_objects(self, **kwargs):
+        return self._record("fetch_objects", **kwargs)
+
+    def near_vector(self, *args, **kwargs):
+        return self._record("near_vector", *args, **kwargs)
+
+    def bm25(self, *args, **kwargs):
+        return self._record("bm25", *args, **kwargs)
+
+
+class FakeAsyncQuery(FakeQuery):
+    async def fetch_objects(self, **kwargs):
+        return super().fetch_objects(**kwargs)
+
+    async def near_vector(self, *args, **kwargs):
+        return super().near_vector(*args, **kwargs)
+
+    async def bm25(self, *args, **kwargs):
+        return super().bm25(*args, **kwargs)
+
+
+def _make_vdbs():
+    # bypass the singletons and the connections to Weaviate
+    vdb = object.__new__(vector_db.VectorDB)
+    vdb._image_blob_store = None
+    vdb._fundus_record_return_props = vdb._build_fundus_record_return_props()
+    vdb._collection_catalog = CollectionCatalog(
+        [
+            FundusCollection(
+                murag_id="c1",
+                collection_name="zoology_birds",
+                title="Birds",
+                title_de="Vögel",
+                description="",
+                description_de="",
+            )
+        ]
+    )
+    vdb._fundus_record_converter = SimpleNamespace(convert_all=lambda res, internal=False: [])
+    vdb._get_client = lambda: SimpleNamespace(close=lambda: None)
+    vdb.query = FakeQuery()
+    vdb._get_fundus_record_collection = lambda: SimpleNamespace(query=vdb.query)
+    vdb._get_fundus_collection_collection = lambda: SimpleNamespace(query=vdb.query)
+
+    avdb = object.__new__(async_vector_db.AsyncVectorDB)
+    avdb._vdb = vdb
+    avdb.query = FakeAsyncQuery()
+
+    async def get_collection():
+        return SimpleNamespace(query=avdb.query)
+
+    avdb._get_fundus_record_collection = get_collection
+    avdb._get_fundus_collection_collection = get_collection
+    return vdb, avdb
+
+
+def _run_both(sync_fn, async_fn):
+    for fn in (sync_fn, async_fn):
+        try:
+            result = fn()
+            if asyncio.iscoroutine(result):
+                asyncio.run(result)
+        except KeyError:
+            # the fake queries find no records
+            pass
+
+
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        ("get_fundus_records_by_murag_ids", {"murag_ids": MURAG_IDS}),
+        ("get_fundus_record_by_murag_id", {"murag_id": MURAG_IDS[0]}),
+        ("get_fundus_record_image_by_murag_id", {"murag_id": MURAG_IDS[0]}),
+        ("get_fundus_records_by_fundus_id", {"fundus_id": 42}),
+        (
+            "_fundus_record_similarity_search",
+            {
+                "query_embedding": [0.1, 0.2],
+                "target_vector": "record_title",
+                "search_in_collections": ["birds"],
+                "top_k": 5,
+                "return_internal_records": True,
+            },
+        ),
+        ("_fundus_record_lexical_search", {"query": "bear", "search_in_collections": ["vögel"], "top_k": 3}),
+        ("_fundus_collection_lexical_search", {"query": "bear", "top_k": 3, "search_in_description": False}),
+        (
+            "_fundus_collection_similarity_search",
+            {"query_embedding": [0.1, 0.2], "target_vector": "collection_title", "top_k": 2},
+        ),
+    ],
+)
+def test_async_queries_match_the_sync_queries(method, kwargs):
+    vdb, avdb = _make_vdbs()
+
+    _run_both(lambda: getattr(vdb, method)(**kwargs), lambda: getattr(avdb, method)(**kwargs))
+
+    assert len(vdb.query.calls) == 1
+    assert repr(avdb.query.calls) == repr(vdb.query.calls)
@@ -0,0 +1,111 @@
+import contextlib
+
+import pytest
+from openai.types.chat import ChatCompletionChunk
+
+chat_assistant = pytest.importorskip("fundus_murag.agent.chat_assistant")
+
+import mlflow  # noqa: E402
+
+
+def _chunk(content: str | None = None, tool_calls: list[dict] | None = None) -> ChatCompletionChunk:
+    delta = {"role": "assistant", "content": content, "tool_calls": tool_calls}
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "model",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+        }
+    )
+
+
+def _tool_call_delta(index: int, id: str | None = None, name: str | None = None, arguments: str = "") -> dict:
+    return {"index": index, "id": id, "type": "function", "function": {"name": name, "arguments": arguments}}
+
+
+def _accumulate(chunks: list[ChatCompletionChunk]) -> tuple[list[str | None], list[str], dict]:
+    assistant = object.__new__(chat_assistant.ChatAssistant)
+    text_chunks: list[str] = []
+    tool_calls: dict = {}
+    tokens = [assistant._accumulate_chat_completion_chunk(chunk, text_chunks, tool_calls) for chunk in chunks]
+    return tokens, text_chunks, tool_calls
+
+
+def _function(tool_call: dict) -> tuple[str, str, str]:
+    return tool_call["id"], tool_call["function"]["name"], tool_call["function"]["arguments"]
+
+
+def test_text_chunks():
+    empty = ChatCompletionChunk.model_validate(
+        {"id": "chunk", "object": "chat.completion.chunk", "created": 0, "model": "model", "choices": []}
+    )
+
+    tokens, text_chunks, tool_calls = _accumulate([_chunk("A cave "), _chunk(""), empty, _chunk("bear.")])
+
+    assert tokens == ["A cave ", "", None, "bear."]
+    assert "".join(text_chunks) == "A cave bear."
+    assert tool_calls == {}
+
+
+def test_openai_tool_call_argument_deltas():
+    _, text_chunks, tool_calls = _accumulate(
+        [
+            _chunk(tool_calls=[_tool_call_delta(0, "call_a", "get_record", '{"murag_id": ')]),
+            _chunk(tool_calls=[_tool_call_delta(0, arguments='"abc"}')]),
+            _chunk(tool_calls=[_tool_call_delta(1, "call_b", "list_collections", "")]),
+            _chunk(tool_calls=[_tool_call_delta(1, arguments="{}")]),
+        ]
+    )
+
+    assert text_chunks == []
+    assert sorted(tool_calls) == [0, 1]
+    assert _function(tool_calls[0]) == ("call_a", "get_record", '{"murag_id": "abc"}')
+    assert _function(tool_calls[1]) == ("call_b", "list_collections", "{}")
+
+
+def test_vertex_complete_tool_calls_with_the_same_index():
+    _, _, tool_calls = _accumulate(
+        [
+            _chunk(tool_calls=[_tool_call_delta(0, "call_a", "get_record", '{"murag_id": "abc"}')]),
+            _chunk(
+                tool_calls=[
+                    _tool_call_delta(0, "call_b", "get_record", '{"murag_id": "def"}'),
+                    _tool_call_delta(0, "call_c", "list_collections", "{}"),
+                ]
+            ),
+        ]
+    )
+
+    assert sorted(tool_calls) == [0, 1, 2]
+    assert _function(tool_calls[0]) == ("call_a", "get_record", '{"murag_id": "abc"}')
+    assert _function(tool_calls[1]) == ("call_b", "get_record", '{"murag_id": "def"}')
+    assert _function(tool_calls[2]) == ("call_c", "list_collections", "{}")
+
+
+@pytest.fixture
+def experiment(tmp_path):
+    tracking_uri = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri(tmp_path.as_uri())
+    yield mlflow.set_experiment("test")
+    mlflow.set_tracking_uri(tracking_uri)
+
+
+def test_streamed_agentic_loop_is_traced(experiment):
+    assistant = object.__new__(chat_assistant.ChatAssistant)
+    assistant.assistant_name = "test"
+    assistant._chat_history = []
+    assistant._create_chat_completion_from_history = lambda stream: contextlib.nullcontext(
+        iter([_chunk("A cave "), _chunk("bear.")])
+    )
+
+    events = list(assistant._run_agentic_loop_stream())
+
+    assert [event.event for event in events] == ["token", "token", "done"]
+    traces = mlflow.MlflowClient().search_traces(experiment_ids=[experiment.experiment_id])
+    assert len(traces) == 1
+    span = traces[0].data.spans[0]
+    assert span.name == "_run_agentic_loop_stream"
+    assert span.span_type == "AGENT"
+    assert span.outputs == "A cave bear."
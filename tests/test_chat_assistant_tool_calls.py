@@ -0,0 +1,50 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+chat_assistant = pytest.importorskip("fundus_murag.agent.chat_assistant")
+
+from fundus_murag.agent import async_chat_assistant  # noqa: E402
+
+# stands in for the active (mlflow) span of the agentic loop
+CURRENT_SPAN = contextvars.ContextVar("CURRENT_SPAN", default=None)
+
+
+@pytest.fixture
+def assistant(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix=chat_assistant.TOOL_CALL_THREAD_NAME_PREFIX)
+    monkeypatch.setattr(chat_assistant, "get_tool_call_executor", lambda: executor)
+    monkeypatch.setattr(async_chat_assistant, "get_tool_call_executor", lambda: executor)
+
+    # bypass the config and the model
+    assistant = object.__new__(chat_assistant.ChatAssistant)
+    assistant.assistant_name = "test"
+    assistant._conf = SimpleNamespace(assistant=SimpleNamespace(max_parallel_tool_calls=4))
+    assistant._execute_tool_call = lambda tc: {"tool_call_id": tc.id, "span": CURRENT_SPAN.get()}
+    yield assistant
+    executor.shutdown()
+
+
+def _tool_calls(n: int) -> list:
+    return [SimpleNamespace(id=f"call_{i}") for i in range(n)]
+
+
+def test_concurrent_tool_calls_run_in_the_current_context(assistant):
+    CURRENT_SPAN.set("agentic_loop")
+
+    results = assistant._execute_tool_calls(_tool_calls(3))
+
+    assert results == [{"tool_call_id": f"call_{i}", "span": "agentic_loop"} for i in range(3)]
+
+
+def test_async_concurrent_tool_calls_run_in_the_current_context(assistant):
+    async def run():
+        CURRENT_SPAN.set("async_agentic_loop")
+        return await async_chat_assistant.AsyncChatAssistant(assistant)._execute_tool_calls(_tool_calls(3))
+
+    results = asyncio.run(run())
+
+    assert results == [{"tool_call_id": f"call_{i}", "span": "async_agentic_loop"} for i in range(3)]
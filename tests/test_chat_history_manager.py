@@ -0,0 +1,70 @@
+from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion_message_tool_call import Function
+
+from fundus_murag.agent.chat_history_manager import OMITTED_IMAGE_TEXT, ChatHistoryManager
+
+
+def _assistant_message(content: str | None, tool_calls: list | None = None) -> dict:
+    # the assistant messages are added to the chat history as dumps of the model responses, see `ChatAssistant`
+    return ChatCompletionMessage(role="assistant", content=content, tool_calls=tool_calls).model_dump()
+
+
+def _tool_call(call_id: str) -> ChatCompletionMessageToolCall:
+    return ChatCompletionMessageToolCall(
+        id=call_id,
+        type="function",
+        function=Function(name="get_fundus_record_by_murag_id", arguments='{"murag_id": "abc"}'),
+    )
+
+
+def _turn(i: int, tool_output: str = "result") -> list:
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": f"question {i}"},
+                {"type": "image_url", "image_url": {"url": "data:image/png;base64,AAAA"}},
+            ],
+        },
+        _assistant_message(None, [_tool_call(f"call_{i}")]),
+        {"role": "tool", "tool_call_id": f"call_{i}", "content": tool_output},
+        _assistant_message(f"answer {i}"),
+    ]
+
+
+def test_messages_without_tool_calls_from_model_dumps():
+    message = _assistant_message("hi")
+    assert message["tool_calls"] is None
+
+    assert ChatHistoryManager.estimate_tokens(message) > 0  # type: ignore
+
+
+def test_build_context_of_model_dumps():
+    chat_history = [{"role": "system", "content": "You are a helpful assistant."}]
+    for i in range(4):
+        chat_history.extend(_turn(i, tool_output="x" * 10_000))
+
+    messages = ChatHistoryManager(max_tokens=100_000, keep_recent_turns=2).build_context(chat_history)  # type: ignore
+
+    assert len(messages) == len(chat_history)
+    # the older turns are compacted
+    assert messages[1]["content"][1] == {"type": "text", "text": OMITTED_IMAGE_TEXT}  # type: ignore
+    assert len(messages[3]["content"]) < 10_000  # type: ignore
+    # the recent turns are sent as they are
+    assert messages[-4:] == chat_history[-4:]
+
+
+def test_build_context_drops_the_oldest_turns():
+    chat_history = [{"role": "system", "content": "You are a helpful assistant."}]
+    for i in range(4):
+        chat_history.extend(_turn(i))
+    manager = ChatHistoryManager(max_tokens=2_200, keep_recent_turns=2)
+
+    messages = manager.build_context(chat_history)  # type: ignore
+
+    # the oldest turn is dropped
+    assert messages[0] == chat_history[0]
+    assert len(messages) == len(chat_history) - 4
+    assert messages[1]["content"][0] == {"type": "text", "text": "question 1"}  # type: ignore
+    assert messages[-8:] == chat_history[-8:]
+    assert sum(manager.estimate_tokens(message) for message in messages) <= 2_200
@@ -0,0 +1,92 @@
+import pytest
+
+from fundus_murag.data.collection_catalog import CollectionCatalog
+from fundus_murag.data.dtos.fundus import FundusCollection
+
+COLLECTIONS = [
+    ("herbarium_hamburgense", "Herbarium Hamburgense", "Herbarium Hamburgense"),
+    ("zoology_mammals", "Mammals", "Säugetiere"),
+    ("zoology_birds", "Birds", "Vögel"),
+    ("mineralogical_museum", "Mineralogical Museum", "Mineralogisches Museum"),
+]
+
+
+@pytest.fixture
+def catalog() -> CollectionCatalog:
+    return CollectionCatalog(
+        FundusCollection(
+            murag_id=f"id_{name}",
+            collection_name=name,
+            title=title,
+            title_de=title_de,
+            description="",
+            description_de="",
+        )
+        for name, title, title_de in COLLECTIONS
+    )
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("zoology_birds", "zoology_birds"),
+        (" Zoology_Birds ", "zoology_birds"),
+        ("Birds", "zoology_birds"),
+        ("Vögel", "zoology_birds"),
+        ("Birds Collection", "zoology_birds"),
+        ("mineralogisches museum", "mineralogical_museum"),
+    ],
+)
+def test_resolve_exact_match(catalog, query, expected):
+    assert catalog.resolve_name(query) == expected
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("mammal", "zoology_mammals"),
+        ("säuge", "zoology_mammals"),
+        ("hamburg", "herbarium_hamburgense"),
+        ("Mineral", "mineralogical_museum"),
+        ("bi", "zoology_birds"),
+    ],
+)
+def test_resolve_fuzzy_match(catalog, query, expected):
+    assert catalog.resolve_name(query) == expected
+
+
+@pytest.mark.parametrize("query", ["zoology", "zoolog", "m"])
+def test_resolve_ambiguous_name(catalog, query):
+    with pytest.raises(KeyError, match="Ambigious collection name"):
+        catalog.resolve_name(query)
+
+
+@pytest.mark.parametrize("query", ["dinosaurs", "zz", "hamburg birds"])
+def test_resolve_unknown_name(catalog, query):
+    with pytest.raises(KeyError, match="not found"):
+        catalog.resolve_name(query)
+
+
+def test_fuzzy_match_finds_the_same_collections_as_a_substring_scan(catalog):
+    # the n-gram index must only speed up the substring matching of the names and titles, not change it
+    keys = [(name, title.lower(), title_de.lower()) for name, title, title_de in COLLECTIONS]
+    queries = {
+        key[i:j] for name_keys in keys for key in name_keys for i in range(len(key)) for j in range(i + 1, i + 6)
+    }
+    for query in queries:
+        query = query.strip()
+        if query == "" or "collection" in query or catalog.find_by_title(query) or query in catalog:
+            continue
+        matches = [name for name, title, title_de in keys if query in name or query in title or query in title_de]
+        if len(matches) == 1:
+            assert catalog.resolve_name(query) == matches[0]
+        else:
+            with pytest.raises(KeyError):
+                catalog.resolve_name(query)
+
+
+def test_resolved_names_are_cached(catalog):
+    catalog.resolve_name("mammal")
+    catalog.resolve_name("mammal")
+
+    assert catalog.resolve_name.cache_info().hits == 1
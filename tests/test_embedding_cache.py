@@ -0,0 +1,53 @@
+import numpy as np
+import srsly
+
+from fundus_murag.ml.embedding_cache import EmbeddingCache
+
+MODEL = "google/siglip-so400m-patch14-384"
+OTHER_MODEL = "google/siglip2-so400m-patch14-384"
+
+
+def test_cache_is_persisted_with_its_model(tmp_path):
+    cache_file = tmp_path / "cache.msgpack"
+    cache = EmbeddingCache(max_size=10, cache_file=cache_file)
+    cache.put(MODEL, "text", "a  cave bear", [1.0, 2.0])
+    cache.flush()
+
+    assert srsly.read_msgpack(cache_file)["model"] == MODEL  # type: ignore
+
+    cache = EmbeddingCache(max_size=10, cache_file=cache_file)
+    assert cache.model == MODEL
+    embedding = cache.get(MODEL, "text", "a cave bear")
+    assert embedding is not None
+    np.testing.assert_array_equal(embedding, np.array([1.0, 2.0], dtype=np.float32))
+
+
+def test_cache_of_another_model_is_not_served_and_discarded(tmp_path):
+    cache_file = tmp_path / "cache.msgpack"
+    cache = EmbeddingCache(max_size=10, cache_file=cache_file)
+    cache.put(MODEL, "text", "a cave bear", [1.0, 2.0])
+    cache.flush()
+
+    cache = EmbeddingCache(max_size=10, cache_file=cache_file)
+    assert cache.get(OTHER_MODEL, "text", "a cave bear") is None
+
+    cache.put(OTHER_MODEL, "text", "a skull", [3.0, 4.0])
+    assert cache.model == OTHER_MODEL
+    assert len(cache) == 1
+    assert cache.get(MODEL, "text", "a cave bear") is None
+    cache.flush()
+
+    cache = EmbeddingCache(max_size=10, cache_file=cache_file)
+    assert cache.model == OTHER_MODEL
+    assert cache.get(OTHER_MODEL, "text", "a cave bear") is None
+    assert cache.get(OTHER_MODEL, "text", "a skull") is not None
+
+
+def test_cache_file_without_model_header_is_discarded(tmp_path):
+    cache_file = tmp_path / "cache.msgpack"
+    srsly.write_msgpack(cache_file, {"entries": [[MODEL, "text", "a cave bear", b"\x00" * 8]]})
+
+    cache = EmbeddingCache(max_size=10, cache_file=cache_file)
+
+    assert cache.model is None
+    assert len(cache) == 0
@@ -0,0 +1,66 @@
+import httpx
+import numpy as np
+import pytest
+
+from fundus_murag.ml.client import FundusMLClient
+
+MODEL = "google/siglip-so400m-patch14-384"
+
+
+@pytest.fixture
+def client():
+    # bypass the singleton and the connection to the ML server
+    client = object.__new__(FundusMLClient)
+    client.close = lambda: None
+    return client
+
+
+def _binary_response(array: np.ndarray, response_format: str, **headers) -> httpx.Response:
+    return httpx.Response(
+        200,
+        content=array.tobytes(),
+        headers={
+            "content-type": "application/octet-stream",
+            "x-embedding-shape": ",".join(str(d) for d in array.shape),
+            "x-embedding-dtype": response_format,
+            "x-embedding-model": MODEL,
+            **headers,
+        },
+    )
+
+
+@pytest.mark.parametrize("response_format,dtype", [("float32", "<f4"), ("float16", "<f2")])
+def test_decode_binary_response(client, response_format, dtype):
+    array = np.arange(6).reshape(2, 3).astype(dtype)
+    response = _binary_response(array, response_format)
+
+    embeddings = client._decode_embeddings_response(response, return_tensor="np", squeeze=False)
+    output = client._decode_embeddings_response(response, return_tensor=None, squeeze=False)
+
+    assert embeddings.dtype == np.float32
+    np.testing.assert_array_equal(embeddings, array.astype(np.float32))
+    assert output.embeddings == array.astype(np.float32).tolist()
+    assert output.embedding_model == MODEL
+
+
+def test_decode_json_response(client):
+    response = httpx.Response(200, json={"embeddings": [[1.0, 2.0]], "embedding_model": MODEL})
+
+    output = client._decode_embeddings_response(response, return_tensor=None, squeeze=True)
+
+    assert output.embeddings == [1.0, 2.0]
+    assert output.embedding_model == MODEL
+
+
+def test_decode_binary_response_without_headers(client):
+    response = httpx.Response(200, content=b"\x00" * 8, headers={"content-type": "application/octet-stream"})
+
+    with pytest.raises(ValueError, match="x-embedding-shape"):
+        client._decode_embeddings_response(response)
+
+
+def test_decode_unexpected_response(client):
+    response = httpx.Response(200, text="<html>Bad Gateway</html>", headers={"content-type": "text/html"})
+
+    with pytest.raises(ValueError, match="text/html"):
+        client._decode_embeddings_response(response)
@@ -0,0 +1,168 @@
+import base64
+import io
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("litserve")
+pytest.importorskip("transformers")
+
+# the server uses relative imports because it runs inside docker. The tests run the CPU backend.
+sys.path.insert(0, str(Path(__file__).parents[1] / "src" / "fundus_murag" / "ml"))
+os.environ.setdefault("FUNDUS_ML_ACCELERATOR", "cpu")
+
+import server  # noqa: E402
+from dto import MAX_BATCH_SIZE, EmbeddingsInput  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from fundus_murag.ml.client import FundusMLClient  # noqa: E402
+from fundus_murag.scripts.check_ml_embedding_parity import (  # noqa: E402
+    MIN_COSINE_SIMILARITY,
+    check_embedding_parity,
+    load_reference_title_embeddings,
+)
+
+EMBEDDING_DIM = 4
+TITLES = [
+    "Skull of a Cave Bear",
+    "Bronze Age Sword",
+    "Herbarium sheet of Arnica montana",
+    "Plaster cast of the Venus de Milo",
+    "Ammonite",
+    "Portrait of a young woman with a pearl necklace, oil on canvas",
+]
+# the stored reference embeddings, which were computed on the GPU, e.g., the files of the `data` config
+RECORDS_DF_FILE = os.getenv("FUNDUS_DATA__RECORDS_DF_FILE")
+RECORD_EMBEDDINGS_DF_FILE = os.getenv("FUNDUS_DATA__RECORD_EMBEDDINGS_DF_FILE")
+
+
+def _image_b64(color: str = "red") -> str:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color=color).save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+@pytest.fixture
+def fake_api():
+    # an API without a model that embeds every input as a row of its index in the forward pass
+    api = server.SigLipLitAPI()
+    api._embed_texts = lambda texts: torch.arange(len(texts)).repeat(EMBEDDING_DIM, 1).T.float()
+    api._embed_images = lambda images: -torch.arange(len(images)).repeat(EMBEDDING_DIM, 1).T.float()
+    return api
+
+
+def _load_api(quantize: bool):
+    from huggingface_hub import try_to_load_from_cache
+
+    # the model is not downloaded by the tests
+    if not isinstance(try_to_load_from_cache(server.MODEL_NAME, "config.json"), str):
+        pytest.skip(f"{server.MODEL_NAME} is not in the Hugging Face cache")
+    mp = pytest.MonkeyPatch()
+    mp.setattr(server, "FUNDUS_ML_CPU_QUANTIZE", int(quantize))
+    api = server.SigLipLitAPI()
+    api.setup("cpu")
+    mp.undo()
+    return api
+
+
+@pytest.fixture(scope="module")
+def api():
+    return _load_api(quantize=True)
+
+
+def _serve_batch(api, requests: list[EmbeddingsInput]) -> list:
+    # the steps of LitServe's batched loop
+    outputs = api.unbatch(api.predict(api.batch([api.decode_request(request) for request in requests])))
+    return [api.encode_response(output) for output in outputs]
+
+
+def _serve(api, request: EmbeddingsInput):
+    # the steps of LitServe's loop without batching
+    return api.encode_response(api.predict(api.decode_request(request)))
+
+
+def _min_cosine_similarity(embeddings: list, references: list) -> float:
+    embeddings = np.array(embeddings, dtype=np.float32)
+    references = np.array(references, dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    references /= np.linalg.norm(references, axis=1, keepdims=True)
+    return float((embeddings * references).sum(axis=1).min())
+
+
+def test_invalid_request_does_not_fail_its_batch(fake_api):
+    responses = _serve_batch(
+        fake_api,
+        [
+            EmbeddingsInput(input_data=["a cave bear", "a skull"], input_type="text"),
+            EmbeddingsInput(input_data="not an image", input_type="image"),
+            EmbeddingsInput(input_data=[], input_type="text"),
+            EmbeddingsInput(input_data=_image_b64(), input_type="image"),
+            EmbeddingsInput(input_data="a fossil", input_type="text"),
+        ],
+    )
+
+    assert responses[0].embeddings == [[0.0] * EMBEDDING_DIM, [1.0] * EMBEDDING_DIM]
+    assert responses[1].status_code == 400
+    assert responses[2].status_code == 400
+    assert responses[3].embeddings == [[0.0] * EMBEDDING_DIM]
+    assert responses[4].embeddings == [[2.0] * EMBEDDING_DIM]
+
+
+def test_invalid_request_without_batching(fake_api):
+    response = fake_api.encode_response(
+        fake_api.predict(fake_api.decode_request(EmbeddingsInput(input_data="not an image", input_type="image")))
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("response_format", ["json", "float32", "float16"])
+def test_embeddings_response_round_trip(fake_api, response_format):
+    request = EmbeddingsInput(input_data=["a", "b", "c"], input_type="text", response_format=response_format)
+    response = _serve_batch(fake_api, [request])[0]
+    if response_format == "json":
+        http_response = httpx.Response(200, json=response.model_dump())
+    else:
+        http_response = httpx.Response(response.status_code, content=response.body, headers=dict(response.headers))
+
+    client = object.__new__(FundusMLClient)
+    client.close = lambda: None
+    embeddings = client._decode_embeddings_response(http_response, return_tensor="np", squeeze=False)
+    output = client._decode_embeddings_response(http_response, return_tensor=None, squeeze=False)
+
+    assert embeddings.shape == (3, EMBEDDING_DIM)
+    if response_format != "json":
+        assert embeddings.dtype == np.float32
+    np.testing.assert_array_equal(embeddings, np.arange(3).repeat(EMBEDDING_DIM).reshape(3, EMBEDDING_DIM))
+    assert output.embedding_model == server.MODEL_NAME
+
+
+def test_batched_and_unbatched_embeddings_match(api):
+    requests = [EmbeddingsInput(input_data=title, input_type="text") for title in TITLES] + [
+        EmbeddingsInput(input_data=_image_b64(color), input_type="image") for color in ["red", "blue"]
+    ]
+
+    batched = [response.embeddings for response in _serve_batch(api, requests)]
+    unbatched = [_serve(api, request).embeddings for request in requests]
+
+    assert _min_cosine_similarity(batched, unbatched) >= MIN_COSINE_SIMILARITY
+
+
+def test_text_embeddings_match_the_stored_reference_embeddings(api):
+    if not all(file is not None and Path(file).exists() for file in [RECORDS_DF_FILE, RECORD_EMBEDDINGS_DF_FILE]):
+        pytest.skip("The stored reference embeddings are not available")
+    df = load_reference_title_embeddings(RECORDS_DF_FILE, RECORD_EMBEDDINGS_DF_FILE, num_samples=128)  # type: ignore
+    titles = df["title"].tolist()
+
+    embeddings = []
+    for i in range(0, len(titles), MAX_BATCH_SIZE):
+        request = EmbeddingsInput(input_data=titles[i : i + MAX_BATCH_SIZE], input_type="text")
+        embeddings.extend(_serve(api, request).embeddings)
+
+    similarities = check_embedding_parity(titles, embeddings, df["embedding"].tolist(), MIN_COSINE_SIMILARITY)
+    assert similarities.min() >= MIN_COSINE_SIMILARITY
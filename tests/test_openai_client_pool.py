@@ -0,0 +1,95 @@
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+openai_client_pool = pytest.importorskip("fundus_murag.agent.openai_client_pool")
+
+MODEL_NAME = "google/gemini-2.0-flash"
+
+
+class FakeCredentials:
+    def __init__(self, name: str, expires_in: float):
+        self.name = name
+        self.expires_in = expires_in
+        self.num_refreshes = 0
+        self.token = None
+        self.expiry = None
+
+    def refresh(self, request):
+        self.num_refreshes += 1
+        self.token = f"{self.name}-{self.num_refreshes}"
+        # the expiry of google-auth credentials is a naive datetime in UTC
+        self.expiry = (datetime.now(timezone.utc) + timedelta(seconds=self.expires_in)).replace(tzinfo=None)
+        # the following tokens expire much later so that the refresh thread waits for the stop event
+        self.expires_in = 3600
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    credentials = []
+
+    def default(scopes):
+        # the first token is refreshed right away by the refresh thread
+        credentials.append(
+            FakeCredentials(f"token{len(credentials)}", openai_client_pool.VERTEXAI_TOKEN_REFRESH_MARGIN)
+        )
+        return credentials[-1], "project"
+
+    monkeypatch.setattr(openai_client_pool, "default", default)
+    monkeypatch.setattr(
+        openai_client_pool,
+        "load_config",
+        lambda: SimpleNamespace(google=SimpleNamespace(project_id="project", default_location="europe-west4")),
+    )
+
+    # bypass the singleton
+    pool = object.__new__(openai_client_pool.OpenAIClientPool)
+    pool.__init__()
+    pool.credentials = credentials
+    yield pool
+    pool.close()
+
+
+def test_vertexai_token_is_refreshed(pool):
+    client = pool.get_client(MODEL_NAME)
+
+    assert _wait_for(lambda: client.api_key == "token0-2")
+    assert pool.get_client(MODEL_NAME) is client
+
+
+def test_token_refresh_restarts_after_close(pool):
+    pool.get_client(MODEL_NAME)
+    refresh_thread = pool._vertexai_refresh_thread
+    assert _wait_for(lambda: pool.credentials[0].num_refreshes == 2)
+
+    pool.close()
+    refresh_thread.join(timeout=2.0)
+    assert not refresh_thread.is_alive()
+
+    client = pool.get_client(MODEL_NAME)
+    async_client = pool.get_async_client(MODEL_NAME)
+
+    assert len(pool.credentials) == 2
+    assert pool._vertexai_refresh_thread is not refresh_thread
+    assert pool._vertexai_refresh_thread.is_alive()
+    assert _wait_for(lambda: client.api_key == async_client.api_key == "token1-2")
+    assert pool.credentials[0].num_refreshes == 2
+
+
+def test_close_drops_the_async_clients(pool):
+    async_client = pool.get_async_client(MODEL_NAME)
+
+    pool.close()
+
+    assert pool.get_async_client(MODEL_NAME) is not async_client
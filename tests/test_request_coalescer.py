@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from fundus_murag.ml.dto import EmbeddingsInput, EmbeddingsOutput
+from fundus_murag.ml.request_coalescer import EmbeddingRequestCoalescer
+
+MODEL = "google/siglip-so400m-patch14-384"
+
+
+class FakeEmbed:
+    """Embeds every input as `[float(input)]` (text) or `[-float(input)]` (image) and records the batches."""
+
+    def __init__(self, fail_input_type: str | None = None):
+        self.batches: list[EmbeddingsInput] = []
+        self.fail_input_type = fail_input_type
+        self.lock = threading.Lock()
+
+    def __call__(self, input: EmbeddingsInput) -> EmbeddingsOutput:
+        with self.lock:
+            self.batches.append(input)
+        if input.input_type == self.fail_input_type:
+            raise ValueError("The ML server failed!")
+        sign = 1.0 if input.input_type == "text" else -1.0
+        return EmbeddingsOutput(embeddings=[[sign * float(x)] for x in input.input_data], embedding_model=MODEL)
+
+
+def _submit_all(coalescer: EmbeddingRequestCoalescer, inputs: list[tuple[str, str]]) -> list:
+    return [coalescer.submit(input_data, input_type) for input_data, input_type in inputs]  # type: ignore
+
+
+INPUTS = [("1", "text"), ("2", "image"), ("3", "text"), ("4", "image"), ("5", "text")]
+
+
+def test_requests_are_batched_per_input_type():
+    embed = FakeEmbed()
+    coalescer = EmbeddingRequestCoalescer(embed, max_wait_ms=200)
+    futures = _submit_all(coalescer, INPUTS)
+    for future in futures:
+        future.result(timeout=5)
+    coalescer.close()
+
+    batches = {batch.input_type: batch.input_data for batch in embed.batches}
+    assert len(embed.batches) == 2
+    assert batches == {"text": ["1", "3", "5"], "image": ["2", "4"]}
+
+
+def test_every_caller_gets_the_embedding_of_its_input():
+    coalescer = EmbeddingRequestCoalescer(FakeEmbed(), max_batch_size=2, max_wait_ms=50)
+    futures = _submit_all(coalescer, INPUTS)
+    outputs = [future.result(timeout=5) for future in futures]
+    coalescer.close()
+
+    assert [output.embeddings for output in outputs] == [[[1.0]], [[-2.0]], [[3.0]], [[-4.0]], [[5.0]]]
+    assert all(output.embedding_model == MODEL for output in outputs)
+
+
+def test_an_error_reaches_every_request_of_its_batch():
+    coalescer = EmbeddingRequestCoalescer(FakeEmbed(fail_input_type="image"), max_wait_ms=200)
+    futures = _submit_all(coalescer, INPUTS)
+
+    for future, (_, input_type) in zip(futures, INPUTS):
+        if input_type == "image":
+            with pytest.raises(ValueError, match="The ML server failed!"):
+                future.result(timeout=5)
+        else:
+            assert future.result(timeout=5).embeddings is not None
+    coalescer.close()
+
+
+def test_pending_requests_are_completed_or_failed_on_close():
+    started = threading.Event()
+    release = threading.Event()
+    embed = FakeEmbed()
+
+    def blocking_embed(input: EmbeddingsInput) -> EmbeddingsOutput:
+        started.set()
+        release.wait(timeout=5)
+        return embed(input)
+
+    coalescer = EmbeddingRequestCoalescer(blocking_embed, max_wait_ms=1, max_concurrent_batches=1)
+    sent = coalescer.submit("1", "text")
+    assert started.wait(timeout=5)
+    # the only batch thread is busy, so this batch is still queued when the coalescer is closed
+    queued = coalescer.submit("2", "text")
+
+    coalescer.close()
+    release.set()
+    after_close = coalescer.submit("3", "text")
+
+    assert sent.result(timeout=5).embeddings == [[1.0]]
+    for future in [queued, after_close]:
+        with pytest.raises(RuntimeError, match="closed"):
+            future.result(timeout=5)
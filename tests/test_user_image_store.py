@@ -0,0 +1,59 @@
+import hashlib
+import io
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from fundus_murag.data import user_image_store
+from fundus_murag.data.user_image_store import UserImageStore
+
+
+def _image_bytes(color: str = "red") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color=color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def make_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        user_image_store, "load_config", lambda: SimpleNamespace(data=SimpleNamespace(user_image_dir=str(tmp_path)))
+    )
+
+    def make() -> UserImageStore:
+        # bypass the singleton
+        store = object.__new__(UserImageStore)
+        store.__init__()
+        return store
+
+    return make
+
+
+def test_identical_uploads_get_unguessable_ids_and_share_the_embedding(make_store):
+    store = make_store()
+    image_bytes = _image_bytes()
+
+    first_id = store.store_user_image(image_bytes, "image/png")
+    second_id = store.store_user_image(image_bytes, "image/png")
+
+    assert first_id != second_id
+    assert hashlib.sha256(image_bytes).hexdigest() not in (first_id, second_id)
+
+    store.store_user_image_embedding(first_id, [1.0, 2.0])
+    np.testing.assert_array_equal(store.load_user_image_embedding(second_id), [1.0, 2.0])  # type: ignore
+
+
+def test_embeddings_are_persisted_per_image(make_store):
+    store = make_store()
+    red_id = store.store_user_image(_image_bytes("red"), "image/png")
+    blue_id = store.store_user_image(_image_bytes("blue"), "image/png")
+    store.store_user_image_embedding(red_id, [1.0, 2.0])
+
+    store = make_store()
+
+    np.testing.assert_array_equal(store.load_user_image_embedding(red_id), [1.0, 2.0])  # type: ignore
+    assert store.load_user_image_embedding(blue_id) is None
+    with pytest.raises(FileNotFoundError):
+        store.load_user_image_embedding("unknown")
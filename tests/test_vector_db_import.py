@@ -0,0 +1,174 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+vector_db = pytest.importorskip("fundus_murag.data.vector_db")
+
+from fundus_murag.data.import_checkpoint import ImportCheckpoint  # noqa: E402
+from fundus_murag.data.schema import FUNDUS_COLLECTION_SCHEMA_NAME, FUNDUS_RECORD_SCHEMA_NAME  # noqa: E402
+
+FINGERPRINT = "fingerprint"
+
+
+class FakeCollections:
+    def __init__(self):
+        self.existing: set[str] = set()
+
+    def exists(self, name: str) -> bool:
+        return name in self.existing
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def vdb(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_db, "fingerprint_files", lambda *args, **kwargs: FINGERPRINT)
+    monkeypatch.setattr(vector_db, "load_fundus_record_embeddings_df", lambda *args: pd.DataFrame())
+    monkeypatch.setattr(vector_db, "load_fundus_collection_embeddings_df", lambda *args: pd.DataFrame())
+
+    # bypass the singleton and the connection to Weaviate
+    vdb = object.__new__(vector_db.VectorDB)
+    collections = FakeCollections()
+    vdb._config = SimpleNamespace(
+        data=SimpleNamespace(
+            import_checkpoint_file=str(tmp_path / "import_checkpoint.json"),
+            records_df_file="records.pq",
+            collections_df_file="collections.pq",
+            record_embeddings_df_file="record_embeddings.pq",
+            collections_embeddings_df_file="collection_embeddings.pq",
+            image_blob_store_dir=None,
+        ),
+        app=SimpleNamespace(dev_mode=False, reset_vdb_on_startup=False, sync_vdb_on_startup=False),
+    )
+    vdb._records_df = pd.DataFrame()
+    vdb._image_blob_store = None
+    vdb._get_client = lambda: SimpleNamespace(collections=collections, close=lambda: None)
+    vdb._prepare_fundus_collection_objects = lambda *args: []
+    vdb._prepare_fundus_record_objects = lambda *args: []
+    vdb.get_total_number_of_fundus_records = lambda: 42
+
+    vdb.calls = []
+    vdb.collections = collections
+
+    def create_schema(name):
+        collections.existing.add(name)
+        return name
+
+    vdb._create_fundus_collection_schema = lambda: create_schema(FUNDUS_COLLECTION_SCHEMA_NAME)
+    vdb._create_fundus_record_schema = lambda: create_schema(FUNDUS_RECORD_SCHEMA_NAME)
+    vdb._batch_import_fundus_collections = lambda *args, **kwargs: vdb.calls.append("import_collections")
+    vdb._batch_import_fundus_records = lambda *args, **kwargs: vdb.calls.append("import_records")
+    vdb._sync_fundus_collections = lambda *args: vdb.calls.append("sync_collections")
+    return vdb
+
+
+def _checkpoint(vdb) -> ImportCheckpoint:
+    return ImportCheckpoint(vdb._config.data.import_checkpoint_file)
+
+
+def _interrupt(*args, **kwargs):
+    raise Interrupted()
+
+
+def test_fresh_import(vdb):
+    vdb._import_fundus_data(pd.DataFrame(), pd.DataFrame())
+
+    assert vdb.calls == ["import_collections", "import_records"]
+    assert _checkpoint(vdb).is_complete(FINGERPRINT)
+
+
+def test_resume_import_interrupted_in_collection_phase(vdb):
+    batch_import_fundus_collections = vdb._batch_import_fundus_collections
+    vdb._batch_import_fundus_collections = _interrupt
+    with pytest.raises(Interrupted):
+        vdb._import_fundus_data(pd.DataFrame(), pd.DataFrame())
+    assert vdb.collections.existing == {FUNDUS_COLLECTION_SCHEMA_NAME}
+    assert _checkpoint(vdb).is_interrupted()
+
+    vdb._batch_import_fundus_collections = batch_import_fundus_collections
+    vdb._import_fundus_data(pd.DataFrame(), pd.DataFrame())
+
+    # the partially imported collections are synced and the records are imported
+    assert vdb.calls == ["sync_collections", "import_records"]
+    assert vdb.collections.existing == {FUNDUS_COLLECTION_SCHEMA_NAME, FUNDUS_RECORD_SCHEMA_NAME}
+    assert _checkpoint(vdb).is_complete(FINGERPRINT)
+
+
+def test_resume_import_interrupted_between_phases(vdb):
+    vdb._import_fundus_records = _interrupt
+    with pytest.raises(Interrupted):
+        vdb._import_fundus_data(pd.DataFrame(), pd.DataFrame())
+    assert vdb.calls == ["import_collections"]
+    del vdb._import_fundus_records
+
+    vdb._import_fundus_data(pd.DataFrame(), pd.DataFrame())
+
+    assert vdb.calls == ["import_collections", "sync_collections", "import_records"]
+    assert _checkpoint(vdb).is_complete(FINGERPRINT)
+
+
+def test_partial_import_without_checkpoint_is_completed(vdb):
+    vdb._config.data.import_checkpoint_file = None
+    vdb.collections.existing.add(FUNDUS_COLLECTION_SCHEMA_NAME)
+
+    vdb._import_fundus_data(pd.DataFrame(), pd.DataFrame())
+
+    assert vdb.calls == ["sync_collections", "import_records"]
+
+
+def test_complete_import_is_skipped(vdb):
+    vdb._import_fundus_data(pd.DataFrame(), pd.DataFrame())
+    vdb.calls.clear()
+
+    vdb._import_fundus_data(pd.DataFrame(), pd.DataFrame())
+
+    assert vdb.calls == []
+
+
+class FakeRecordCollection:
+    def __init__(self):
+        self.content_hashes: dict[str, str] = {}
+        self.data = SimpleNamespace(delete_many=lambda where: None)
+
+    def iterator(self, return_properties):
+        return [SimpleNamespace(properties={"murag_id": k, "content_hash": v}) for k, v in self.content_hashes.items()]
+
+
+def test_sync_reimports_records_whose_image_changed(vdb, tmp_path):
+    murag_id = "5f1c4b5e-8d5c-4a4f-9f43-1b0e2d1c3a7b"
+    image_path = tmp_path / "ursus_1.jpg"
+    image_path.write_bytes(b"cave bear")
+
+    vdb._config.data.import_workers = 2
+    vdb.collections.existing.add(FUNDUS_RECORD_SCHEMA_NAME)
+    collection = FakeRecordCollection()
+    vdb._get_fundus_record_collection = lambda: collection
+    vdb._prepare_fundus_record_objects = lambda *args: iter(
+        [
+            {
+                "uuid": murag_id,
+                "properties": {"murag_id": murag_id, "title": "Skull of a Cave Bear"},
+                "vector": [0.1, 0.2],
+                "image_path": str(image_path),
+            }
+        ]
+    )
+    imported = []
+    vdb._batch_import_fundus_records = lambda collection, objects, total: imported.extend(objects)
+
+    def sync() -> list[dict]:
+        imported.clear()
+        vdb._sync_fundus_records(pd.DataFrame({"murag_id": [murag_id]}), pd.DataFrame(), pd.DataFrame())
+        for obj in imported:
+            collection.content_hashes[obj["uuid"]] = obj["properties"]["content_hash"]
+        return list(imported)
+
+    assert len(sync()) == 1
+    assert sync() == []
+
+    image_path.write_bytes(b"brown bear")
+    assert len(sync()) == 1
+    assert sync() == []
@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+import pytest
+import srsly
+
+vector_db = pytest.importorskip("fundus_murag.data.vector_db")
+
+from fundus_murag.data.dtos.fundus import FundusRecord, FundusRecordImage, FundusRecordInternal  # noqa: E402
+
+# a record as stored in the VectorDB with a (small) base64 image
+STORED_RECORD = {
+    "murag_id": "5f1c4b5e-8d5c-4a4f-9f43-1b0e2d1c3a7b",
+    "title": "Skull of a Cave Bear",
+    "fundus_id": 42,
+    "catalogno": "Ursus 1",
+    "collection_name": "zoological_collection",
+    "image_name": "ursus_1.jpg",
+    "details": [{"key": "material", "value": "bone"}],
+    "content_hash": "abc",
+    "image": "A" * 100_000,
+}
+
+
+class FakeQuery:
+    def __init__(self):
+        self.calls: list[dict] = []
+
+    def fetch_objects(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(objects=[])
+
+    def bm25(self, query, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(objects=[])
+
+
+def _make_vdb(image_blob_store):
+    # bypass the singleton and the connection to Weaviate
+    vdb = object.__new__(vector_db.VectorDB)
+    vdb._image_blob_store = image_blob_store
+    vdb._fundus_record_return_props = vdb._build_fundus_record_return_props()
+    vdb.query = FakeQuery()
+    vdb._get_fundus_record_collection = lambda: SimpleNamespace(query=vdb.query)
+    vdb._get_client = lambda: SimpleNamespace(close=lambda: None)
+    vdb._fundus_record_converter = SimpleNamespace(convert_all=lambda res, internal=False: [])
+    return vdb
+
+
+def _prop_names(props) -> set[str]:
+    return {p if isinstance(p, str) else p.name for p in props}
+
+
+def _payload_size(props) -> int:
+    # the size of what Weaviate returns for the stored record with the given return properties
+    return len(srsly.json_dumps({k: v for k, v in STORED_RECORD.items() if k in _prop_names(props)}))
+
+
+@pytest.fixture(params=[None, object()], ids=["image_in_vdb", "image_blob_store"])
+def vdb(request):
+    return _make_vdb(request.param)
+
+
+def test_fundus_record_projection_excludes_image(vdb):
+    props = _prop_names(vdb._get_fundus_record_return_props(FundusRecord))
+
+    assert props == set(FundusRecord.model_fields.keys())
+    assert "image" not in props
+    assert "content_hash" not in props
+    assert _payload_size(vdb._get_fundus_record_return_props(FundusRecord)) < 1_000
+
+
+def test_image_is_only_fetched_if_stored_in_vdb(vdb):
+    internal_props = _prop_names(vdb._get_fundus_record_return_props(FundusRecordInternal))
+    image_props = _prop_names(vdb._get_fundus_record_return_props(FundusRecordImage))
+
+    stores_image_in_vdb = vdb._image_blob_store is None
+    assert ("image" in internal_props) == stores_image_in_vdb
+    assert ("image" in image_props) == stores_image_in_vdb
+    assert image_props - {"image"} == {"murag_id", "fundus_id", "image_name"}
+
+
+def test_record_queries_use_the_fundus_record_projection(vdb):
+    with pytest.raises(KeyError):
+        vdb.get_fundus_record_by_murag_id(STORED_RECORD["murag_id"])
+    with pytest.raises(KeyError):
+        vdb.get_fundus_records_by_fundus_id(STORED_RECORD["fundus_id"])
+    vdb._fundus_record_lexical_search("bear")
+
+    assert len(vdb.query.calls) == 3
+    for call in vdb.query.calls:
+        assert call["return_properties"] == vdb._get_fundus_record_return_props(FundusRecord)
+        assert _payload_size(call["return_properties"]) < 1_000
+
+
+def test_record_image_query_uses_the_image_projection(vdb):
+    with pytest.raises(KeyError):
+        vdb.get_fundus_record_image_by_murag_id(STORED_RECORD["murag_id"])
+
+    props = vdb.query.calls[0]["return_properties"]
+    assert props == vdb._get_fundus_record_return_props(FundusRecordImage)
+    assert "details" not in _prop_names(props)
+
+
+@pytest.mark.parametrize("murag_ids", [["not-a-uuid"], [STORED_RECORD["murag_id"], "42"]])
+def test_invalid_murag_ids_are_rejected_before_querying(vdb, murag_ids):
+    with pytest.raises(ValueError, match="Invalid murag_ids"):
+        vdb.get_fundus_records_by_murag_ids(murag_ids)
+    with pytest.raises(ValueError, match="Invalid murag_ids"):
+        vdb.get_fundus_record_image_by_murag_id(murag_ids[-1])
+
+    assert vdb.query.calls == []